@@ -4,11 +4,29 @@ FastAPI 번역 서버
 OpenAI, Google Translate, DeepL을 지원하는 번역 API
 """
 
+import asyncio
+import json
+import sqlite3
 import sys
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Literal, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+try:
+    from fastapi.responses import ORJSONResponse
+    import orjson  # noqa: F401  (ORJSONResponse 사용 가능 여부 확인)
+
+    DefaultResponse = ORJSONResponse
+    ORJSON_AVAILABLE = True
+except ImportError:
+    DefaultResponse = JSONResponse
+    ORJSON_AVAILABLE = False
 from pydantic import BaseModel, Field
 
 # 프로젝트 루트를 Python 경로에 추가
@@ -28,17 +46,287 @@ from backend.translators import (
     translate_with_google,
     translate_with_deepl,
     translate_with_post_editor,
-    init_deepl_client,
+    translate_batch_with_openai,
+    translate_batch_with_google,
+    translate_batch_with_deepl,
+    translate_batch_with_post_editor,
+    stream_with_openai,
+    stream_with_post_editor,
+    DraftFallback,
+    TranslationMemory,
+    FuzzyMemory,
+    scheduler_stats,
+    breaker_stats,
+    open_http_clients,
+    close_http_clients,
+    http_client_stats,
+)
+from backend.health import HealthState
+from backend.hedging import LatencyTracker, hedged_call
+from backend.cache import CacheKey, TranslationCache, make_cache_key
+from backend.jobs import JobStore, JobWorkerPool
+from backend.langdetect import detect_dominant_language
+from backend.tokens import load_encodings
+from backend.markup import MarkupDocument, fallback_segment, parse_markup, restore_segment
+from backend.refinement import RefinementStore
+from backend.metrics import (
+    REGISTRY,
+    FUZZY_LOOKUPS,
+    LANGUAGE_DETECTIONS,
+    MARKUP_FALLBACKS,
+    PROVIDER_LATENCY,
+    PROVIDER_REQUESTS,
+    TRANSLATION_LATENCY,
+    TRANSLATION_REQUESTS,
+    track,
+)
+from backend.segmentation import (
+    DedupStats,
+    deduplicate_segments,
+    estimate_tokens,
+    expand_translations,
+    translate_document,
+)
+from backend.settings import get_section
+from backend.singleflight import SingleFlight
+from backend.usage import get_usage_ledger
+
+# 번역 결과 캐시 초기화
+_cache_config = get_section("cache")
+CACHE_ENABLED = bool(_cache_config.get("enabled", True))
+translation_cache = TranslationCache.from_config(_cache_config)
+
+# 번역 메모리 초기화 (SQLite, 재시작/워커 간 공유)
+_tm_config = get_section("translation_memory")
+translation_memory = None
+if _tm_config.get("enabled", True):
+    translation_memory = TranslationMemory(
+        project_root / _tm_config.get("path", "data/translation_memory.sqlite3"),
+        models=_tm_config.get("models"),
+    )
+
+# 번역 메모리 유사 문장 검색 (MinHash LSH, 번역 메모리와 같은 SQLite 파일)
+_fuzzy_config = get_section("fuzzy_memory")
+FUZZY_SERVE_THRESHOLD = float(_fuzzy_config.get("serve_threshold", 1.0))
+FUZZY_REFERENCE_THRESHOLD = float(_fuzzy_config.get("reference_threshold", 0.6))
+fuzzy_memory = None
+if translation_memory is not None and _fuzzy_config.get("enabled", True):
+    fuzzy_memory = FuzzyMemory.from_config(translation_memory.path, _fuzzy_config)
+
+# source_lang "auto" 로컬 감지 및 언어 쌍별 모델 라우팅 ("auto-route" 모델)
+_language_detection_config = get_section("language_detection")
+LANGUAGE_DETECTION_ENABLED = bool(_language_detection_config.get("enabled", True))
+LANGUAGE_DETECTION_MAX_CHARS = int(_language_detection_config.get("max_chars", 256))
+LANGUAGE_DETECTION_MIN_CONFIDENCE = float(_language_detection_config.get("min_confidence", 0.6))
+LANGUAGE_ROUTES: Dict[str, str] = dict(_language_detection_config.get("routes", {"default": "gpt-4o-mini"}))
+
+# provider 사용량/예상 비용 장부 (SQLite, 워커 간 합산)
+_usage_config = get_section("usage")
+usage_ledger = get_usage_ledger()
+
+
+async def flush_usage_periodically(interval: float) -> None:
+    """사용량 장부의 메모리 합계를 주기적으로 SQLite에 합산합니다."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(usage_ledger.flush)
+        except Exception as e:
+            print(f"[WARNING] 사용량 장부 기록 실패: {e}")
+
+
+# 진행 중인 동일 번역 요청 병합 (single-flight)
+inflight_translations = SingleFlight()
+
+# 배치/긴 문서의 반복 세그먼트 중복 제거 통계
+segment_dedup = DedupStats()
+
+# 헤지 요청 설정 ("fastest" 모델) 및 모델별 지연시간 기록
+_hedging_config = get_section("hedging")
+HEDGE_CANDIDATES = list(
+    _hedging_config.get("candidates", ["google-translate", "deepl-nmt", "gpt-4o-mini"])
 )
+provider_latency = LatencyTracker(window=int(_hedging_config.get("latency_window", 100)))
+
+# 배치 번역 설정
+_batch_config = get_section("batch")
+
+# 긴 문서 분할 설정 (청크당 토큰 예산, 동시 번역 청크 수)
+_segmentation_config = get_section("segmentation")
+SEGMENT_MAX_TOKENS = int(_segmentation_config.get("max_chunk_tokens", 250))
+SEGMENT_MAX_PARALLEL = int(_segmentation_config.get("max_parallel", 8))
+
+# 점진적 번역 (느린 모델 -> 빠른 초안 모델, 백그라운드 최종 번역 결과 저장소)
+_refinement_config = get_section("refinement")
+REFINEMENT_DRAFT_MODELS: Dict[str, str] = dict(
+    _refinement_config.get("draft_models", {"gpt-4o": "google-translate", "deepl-post-edited": "deepl-nmt"})
+)
+refinement_store = RefinementStore.from_config(_refinement_config, project_root)
+
+# 비동기 번역 작업 (SQLite, 재시작/워커 간 공유)
+_jobs_config = get_section("jobs")
+JOBS_MAX_CHARS = int(_jobs_config.get("max_chars", 1_000_000))
+JOBS_MAX_QUEUED = int(_jobs_config.get("max_queued", 1000))
+job_store = None
+if _jobs_config.get("enabled", True):
+    job_store = JobStore(
+        project_root / _jobs_config.get("path", "data/jobs.sqlite3"),
+        max_attempts=int(_jobs_config.get("max_attempts", 3)),
+    )
+
+# 헬스 체크 및 시작 시 provider 예열 설정
+_health_config = get_section("health")
+health_state = HealthState()
+
+
+# /metrics 수집 시점에 읽는 캐시/대기열/서킷/병합 상태
+def _per_provider(stats_fn, field, transform=lambda value: value):
+    return lambda: [
+        ({"provider": provider}, transform(stats[field])) for provider, stats in stats_fn().items()
+    ]
+
+
+for _name, _doc, _kind, _collect in [
+    ("translation_cache_entries", "메모리 캐시 항목 수", "gauge",
+     lambda: [({}, translation_cache.stats()["entries"])]),
+    ("translation_cache_bytes", "메모리 캐시 사용 바이트", "gauge",
+     lambda: [({}, translation_cache.stats()["bytes"])]),
+    ("translation_cache_hits_total", "메모리 캐시 적중 수", "counter",
+     lambda: [({}, translation_cache.hits)]),
+    ("translation_cache_misses_total", "메모리 캐시 실패 수", "counter",
+     lambda: [({}, translation_cache.misses)]),
+    ("translation_cache_evictions_total", "메모리 캐시 용량 초과 제거 수", "counter",
+     lambda: [({}, translation_cache.evictions)]),
+    ("translation_inflight", "진행 중인 번역 작업 수", "gauge",
+     lambda: [({}, inflight_translations.stats()["inflight"])]),
+    ("translation_coalesced_total", "진행 중 작업에 병합된 요청 수", "counter",
+     lambda: [({}, inflight_translations.coalesced)]),
+    ("translation_segments_deduplicated_total", "중복 제거로 번역하지 않은 세그먼트 수", "counter",
+     lambda: [({"path": path}, stats["saved_segments"]) for path, stats in segment_dedup.stats().items()]),
+    ("translation_dedup_tokens_saved_total", "중복 제거로 아낀 입력 토큰 추정치", "counter",
+     lambda: [({"path": path}, stats["saved_tokens"]) for path, stats in segment_dedup.stats().items()]),
+    ("provider_dns_cache_hits_total", "provider 호스트 DNS 캐시 적중 수", "counter",
+     lambda: [({}, http_client_stats()["dns_cache"]["hits"])]),
+    ("provider_dns_cache_misses_total", "provider 호스트 DNS 조회 수 (캐시 없음/만료)", "counter",
+     lambda: [({}, http_client_stats()["dns_cache"]["misses"])]),
+    ("translation_refinements", "보관 중인 점진적 번역 결과 수", "gauge",
+     lambda: [({"status": status}, count) for status, count in refinement_store.counts().items()]),
+    ("translation_jobs", "상태별 비동기 번역 작업 수", "gauge",
+     lambda: [({"status": status}, count) for status, count in job_store.counts().items()] if job_store else []),
+    ("provider_queue_depth", "provider 스케줄러 대기 요청 수", "gauge",
+     _per_provider(scheduler_stats, "queue_depth")),
+    ("provider_in_flight", "provider 진행 중 요청 수", "gauge",
+     _per_provider(scheduler_stats, "in_flight")),
+    ("provider_queue_rejected_total", "대기열이 가득 차 거절된 요청 수", "counter",
+     _per_provider(scheduler_stats, "rejected")),
+    ("provider_queue_timed_out_total", "대기 시간 초과 요청 수", "counter",
+     _per_provider(scheduler_stats, "timed_out")),
+    ("provider_circuit_open", "서킷 브레이커 상태 (1: 열림/복구 확인 중)", "gauge",
+     _per_provider(breaker_stats, "state", lambda state: int(state != "closed"))),
+    ("provider_circuit_opened_total", "서킷이 열린 횟수", "counter",
+     _per_provider(breaker_stats, "opened_count")),
+]:
+    REGISTRY.register_collector(_name, _doc, _collect, kind=_kind)
+
+
+def metric_model(model: str) -> str:
+    """메트릭 레이블용 모델 ID (알 수 없는 모델은 "unknown"으로 묶어 레이블 수를 제한)"""
+    return model if model in AVAILABLE_MODELS else "unknown"
+
+
+async def backfill_fuzzy_memory() -> None:
+    """번역 메모리에 이미 있던 항목을 유사 문장 인덱스에 색인합니다 (색인된 항목은 건너뜀)."""
+    try:
+        indexed = await run_in_threadpool(
+            fuzzy_memory.backfill, int(_fuzzy_config.get("backfill_batch_size", 500))
+        )
+    except sqlite3.Error as e:
+        print(f"[WARNING] 유사 문장 인덱스 색인 실패: {e}")
+        return
+    if indexed:
+        print(f"[OK] 기존 번역 메모리 {indexed}건을 유사 문장 인덱스에 색인했습니다.")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    서버 시작 시 번역 메모리의 최근 결과로 캐시를 예열하고,
+    provider 연결 예열을 백그라운드로 시작합니다 (끝나면 /health/ready가 준비 상태가 됨).
+    provider 공용 HTTP 클라이언트(연결 풀, DNS 캐시)는 서버 종료 시 닫습니다.
+    """
+    open_http_clients()
+    warm_up_task = None
+    if _health_config.get("warm_up", True):
+        warm_up_task = asyncio.ensure_future(
+            health_state.warm_up_providers(float(_health_config.get("warm_up_timeout", 10)))
+        )
+    else:
+        health_state.warm_up_done = True
+
+    warm_load_limit = int(_tm_config.get("warm_load_limit", 0))
+    if translation_memory and CACHE_ENABLED and warm_load_limit > 0:
+        entries = await run_in_threadpool(translation_memory.warm_load, warm_load_limit)
+        for key, translated_text in entries:
+            translation_cache.set(key, translated_text)
+        print(f"[OK] 번역 메모리에서 캐시 예열 완료: {len(entries)}건")
+
+    fuzzy_backfill_task = None
+    if fuzzy_memory is not None:
+        # 유사 문장 인덱스가 생기기 전에 저장된 번역 메모리 항목 색인 (시작을 막지 않도록 백그라운드)
+        fuzzy_backfill_task = asyncio.ensure_future(backfill_fuzzy_memory())
+
+    # OpenAI 토큰 수 계산용 tiktoken 인코딩 (파일 다운로드가 요청 처리를 막지 않도록 백그라운드)
+    encodings_task = asyncio.ensure_future(
+        run_in_threadpool(
+            load_encodings,
+            [model for model, info in AVAILABLE_MODELS.items() if info.get("provider") == "openai"],
+        )
+    )
+
+    if job_pool:
+        purged = await run_in_threadpool(
+            job_store.purge, float(_jobs_config.get("retention_seconds", 86400))
+        )
+        if purged:
+            print(f"[INFO] 보관 기간이 지난 번역 작업 {purged}건 삭제")
+        job_pool.start()
+
+    usage_flush_task = None
+    if usage_ledger:
+        await run_in_threadpool(
+            usage_ledger.purge, float(_usage_config.get("retention_days", 90)) * 86400
+        )
+        usage_flush_task = asyncio.ensure_future(
+            flush_usage_periodically(float(_usage_config.get("flush_interval", 10)))
+        )
+    yield
+
+    if job_pool:
+        await job_pool.stop()
+
+    if warm_up_task and not warm_up_task.done():
+        warm_up_task.cancel()
+    if fuzzy_backfill_task and not fuzzy_backfill_task.done():
+        fuzzy_backfill_task.cancel()
+    if encodings_task and not encodings_task.done():
+        encodings_task.cancel()
+    await refinement_store.drain()
+
+    if usage_flush_task:
+        usage_flush_task.cancel()
+        await run_in_threadpool(usage_ledger.flush)
+
+    await close_http_clients()
 
-# DeepL 클라이언트 초기화
-init_deepl_client()
 
 # FastAPI 앱 초기화
 app = FastAPI(
     title="Translation API",
     description="OpenAI, Google Translate, DeepL 번역 서비스",
     version="3.0.0",
+    lifespan=lifespan,
+    # orjson이 설치되어 있으면 응답 JSON 직렬화에 사용
+    default_response_class=DefaultResponse,
 )
 
 # CORS 설정 (프론트엔드 통신 허용)
@@ -64,6 +352,9 @@ class TranslateRequest(BaseModel):
     source_lang: str = Field(..., description="원본 언어 (예: 'en', 'ko')")
     target_lang: str = Field(..., description="목표 언어 (예: 'en', 'ko')")
     model: str = Field(..., description="사용할 모델 ID")
+    format: Literal["text", "html", "markdown"] = Field(
+        "text", description="텍스트 형식 (html/markdown은 태그와 구조를 유지하고 텍스트만 번역)"
+    )
 
 
 class TranslateResponse(BaseModel):
@@ -73,6 +364,58 @@ class TranslateResponse(BaseModel):
     model: str = Field(..., description="사용된 모델 ID")
     source_lang: str = Field(..., description="원본 언어")
     target_lang: str = Field(..., description="목표 언어")
+    cached: bool = Field(False, description="캐시에서 반환되었는지 여부")
+
+
+class BatchTranslateRequest(BaseModel):
+    """배치 번역 요청 모델"""
+
+    texts: List[str] = Field(..., description="번역할 텍스트 목록", min_length=1)
+    source_lang: str = Field(..., description="원본 언어 (예: 'en', 'ko')")
+    target_lang: str = Field(..., description="목표 언어 (예: 'en', 'ko')")
+    model: str = Field(..., description="사용할 모델 ID")
+
+
+class BatchTranslateResponse(BaseModel):
+    """배치 번역 응답 모델"""
+
+    translations: List[str] = Field(..., description="입력 순서와 동일한 번역 결과 목록")
+    model: str = Field(..., description="사용된 모델 ID")
+    source_lang: str = Field(..., description="원본 언어")
+    target_lang: str = Field(..., description="목표 언어")
+    cached_count: int = Field(0, description="캐시/번역 메모리에서 반환된 항목 수")
+
+
+class ProgressiveTranslateResponse(BaseModel):
+    """점진적 번역 응답 모델 (요청 직후와 결과 조회에 공통으로 사용)"""
+
+    result_id: str = Field(..., description="결과 조회용 id")
+    status: str = Field(..., description="pending(최종 번역 진행 중) | done | failed")
+    model: str = Field(..., description="최종 번역 모델 ID")
+    source_lang: str = Field(..., description="원본 언어")
+    target_lang: str = Field(..., description="목표 언어")
+    draft_model: Optional[str] = Field(None, description="초안 모델 ID")
+    draft_text: Optional[str] = Field(None, description="빠른 초안 번역 (초안 실패/생략 시 None)")
+    translated_text: Optional[str] = Field(None, description="최종 번역 (완료 전에는 None)")
+    cached: bool = Field(False, description="최종 번역이 캐시에서 반환되었는지 여부")
+    error: Optional[Dict[str, Any]] = Field(None, description="실패 시 status_code, detail")
+
+
+class JobResponse(BaseModel):
+    """비동기 번역 작업 응답 모델"""
+
+    job_id: str = Field(..., description="작업 id")
+    status: str = Field(..., description="queued | running | done | failed")
+    model: str = Field(..., description="사용할 모델 ID")
+    source_lang: str = Field(..., description="원본 언어")
+    target_lang: str = Field(..., description="목표 언어")
+    chunks_done: int = Field(0, description="번역을 마친 청크 수")
+    chunks_total: int = Field(0, description="전체 청크 수 (처리 시작 전에는 0)")
+    translated_text: Optional[str] = Field(None, description="번역 결과 (완료 전에는 None)")
+    error: Optional[Dict[str, Any]] = Field(None, description="실패 시 status_code, detail")
+    created_at: float = Field(..., description="등록 시각 (UNIX time)")
+    started_at: Optional[float] = Field(None, description="처리 시작 시각")
+    finished_at: Optional[float] = Field(None, description="완료/실패 시각")
 
 
 class ModelInfo(BaseModel):
@@ -100,7 +443,15 @@ async def root():
         "endpoints": {
             "models": "/api/models",
             "translate": "/api/translate",
+            "translate_batch": "/api/translate/batch",
+            "translate_stream": "/api/translate/stream",
+            "translate_progressive": "/api/translate/progressive",
+            "jobs": "/api/jobs",
+            "cache_stats": "/api/cache/stats",
+            "scheduler_stats": "/api/scheduler/stats",
+            "metrics": "/metrics",
             "health": "/health",
+            "readiness": "/health/ready",
         },
     }
 
@@ -119,12 +470,537 @@ async def get_models():
     return ModelsResponse(models=[ModelInfo(**model) for model in models])
 
 
+def lookup_translation(key: CacheKey) -> Optional[str]:
+    """
+    메모리 캐시 -> 번역 메모리 순으로 저장된 번역 결과를 조회합니다.
+
+    번역 메모리 조회는 PK 조회라 이벤트 루프에서 직접 수행하며,
+    적중하면 메모리 캐시에도 채웁니다.
+
+    Parameters
+    ----------
+    key : CacheKey
+        make_cache_key로 생성한 키
+
+    Returns
+    -------
+    Optional[str]
+        번역 결과 (없으면 None)
+    """
+    if CACHE_ENABLED:
+        cached_text = translation_cache.get(key)
+        if cached_text is not None:
+            return cached_text
+
+    if translation_memory is not None and translation_memory.accepts(key[0]):
+        stored_text = translation_memory.lookup(key)
+        if stored_text is not None:
+            if CACHE_ENABLED:
+                translation_cache.set(key, stored_text)
+            return stored_text
+
+    return None
+
+
+async def remember_translations(entries: List[Tuple[CacheKey, str, str]]) -> None:
+    """
+    번역 결과를 메모리 캐시와 번역 메모리에 저장합니다.
+
+    후수정에 실패해 DeepL 초안을 대신 반환한 결과(DraftFallback)는 저장하지 않습니다.
+
+    Parameters
+    ----------
+    entries : List[Tuple[CacheKey, str, str]]
+        (키, 원본 텍스트, 번역 결과) 목록
+    """
+    entries = [entry for entry in entries if not isinstance(entry[2], DraftFallback)]
+    if CACHE_ENABLED:
+        for key, _, translated_text in entries:
+            translation_cache.set(key, translated_text)
+
+    if translation_memory is not None:
+        persisted = [entry for entry in entries if translation_memory.accepts(entry[0][0])]
+        if persisted:
+            await run_in_threadpool(store_in_memory, persisted)
+
+
+def store_in_memory(entries: List[Tuple[CacheKey, str, str]]) -> None:
+    """번역 메모리에 저장하고 유사 문장 검색 인덱스에 원문을 추가합니다 (스레드풀에서 실행)."""
+    translation_memory.store_many(entries)
+    if fuzzy_memory is not None:
+        fuzzy_memory.add_many([(key, source_text) for key, source_text, _ in entries])
+
+
+async def lookup_fuzzy(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    model: str,
+) -> Tuple[Optional[str], Optional[Tuple[str, str]]]:
+    """
+    번역 메모리에서 유사 문장을 찾아 바로 반환할 번역 또는 프롬프트 참고 번역을 정합니다.
+
+    유사도가 serve_threshold 이상이면 이전 번역을 그대로 사용하고, OpenAI/Post-Editor 모델은
+    reference_threshold 이상인 이전 번역을 참고로 프롬프트에 넣어 달라진 부분만 고치게 합니다.
+    검색(SQLite 조회와 유사도 계산)은 번역 메모리 저장과 같이 스레드풀에서 수행합니다.
+
+    Parameters
+    ----------
+    text : str
+        번역할 텍스트
+    source_lang : str
+        원본 언어 코드
+    target_lang : str
+        목표 언어 코드
+    model : str
+        사용할 모델 ID
+
+    Returns
+    -------
+    Tuple[Optional[str], Optional[Tuple[str, str]]]
+        (바로 반환할 번역, 참고 번역 (원문, 번역)) - 해당 없으면 각각 None
+    """
+    if fuzzy_memory is None or not translation_memory.accepts(model):
+        return None, None
+
+    uses_reference = AVAILABLE_MODELS[model].get("provider") in ("openai", "post-editor")
+    threshold = min(FUZZY_SERVE_THRESHOLD, FUZZY_REFERENCE_THRESHOLD) if uses_reference else FUZZY_SERVE_THRESHOLD
+    match = await run_in_threadpool(fuzzy_memory.lookup, model, source_lang, target_lang, text, threshold)
+
+    if match is None:
+        FUZZY_LOOKUPS.inc(model=model, outcome="miss")
+        return None, None
+    if match.similarity >= FUZZY_SERVE_THRESHOLD:
+        FUZZY_LOOKUPS.inc(model=model, outcome="served")
+        print(f"[INFO] 번역 메모리 유사 문장 사용 (유사도 {match.similarity:.3f}, model={model})")
+        return match.translated_text, None
+    FUZZY_LOOKUPS.inc(model=model, outcome="reference")
+    return None, (match.source_text, match.translated_text)
+
+
+def resolve_source_lang(source_lang: str, texts: List[str]) -> str:
+    """
+    source_lang이 "auto"이면 로컬 언어 감지로 실제 원본 언어 코드를 정합니다.
+
+    provider 호출 전에 언어를 정하므로 같은 텍스트가 "auto"와 실제 언어 코드로 나뉘지 않고
+    캐시/번역 메모리/용어집/모델 라우팅이 같은 언어 쌍을 사용합니다.
+    확신도가 낮으면 "auto"를 유지하며, 이때는 provider의 자동 감지를 사용합니다.
+
+    Parameters
+    ----------
+    source_lang : str
+        get_language_code로 변환한 원본 언어 코드
+    texts : List[str]
+        번역할 텍스트 목록 (배치는 텍스트별 감지 결과 중 과반인 언어 사용)
+
+    Returns
+    -------
+    str
+        감지한 언어 코드 (감지하지 못했으면 "auto")
+    """
+    if source_lang != "auto" or not LANGUAGE_DETECTION_ENABLED:
+        return source_lang
+
+    # 배치는 앞 50개 텍스트만으로 판별 (텍스트당 수십 마이크로초)
+    language = detect_dominant_language(
+        texts[:50], LANGUAGE_DETECTION_MAX_CHARS, LANGUAGE_DETECTION_MIN_CONFIDENCE
+    )
+    LANGUAGE_DETECTIONS.inc(language=language or "undetermined")
+    return language or "auto"
+
+
+def route_model(source_lang: str, target_lang: str) -> str:
+    """
+    "auto-route" 모델이 사용할 모델을 언어 쌍으로 고릅니다.
+
+    language_detection.routes에서 "원본-목표", "*-목표", "default" 순으로 찾습니다.
+    """
+    for route in (f"{source_lang}-{target_lang}", f"*-{target_lang}", "default"):
+        model = LANGUAGE_ROUTES.get(route)
+        if model in AVAILABLE_MODELS and AVAILABLE_MODELS[model].get("provider") != "routed":
+            return model
+    return "gpt-4o-mini"
+
+
+def hedge_delay(model: str) -> Optional[float]:
+    """
+    헤지 모드에서 다음 후보를 시작하기 전 기다릴 시간(초)을 반환합니다.
+
+    race 모드는 0(모든 후보 동시 시작), delayed 모드는 방금 시작한 후보의
+    p95 지연시간(기록이 부족하면 default_delay_ms)입니다.
+
+    Parameters
+    ----------
+    model : str
+        방금 시작한 후보 모델 ID
+
+    Returns
+    -------
+    Optional[float]
+        대기 시간(초)
+    """
+    if _hedging_config.get("mode", "delayed") == "race":
+        return 0.0
+
+    p95 = provider_latency.percentile(model, 0.95)
+    if p95 is None:
+        return float(_hedging_config.get("default_delay_ms", 1000)) / 1000
+    return p95
+
+
+async def dispatch_translation(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    model: str,
+    reference: Optional[Tuple[str, str]] = None,
+) -> str:
+    """
+    모델의 provider에 맞는 번역기를 호출합니다.
+
+    "hedged" provider("fastest" 모델)는 여러 후보 모델에 요청해 가장 먼저 성공한
+    결과를 사용합니다. 성공한 호출의 지연시간은 모델별로 기록됩니다.
+
+    Parameters
+    ----------
+    text : str
+        번역할 텍스트
+    source_lang : str
+        원본 언어 코드
+    target_lang : str
+        목표 언어 코드
+    model : str
+        사용할 모델 ID (AVAILABLE_MODELS에 존재해야 함)
+    reference : Optional[Tuple[str, str]]
+        번역 메모리의 유사 문장 (원문, 번역). OpenAI/Post-Editor 프롬프트에 참고로 전달
+
+    Returns
+    -------
+    str
+        번역된 텍스트
+
+    Raises
+    ------
+    HTTPException
+        알 수 없는 provider이거나 번역 실패 시
+    """
+    provider = AVAILABLE_MODELS[model].get("provider", "openai")
+
+    if provider == "hedged":
+        winner, translated_text = await hedged_call(
+            HEDGE_CANDIDATES,
+            lambda candidate: dispatch_translation(text, source_lang, target_lang, candidate),
+            hedge_delay,
+        )
+        print(f"[INFO] 헤지 요청 결과 사용: {winner}")
+        return translated_text
+
+    if provider == "routed":
+        return await dispatch_translation(
+            text, source_lang, target_lang, route_model(source_lang, target_lang), reference
+        )
+
+    started = time.perf_counter()
+    with track(PROVIDER_REQUESTS, PROVIDER_LATENCY, model=model, provider=provider):
+        translated_text = await _call_provider(
+            provider, text, source_lang, target_lang, model, reference
+        )
+    provider_latency.record(model, time.perf_counter() - started)
+    return translated_text
+
+
+async def _call_provider(
+    provider: str,
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    model: str,
+    reference: Optional[Tuple[str, str]] = None,
+) -> str:
+    """provider별 번역 함수를 호출합니다 (참고 번역은 OpenAI/Post-Editor만 사용)."""
+    if provider == "google":
+        return await translate_with_google(text, source_lang, target_lang)
+
+    if provider == "deepl":
+        return await translate_with_deepl(text, source_lang, target_lang)
+
+    if provider == "post-editor":
+        # 같은 텍스트의 DeepL 번역이 캐시/번역 메모리에 있으면 초안으로 재사용
+        return await translate_with_post_editor(
+            text,
+            source_lang,
+            target_lang,
+            get_language_name(source_lang),
+            get_language_name(target_lang),
+            draft=lookup_translation(make_cache_key("deepl-nmt", source_lang, target_lang, text)),
+            reference=reference,
+        )
+
+    if provider == "openai":
+        return await translate_with_openai(
+            text,
+            source_lang,
+            target_lang,
+            model,
+            get_language_name(source_lang),
+            get_language_name(target_lang),
+            reference=reference,
+        )
+
+    raise HTTPException(status_code=400, detail=f"알 수 없는 provider: {provider}")
+
+
+async def translate_long_text(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    model: str,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> str:
+    """
+    긴 텍스트를 문단/문장 청크로 나누어 병렬 번역한 뒤 재조립합니다.
+
+    같은 청크는 한 번만 번역하고, 청크마다 캐시/번역 메모리를 조회하므로
+    이전에 번역한 문단도 다시 번역하지 않습니다.
+
+    Parameters
+    ----------
+    text : str
+        번역할 텍스트
+    source_lang : str
+        원본 언어 코드
+    target_lang : str
+        목표 언어 코드
+    model : str
+        사용할 모델 ID
+    on_progress : Optional[Callable[[int, int], None]]
+        청크 번역이 끝날 때마다 (완료 청크 수, 전체 청크 수)로 호출
+
+    Returns
+    -------
+    str
+        공백과 문단 구분이 보존된 번역 텍스트
+    """
+
+    # 후수정 실패로 초안을 반환한 청크가 있으면 문서 전체도 저장하지 않음
+    fallback = False
+
+    async def translate_chunk(chunk: str) -> str:
+        nonlocal fallback
+        key = make_cache_key(model, source_lang, target_lang, chunk)
+        stored_text = lookup_translation(key)
+        if stored_text is not None:
+            return stored_text
+        translated_chunk = await translate_and_remember(key, chunk, source_lang, target_lang, model)
+        fallback = fallback or isinstance(translated_chunk, DraftFallback)
+        return translated_chunk
+
+    translated_text, chunk_count = await translate_document(
+        text, translate_chunk, SEGMENT_MAX_TOKENS, SEGMENT_MAX_PARALLEL, on_progress, segment_dedup
+    )
+    print(f"[INFO] 분할 번역 완료: {chunk_count}개 청크 (model={model})")
+    return DraftFallback(translated_text) if fallback else translated_text
+
+
+async def translate_text(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    model: str,
+) -> str:
+    """
+    토큰 예산을 넘는 텍스트는 분할 번역하고, 나머지는 번역 메모리 유사 문장 검색 후 provider를 호출합니다.
+
+    Parameters
+    ----------
+    text : str
+        번역할 텍스트
+    source_lang : str
+        원본 언어 코드
+    target_lang : str
+        목표 언어 코드
+    model : str
+        사용할 모델 ID
+
+    Returns
+    -------
+    str
+        번역된 텍스트
+    """
+    if estimate_tokens(text) > SEGMENT_MAX_TOKENS:
+        return await translate_long_text(text, source_lang, target_lang, model)
+
+    fuzzy_text, reference = await lookup_fuzzy(text, source_lang, target_lang, model)
+    if fuzzy_text is not None:
+        return fuzzy_text
+    return await dispatch_translation(text, source_lang, target_lang, model, reference)
+
+
+async def translate_and_remember(
+    key: CacheKey,
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    model: str,
+) -> str:
+    """
+    캐시에 없는 텍스트를 번역하고 결과를 저장합니다.
+
+    같은 키의 번역이 이미 진행 중이면 새 provider 호출 없이 그 결과를 공유하며,
+    실패하면 기다리던 모든 요청에 같은 예외가 전달됩니다.
+
+    Parameters
+    ----------
+    key : CacheKey
+        make_cache_key로 생성한 키
+    text : str
+        번역할 텍스트
+    source_lang : str
+        원본 언어 코드
+    target_lang : str
+        목표 언어 코드
+    model : str
+        사용할 모델 ID
+
+    Returns
+    -------
+    str
+        번역된 텍스트
+    """
+
+    async def run() -> str:
+        translated_text = await translate_text(text, source_lang, target_lang, model)
+        await remember_translations([(key, text, translated_text)])
+        return translated_text
+
+    return await inflight_translations.do(key, run)
+
+
+async def translate_markup(
+    document: MarkupDocument,
+    markup_format: str,
+    source_lang: str,
+    target_lang: str,
+    model: str,
+) -> Tuple[str, bool]:
+    """
+    HTML/Markdown 문서의 텍스트 세그먼트만 번역해 원래 구조에 다시 넣습니다.
+
+    캐시/번역 메모리에 없는 세그먼트(반복 제거)를 한 번의 배치 호출로 번역하고,
+    번역 결과에서 자리 표시자가 깨진 세그먼트는 텍스트 조각만 한 번 더 배치 번역해
+    원래 마크업 사이에 넣습니다. 자리 표시자가 깨진 번역은 저장하지 않습니다.
+
+    Parameters
+    ----------
+    document : MarkupDocument
+        parse_markup으로 나눈 문서
+    markup_format : str
+        "html" 또는 "markdown"
+    source_lang : str
+        원본 언어 코드
+    target_lang : str
+        목표 언어 코드
+    model : str
+        사용할 모델 ID
+
+    Returns
+    -------
+    Tuple[str, bool]
+        (번역된 문서, provider 호출 없이 캐시/번역 메모리만 사용했는지 여부)
+    """
+    segment_texts = [segment.text for segment in document.segments]
+    unique_texts, positions = deduplicate_segments(segment_texts)
+    segment_dedup.record(markup_format, segment_texts, unique_texts)
+
+    translations, entries = await translate_unique_segments(unique_texts, source_lang, target_lang, model)
+    segment_translations = expand_translations(segment_texts, positions, translations)
+
+    outputs: List[Optional[str]] = [
+        restore_segment(segment, translated_text)
+        for segment, translated_text in zip(document.segments, segment_translations)
+    ]
+    failed = [i for i, output in enumerate(outputs) if output is None]
+    if failed:
+        MARKUP_FALLBACKS.inc(len(failed), format=markup_format)
+        print(f"[WARNING] 자리 표시자가 깨진 세그먼트 {len(failed)}개는 텍스트 조각만 다시 번역합니다 (model={model})")
+        broken = {segment_texts[i] for i in failed}
+        entries = [entry for entry in entries if entry[1] not in broken]
+
+        run_texts = [run for i in failed for run in document.segments[i].runs]
+        unique_runs, run_positions = deduplicate_segments(run_texts)
+        run_translations, run_entries = await translate_unique_segments(unique_runs, source_lang, target_lang, model)
+        entries.extend(run_entries)
+        run_outputs = iter(expand_translations(run_texts, run_positions, run_translations))
+        for i in failed:
+            runs = document.segments[i].runs
+            outputs[i] = fallback_segment(document.segments[i], [next(run_outputs) for _ in runs])
+
+    if entries:
+        await remember_translations(entries)
+    return document.render(outputs), bool(document.segments) and not entries and not failed
+
+
+async def translate_unique_segments(
+    texts: List[str],
+    source_lang: str,
+    target_lang: str,
+    model: str,
+) -> Tuple[List[str], List[Tuple[CacheKey, str, str]]]:
+    """
+    반복 제거한 세그먼트를 캐시/번역 메모리 조회 후 남은 것만 한 번의 배치 호출로 번역합니다.
+
+    Returns
+    -------
+    Tuple[List[str], List[Tuple[CacheKey, str, str]]]
+        (입력 순서의 번역 결과, 저장할 (키, 원문, 번역) 목록)
+    """
+    keys = [make_cache_key(model, source_lang, target_lang, text) for text in texts]
+    translations: List[Optional[str]] = [
+        lookup_translation(key) if text else text for key, text in zip(keys, texts)
+    ]
+    pending = [i for i, text in enumerate(translations) if text is None]
+    if not pending:
+        return translations, []
+
+    # 토큰 예산을 넘는 긴 세그먼트는 배치에 넣지 않고 청크 단위로 번역
+    short_pending = [i for i in pending if estimate_tokens(texts[i]) <= SEGMENT_MAX_TOKENS]
+    long_pending = [i for i in pending if estimate_tokens(texts[i]) > SEGMENT_MAX_TOKENS]
+    translated = await asyncio.gather(
+        dispatch_batch_translation(
+            [texts[i] for i in short_pending], source_lang, target_lang, model
+        ) if short_pending else asyncio.sleep(0, []),
+        *(translate_long_text(texts[i], source_lang, target_lang, model) for i in long_pending),
+    )
+    for i, translated_text in zip(short_pending + long_pending, [*translated[0], *translated[1:]]):
+        translations[i] = translated_text
+    return translations, [(keys[i], texts[i], translations[i]) for i in pending]
+
+
+def parse_request_markup(request: TranslateRequest) -> Optional[MarkupDocument]:
+    """format이 html/markdown이면 문서를 세그먼트로 나눕니다 (text면 None)."""
+    if request.format == "text":
+        return None
+    return parse_markup(request.text, request.format)
+
+
+def require_plain_text(request: TranslateRequest) -> None:
+    """html/markdown 형식을 지원하지 않는 엔드포인트에서 400을 반환합니다."""
+    if request.format != "text":
+        raise HTTPException(
+            status_code=400,
+            detail=f"format={request.format}은 /api/translate와 /api/translate/stream에서만 지원합니다.",
+        )
+
+
 @app.post("/api/translate", response_model=TranslateResponse)
 async def translate(request: TranslateRequest):
     """
     텍스트 번역 - OpenAI, Google Translate, DeepL 지원
 
     모델에 따라 자동으로 적절한 번역 엔진을 선택합니다.
+    메모리 캐시 -> 번역 메모리(SQLite) -> provider 순으로 조회하며,
+    토큰 예산을 넘는 긴 텍스트는 청크로 나누어 병렬 번역합니다.
+    동시에 들어온 동일 요청은 하나의 provider 호출을 공유합니다.
 
     Parameters
     ----------
@@ -141,82 +1017,877 @@ async def translate(request: TranslateRequest):
     HTTPException
         번역 실패 시
     """
+    with track(
+        TRANSLATION_REQUESTS,
+        TRANSLATION_LATENCY,
+        endpoint="translate",
+        model=metric_model(request.model),
+    ):
+        return await _translate(request)
+
+
+async def _translate(request: TranslateRequest) -> TranslateResponse:
+    """단건 번역 요청을 처리합니다 (메트릭 기록은 translate에서 수행)."""
     # 모델 유효성 검사
     if request.model not in AVAILABLE_MODELS:
         raise HTTPException(
             status_code=400, detail=f"지원하지 않는 모델입니다: {request.model}"
         )
 
-    # 모델 정보 가져오기
-    model_info = AVAILABLE_MODELS[request.model]
-    provider = model_info.get("provider", "openai")
-
-    # 언어 코드 처리
-    source_lang = get_language_code(request.source_lang)
+    # 언어 코드 처리 ("auto"는 로컬 감지로 실제 언어 코드로 변환, 마크업은 텍스트만으로 감지)
+    document = parse_request_markup(request)
+    source_lang = resolve_source_lang(
+        get_language_code(request.source_lang), document.texts() if document else [request.text]
+    )
     target_lang = get_language_code(request.target_lang)
 
-    try:
-        # Provider별 번역 처리
-        if provider == "google":
-            translated_text = await translate_with_google(
-                request.text, source_lang, target_lang
-            )
-
-        elif provider == "deepl":
-            translated_text = translate_with_deepl(
-                request.text, source_lang, target_lang
-            )
-
-        elif provider == "post-editor":
-            source_name = get_language_name(source_lang)
-            target_name = get_language_name(target_lang)
-            translated_text = await translate_with_post_editor(
-                request.text,
-                source_lang,
-                target_lang,
-                source_name,
-                target_name,
-            )
-
-        elif provider == "openai":
-            source_name = get_language_name(source_lang)
-            target_name = get_language_name(target_lang)
-            translated_text = translate_with_openai(
-                request.text,
-                source_lang,
-                target_lang,
-                request.model,
-                source_name,
-                target_name,
-            )
-
-        else:
-            raise HTTPException(
-                status_code=400, detail=f"알 수 없는 provider: {provider}"
+    # HTML/Markdown: 텍스트 세그먼트만 번역해 원래 구조에 다시 넣음 (세그먼트 단위로 캐시)
+    if document is not None:
+        try:
+            translated_text, cached = await translate_markup(
+                document, request.format, source_lang, target_lang, request.model
             )
-
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"번역 중 오류 발생: {str(e)}")
         return TranslateResponse(
             translated_text=translated_text,
             model=request.model,
             source_lang=source_lang,
             target_lang=target_lang,
+            cached=cached,
         )
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"번역 중 오류 발생: {str(e)}")
-
-
-if __name__ == "__main__":
-    import uvicorn
+    # 캐시 -> 번역 메모리 조회
+    cache_key = make_cache_key(request.model, source_lang, target_lang, request.text)
+    stored_text = lookup_translation(cache_key)
+    if stored_text is not None:
+        return TranslateResponse(
+            translated_text=stored_text,
+            model=request.model,
+            source_lang=source_lang,
+            target_lang=target_lang,
+            cached=True,
+        )
+
+    try:
+        translated_text = await translate_and_remember(
+            cache_key, request.text, source_lang, target_lang, request.model
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"번역 중 오류 발생: {str(e)}")
+
+    return TranslateResponse(
+        translated_text=translated_text,
+        model=request.model,
+        source_lang=source_lang,
+        target_lang=target_lang,
+    )
+
+
+async def stream_translation_events(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    model: str,
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    번역 진행 상황을 (이벤트 이름, 데이터) 형태로 생성합니다.
+
+    OpenAI는 토큰 단위 delta를, Post-Editor는 DeepL 초안(draft) 후 GPT-4o delta를
+    내보냅니다. 스트리밍을 지원하지 않는 provider와 분할 번역 대상인 긴 텍스트는
+    완료 이벤트만 내보냅니다.
+    마지막 이벤트는 항상 ("done", {"text": 최종 번역, "fallback": bool})입니다.
+
+    Parameters
+    ----------
+    text : str
+        번역할 텍스트
+    source_lang : str
+        원본 언어 코드
+    target_lang : str
+        목표 언어 코드
+    model : str
+        사용할 모델 ID (AVAILABLE_MODELS에 존재해야 함)
+
+    Yields
+    ------
+    Tuple[str, Dict[str, Any]]
+        ("draft" | "delta" | "done", 이벤트 데이터)
+    """
+    provider = AVAILABLE_MODELS[model].get("provider", "openai")
+    source_name = get_language_name(source_lang)
+    target_name = get_language_name(target_lang)
+
+    # 긴 텍스트는 분할 병렬 번역 후 완료 이벤트만 보냄
+    if estimate_tokens(text) > SEGMENT_MAX_TOKENS:
+        translated_text = await translate_long_text(text, source_lang, target_lang, model)
+        yield "done", {"text": translated_text, "fallback": isinstance(translated_text, DraftFallback)}
+        return
+
+    if provider == "openai":
+        parts = []
+        async for delta in stream_with_openai(text, model, source_name, target_name, source_lang, target_lang):
+            parts.append(delta)
+            yield "delta", {"text": delta}
+        yield "done", {"text": "".join(parts).strip(), "fallback": False}
+
+    elif provider == "post-editor":
+        parts = []
+        draft = lookup_translation(make_cache_key("deepl-nmt", source_lang, target_lang, text))
+        async for kind, chunk in stream_with_post_editor(
+            text, source_lang, target_lang, source_name, target_name, draft=draft
+        ):
+            if kind == "fallback":
+                yield "done", {"text": chunk, "fallback": True}
+                return
+            if kind == "delta":
+                parts.append(chunk)
+            yield kind, {"text": chunk}
+        yield "done", {"text": "".join(parts).strip(), "fallback": False}
+
+    else:
+        translated_text = await dispatch_translation(text, source_lang, target_lang, model)
+        yield "done", {"text": translated_text, "fallback": isinstance(translated_text, DraftFallback)}
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Server-Sent Events 메시지 형식으로 직렬화합니다."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/api/translate/stream")
+async def translate_stream(request: TranslateRequest):
+    """
+    텍스트 번역 - Server-Sent Events 스트리밍
+
+    OpenAI 모델은 생성되는 토큰을 즉시 `delta` 이벤트로 보내고,
+    `deepl-post-edited`는 DeepL 초안을 `draft` 이벤트로 먼저 보낸 뒤
+    GPT-4o 후수정 결과를 `delta` 이벤트로 스트리밍합니다.
+    마지막에 최종 번역이 담긴 `done` 이벤트(실패 시 `error`)를 보냅니다.
+
+    Parameters
+    ----------
+    request : TranslateRequest
+        번역 요청 데이터
+
+    Returns
+    -------
+    StreamingResponse
+        text/event-stream 응답
+
+    Raises
+    ------
+    HTTPException
+        지원하지 않는 모델인 경우
+    """
+    # 모델 유효성 검사
+    if request.model not in AVAILABLE_MODELS:
+        raise HTTPException(
+            status_code=400, detail=f"지원하지 않는 모델입니다: {request.model}"
+        )
+
+    # 언어 코드 처리 ("auto"는 로컬 감지로 실제 언어 코드로 변환, 마크업은 텍스트만으로 감지)
+    document = parse_request_markup(request)
+    source_lang = resolve_source_lang(
+        get_language_code(request.source_lang), document.texts() if document else [request.text]
+    )
+    target_lang = get_language_code(request.target_lang)
+    cache_key = make_cache_key(request.model, source_lang, target_lang, request.text)
+
+    async def event_stream() -> AsyncIterator[str]:
+        # 오류는 SSE error 이벤트로 전달되므로 상태 코드를 직접 기록
+        started = time.perf_counter()
+        status = "200"
+
+        # 캐시 -> 번역 메모리 조회 (마크업은 세그먼트 단위로 조회)
+        stored_text = lookup_translation(cache_key) if document is None else None
+        if stored_text is not None:
+            yield format_sse("done", {"translated_text": stored_text, "cached": True})
+            TRANSLATION_LATENCY.observe(
+                time.perf_counter() - started, endpoint="translate_stream", model=request.model
+            )
+            TRANSLATION_REQUESTS.inc(endpoint="translate_stream", model=request.model, status=status)
+            return
+
+        try:
+            # HTML/Markdown은 세그먼트 배치 번역 후 완료 이벤트만 보냄
+            if document is not None:
+                translated_text, cached = await translate_markup(
+                    document, request.format, source_lang, target_lang, request.model
+                )
+                yield format_sse("done", {"translated_text": translated_text, "cached": cached})
+                return
+
+            async for event, data in stream_translation_events(
+                request.text, source_lang, target_lang, request.model
+            ):
+                if event != "done":
+                    yield format_sse(event, data)
+                    continue
+
+                # 후수정 실패로 초안을 반환한 경우는 저장하지 않음
+                if not data["fallback"]:
+                    await remember_translations([(cache_key, request.text, data["text"])])
+                yield format_sse(
+                    "done",
+                    {"translated_text": data["text"], "cached": False, "fallback": data["fallback"]},
+                )
+
+        except HTTPException as e:
+            status = str(e.status_code)
+            yield format_sse("error", {"status_code": e.status_code, "detail": e.detail})
+        except Exception as e:
+            status = "500"
+            yield format_sse("error", {"status_code": 500, "detail": f"번역 중 오류 발생: {str(e)}"})
+        finally:
+            TRANSLATION_LATENCY.observe(
+                time.perf_counter() - started, endpoint="translate_stream", model=request.model
+            )
+            TRANSLATION_REQUESTS.inc(endpoint="translate_stream", model=request.model, status=status)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def translate_draft(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    draft_model: str,
+) -> Optional[str]:
+    """
+    점진적 번역의 빠른 초안을 캐시 -> provider 순으로 가져옵니다.
+
+    초안은 최종 번역을 기다리는 동안 보여 줄 용도이므로 실패해도 예외 대신 None을 반환합니다.
+    """
+    key = make_cache_key(draft_model, source_lang, target_lang, text)
+    stored_text = lookup_translation(key)
+    if stored_text is not None:
+        return stored_text
+    try:
+        return await translate_and_remember(key, text, source_lang, target_lang, draft_model)
+    except Exception as e:
+        print(f"[WARNING] 초안 번역 실패 ({draft_model}): {e}")
+        return None
+
+
+@app.post("/api/translate/progressive", response_model=ProgressiveTranslateResponse)
+async def translate_progressive(request: TranslateRequest):
+    """
+    텍스트 번역 - 점진적 개선 (빠른 초안 즉시 반환, 최종 번역은 백그라운드)
+
+    `refinement.draft_models`에 초안 모델이 지정된 느린 모델(gpt-4o, deepl-post-edited)은
+    Google/DeepL 초안을 바로 반환하고, 최종 번역은 백그라운드에서 진행합니다.
+    최종 번역은 `GET /api/translate/progressive/{result_id}`로 조회하거나
+    `GET /api/translate/progressive/{result_id}/events` SSE로 기다립니다.
+    최종 번역이 이미 캐시에 있으면 바로 done 상태로 반환합니다.
+
+    Parameters
+    ----------
+    request : TranslateRequest
+        번역 요청 데이터
+
+    Returns
+    -------
+    ProgressiveTranslateResponse
+        결과 id, 초안, 진행 상태
+
+    Raises
+    ------
+    HTTPException
+        지원하지 않는 모델인 경우
+    """
+    with track(
+        TRANSLATION_REQUESTS,
+        TRANSLATION_LATENCY,
+        endpoint="translate_progressive",
+        model=metric_model(request.model),
+    ):
+        # 모델 유효성 검사
+        if request.model not in AVAILABLE_MODELS:
+            raise HTTPException(
+                status_code=400, detail=f"지원하지 않는 모델입니다: {request.model}"
+            )
+        require_plain_text(request)
+
+        # 언어 코드 처리 ("auto"는 로컬 감지로 실제 언어 코드로 변환)
+        source_lang = resolve_source_lang(get_language_code(request.source_lang), [request.text])
+        target_lang = get_language_code(request.target_lang)
+        cache_key = make_cache_key(request.model, source_lang, target_lang, request.text)
+
+        # 캐시 -> 번역 메모리 조회
+        stored_text = lookup_translation(cache_key)
+        result = await run_in_threadpool(
+            refinement_store.create, request.model, source_lang, target_lang, stored_text
+        )
+        if stored_text is not None:
+            return ProgressiveTranslateResponse(**result)
+
+        def start_final() -> None:
+            refinement_store.start(
+                result["result_id"],
+                lambda: translate_and_remember(
+                    cache_key, request.text, source_lang, target_lang, request.model
+                ),
+            )
+
+        draft_model = REFINEMENT_DRAFT_MODELS.get(request.model)
+        # Post-Editor는 초안(deepl-nmt 캐시)을 재사용하므로 초안이 나온 뒤 시작하고,
+        # 그 외 모델은 초안과 동시에 시작
+        reuses_draft = AVAILABLE_MODELS[request.model].get("provider") == "post-editor"
+        if not reuses_draft:
+            start_final()
+
+        if draft_model:
+            draft_text = await translate_draft(request.text, source_lang, target_lang, draft_model)
+            result = await run_in_threadpool(
+                refinement_store.set_draft, result["result_id"], draft_model, draft_text
+            )
+
+        if reuses_draft:
+            start_final()
+
+        return ProgressiveTranslateResponse(**result)
+
+
+async def get_refinement_result(result_id: str) -> Dict[str, Any]:
+    """점진적 번역 결과를 조회합니다 (없거나 만료되었으면 404)."""
+    result = await run_in_threadpool(refinement_store.get, result_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"결과를 찾을 수 없습니다 (만료됨): {result_id}")
+    return result
+
+
+@app.get("/api/translate/progressive/{result_id}", response_model=ProgressiveTranslateResponse)
+async def get_progressive_result(result_id: str):
+    """
+    점진적 번역 결과 조회 (polling)
+
+    Parameters
+    ----------
+    result_id : str
+        POST /api/translate/progressive가 반환한 결과 id
+
+    Returns
+    -------
+    ProgressiveTranslateResponse
+        초안과 진행 상태 (done이면 최종 번역 포함)
+
+    Raises
+    ------
+    HTTPException
+        결과가 없거나 만료된 경우 404
+    """
+    return ProgressiveTranslateResponse(**await get_refinement_result(result_id))
+
+
+@app.get("/api/translate/progressive/{result_id}/events")
+async def progressive_events(result_id: str):
+    """
+    점진적 번역 결과 - Server-Sent Events
+
+    초안이 있으면 `draft` 이벤트를 먼저 보내고, 최종 번역이 끝나면 `done`(실패 시 `error`)
+    이벤트를 보낸 뒤 연결을 닫습니다.
+
+    Parameters
+    ----------
+    result_id : str
+        POST /api/translate/progressive가 반환한 결과 id
+
+    Returns
+    -------
+    StreamingResponse
+        text/event-stream 응답
+
+    Raises
+    ------
+    HTTPException
+        결과가 없거나 만료된 경우 404
+    """
+    result = await get_refinement_result(result_id)
+
+    async def event_stream() -> AsyncIterator[str]:
+        if result["draft_text"] is not None:
+            yield format_sse("draft", {"text": result["draft_text"], "model": result["draft_model"]})
+        # 다른 워커가 진행 중인 결과도 저장소의 결과 행으로 기다림
+        final = await refinement_store.wait(result_id)
+        if final is None:
+            yield format_sse("error", {"status_code": 404, "detail": f"결과가 만료되었습니다: {result_id}"})
+        elif final["status"] == "done":
+            yield format_sse(
+                "done", {"translated_text": final["translated_text"], "cached": final["cached"]}
+            )
+        else:
+            yield format_sse("error", final["error"])
 
-    print("=" * 80)
-    print("FastAPI 번역 서버 시작 (OpenAI + Google + DeepL)")
-    print("=" * 80)
-    print()
-    print("서버 주소: http://localhost:8001")
-    print("API 문서: http://localhost:8001/docs")
-    print()
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def dispatch_batch_translation(
+    texts: List[str],
+    source_lang: str,
+    target_lang: str,
+    model: str,
+) -> List[str]:
+    """
+    모델의 provider에 맞는 배치 번역기를 호출합니다.
+
+    DeepL은 다중 텍스트 요청, OpenAI/Post-Editor는 번호 붙은 세그먼트 묶음 요청,
+    Google은 동시 요청 수를 제한한 단건 병렬 요청을 사용합니다.
+
+    Parameters
+    ----------
+    texts : List[str]
+        번역할 텍스트 목록
+    source_lang : str
+        원본 언어 코드
+    target_lang : str
+        목표 언어 코드
+    model : str
+        사용할 모델 ID (AVAILABLE_MODELS에 존재해야 함)
+
+    Returns
+    -------
+    List[str]
+        입력 순서와 동일한 번역 결과 목록
+
+    Raises
+    ------
+    HTTPException
+        알 수 없는 provider이거나 번역 실패 시
+    """
+    provider = AVAILABLE_MODELS[model].get("provider", "openai")
+
+    if provider == "hedged":
+        winner, translations = await hedged_call(
+            HEDGE_CANDIDATES,
+            lambda candidate: dispatch_batch_translation(
+                texts, source_lang, target_lang, candidate
+            ),
+            hedge_delay,
+        )
+        print(f"[INFO] 헤지 배치 요청 결과 사용: {winner}")
+        return translations
+
+    if provider == "routed":
+        return await dispatch_batch_translation(
+            texts, source_lang, target_lang, route_model(source_lang, target_lang)
+        )
+
+    if provider == "google":
+        return await translate_batch_with_google(
+            texts,
+            source_lang,
+            target_lang,
+            concurrency=int(_batch_config.get("google_concurrency", 8)),
+        )
+
+    if provider == "deepl":
+        return await translate_batch_with_deepl(texts, source_lang, target_lang)
+
+    if provider == "post-editor":
+        return await translate_batch_with_post_editor(
+            texts,
+            source_lang,
+            target_lang,
+            get_language_name(source_lang),
+            get_language_name(target_lang),
+        )
+
+    if provider == "openai":
+        return await translate_batch_with_openai(
+            texts,
+            source_lang,
+            target_lang,
+            model,
+            get_language_name(source_lang),
+            get_language_name(target_lang),
+        )
+
+    raise HTTPException(status_code=400, detail=f"알 수 없는 provider: {provider}")
+
+
+@app.post("/api/translate/batch", response_model=BatchTranslateResponse)
+async def translate_batch(request: BatchTranslateRequest):
+    """
+    여러 텍스트를 한 번에 번역
+
+    캐시/번역 메모리에 없는 텍스트만 모아 provider 배치 기능으로 번역합니다.
+
+    Parameters
+    ----------
+    request : BatchTranslateRequest
+        배치 번역 요청 데이터
+
+    Returns
+    -------
+    BatchTranslateResponse
+        입력 순서와 동일한 번역 결과 목록
+
+    Raises
+    ------
+    HTTPException
+        번역 실패 시
+    """
+    with track(
+        TRANSLATION_REQUESTS,
+        TRANSLATION_LATENCY,
+        endpoint="translate_batch",
+        model=metric_model(request.model),
+    ):
+        return await _translate_batch(request)
+
+
+async def _translate_batch(request: BatchTranslateRequest) -> BatchTranslateResponse:
+    """배치 번역 요청을 처리합니다 (메트릭 기록은 translate_batch에서 수행)."""
+    # 모델 유효성 검사
+    if request.model not in AVAILABLE_MODELS:
+        raise HTTPException(
+            status_code=400, detail=f"지원하지 않는 모델입니다: {request.model}"
+        )
+
+    max_texts = int(_batch_config.get("max_texts", 500))
+    if len(request.texts) > max_texts:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 번역할 수 있는 텍스트는 최대 {max_texts}개입니다.",
+        )
+
+    # 언어 코드 처리 ("auto"는 로컬 감지로 실제 언어 코드로 변환)
+    source_lang = resolve_source_lang(get_language_code(request.source_lang), request.texts)
+    target_lang = get_language_code(request.target_lang)
+
+    # 캐시 -> 번역 메모리 조회 후 남은 텍스트만 번역
+    keys = [
+        make_cache_key(request.model, source_lang, target_lang, text)
+        for text in request.texts
+    ]
+    translations: List[Optional[str]] = [lookup_translation(key) for key in keys]
+    pending = [i for i, text in enumerate(translations) if text is None]
+
+    if pending:
+        # 반복되는 텍스트(정규화 기준)는 한 번만 번역하고 결과를 모든 위치에 복사
+        pending_texts = [request.texts[i] for i in pending]
+        unique_texts, positions = deduplicate_segments(pending_texts)
+        segment_dedup.record("batch", pending_texts, unique_texts)
+
+        # 토큰 예산을 넘는 긴 텍스트는 배치에 넣지 않고 청크 단위로 번역 (출력 토큰 상한 초과 방지)
+        short_unique: List[int] = []
+        long_unique: List[int] = []
+        for i, text in enumerate(unique_texts):
+            if not text:
+                continue  # 공백뿐인 텍스트는 그대로 반환
+            (long_unique if estimate_tokens(text) > SEGMENT_MAX_TOKENS else short_unique).append(i)
+        try:
+            translated = await asyncio.gather(
+                dispatch_batch_translation(
+                    [unique_texts[i] for i in short_unique],
+                    source_lang,
+                    target_lang,
+                    request.model,
+                ) if short_unique else asyncio.sleep(0, []),
+                *(
+                    translate_long_text(unique_texts[i], source_lang, target_lang, request.model)
+                    for i in long_unique
+                ),
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"번역 중 오류 발생: {str(e)}")
+
+        unique_translations: List[str] = [""] * len(unique_texts)
+        for i, translated_text in zip(short_unique + long_unique, [*translated[0], *translated[1:]]):
+            unique_translations[i] = translated_text
+        for index, position, translated_text in zip(
+            pending, positions, expand_translations(pending_texts, positions, unique_translations)
+        ):
+            # 공백을 다시 붙이면 DraftFallback 표시가 사라지므로 다시 감쌈
+            if isinstance(unique_translations[position], DraftFallback):
+                translated_text = DraftFallback(translated_text)
+            translations[index] = translated_text
+        await remember_translations(
+            [(keys[i], request.texts[i], translations[i]) for i in pending]
+        )
+
+    return BatchTranslateResponse(
+        translations=translations,
+        model=request.model,
+        source_lang=source_lang,
+        target_lang=target_lang,
+        cached_count=len(request.texts) - len(pending),
+    )
+
+
+async def run_translation_job(
+    job: Dict[str, Any],
+    on_progress: Callable[[int, int], None],
+) -> str:
+    """
+    작업 워커가 가져간 번역 작업 하나를 처리합니다.
+
+    짧은 텍스트도 청크 하나로 처리해 진행률을 같은 방식으로 보고하며,
+    청크별 결과는 캐시/번역 메모리에 저장되므로 재시작 후 다시 처리해도 남은 청크만 번역합니다.
+    """
+    text = job["source_text"]
+    source_lang, target_lang, model = job["source_lang"], job["target_lang"], job["model"]
+    translated_text = await translate_long_text(text, source_lang, target_lang, model, on_progress)
+    await remember_translations(
+        [(make_cache_key(model, source_lang, target_lang, text), text, translated_text)]
+    )
+    return translated_text
+
+
+job_pool = None
+if job_store:
+    job_pool = JobWorkerPool(
+        job_store,
+        run_translation_job,
+        workers=int(_jobs_config.get("workers", 2)),
+        poll_interval=float(_jobs_config.get("poll_interval", 1.0)),
+        lease_seconds=float(_jobs_config.get("lease_seconds", 60)),
+    )
+
+
+def job_response(job: Dict[str, Any]) -> JobResponse:
+    """저장소의 작업을 응답 모델로 변환합니다 (이 프로세스가 처리 중이면 최신 진행률 반영)."""
+    chunks_done, chunks_total = job_pool.progress.get(
+        job["id"], (job["chunks_done"], job["chunks_total"])
+    )
+    return JobResponse(
+        job_id=job["id"],
+        status=job["status"],
+        model=job["model"],
+        source_lang=job["source_lang"],
+        target_lang=job["target_lang"],
+        chunks_done=chunks_done,
+        chunks_total=chunks_total,
+        translated_text=job["translated_text"],
+        error=job["error"],
+        created_at=job["created_at"],
+        started_at=job["started_at"],
+        finished_at=job["finished_at"],
+    )
+
+
+def require_job_store() -> JobStore:
+    """작업 저장소를 반환합니다 (비활성화되어 있으면 503)."""
+    if job_store is None:
+        raise HTTPException(status_code=503, detail="번역 작업 API가 비활성화되어 있습니다 (jobs.enabled)")
+    return job_store
+
+
+@app.post("/api/jobs", response_model=JobResponse, status_code=202)
+async def create_job(request: TranslateRequest):
+    """
+    비동기 번역 작업 등록
+
+    번역이 끝날 때까지 연결을 유지하지 않도록 작업을 대기열에 등록하고 작업 id를 바로 반환합니다.
+    결과는 `GET /api/jobs/{job_id}`로 조회합니다. 최종 번역이 이미 캐시에 있으면 완료 상태로 등록합니다.
+
+    Parameters
+    ----------
+    request : TranslateRequest
+        번역 요청 데이터
+
+    Returns
+    -------
+    JobResponse
+        등록된 작업 (202)
+
+    Raises
+    ------
+    HTTPException
+        지원하지 않는 모델(400), 텍스트 길이 초과(413), 대기열 초과(429), 작업 API 비활성화(503)
+    """
+    store = require_job_store()
+    if request.model not in AVAILABLE_MODELS:
+        raise HTTPException(
+            status_code=400, detail=f"지원하지 않는 모델입니다: {request.model}"
+        )
+    require_plain_text(request)
+    if len(request.text) > JOBS_MAX_CHARS:
+        raise HTTPException(
+            status_code=413, detail=f"작업당 최대 {JOBS_MAX_CHARS}자까지 번역할 수 있습니다"
+        )
+
+    source_lang = resolve_source_lang(get_language_code(request.source_lang), [request.text])
+    target_lang = get_language_code(request.target_lang)
+    stored_text = lookup_translation(
+        make_cache_key(request.model, source_lang, target_lang, request.text)
+    )
+
+    if stored_text is None:
+        counts = await run_in_threadpool(store.counts)
+        if counts["queued"] >= JOBS_MAX_QUEUED:
+            raise HTTPException(status_code=429, detail="번역 작업 대기열이 가득 찼습니다")
+
+    job = await run_in_threadpool(
+        store.create, request.model, source_lang, target_lang, request.text, stored_text
+    )
+    job_pool.notify()
+    return job_response(job)
+
+
+@app.get("/api/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """
+    비동기 번역 작업 조회
+
+    Parameters
+    ----------
+    job_id : str
+        POST /api/jobs가 반환한 작업 id
+
+    Returns
+    -------
+    JobResponse
+        상태, 진행률(완료 청크/전체 청크), 완료 시 번역 결과
+
+    Raises
+    ------
+    HTTPException
+        작업이 없는 경우 404
+    """
+    job = await run_in_threadpool(require_job_store().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return job_response(job)
+
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """
+    번역 캐시, 번역 메모리, 동일 요청 병합, 모델별 지연시간 통계 반환
+
+    Returns
+    -------
+    dict
+        캐시 항목 수, 적중/실패/제거 횟수, 적중률과 번역 메모리/병합/지연시간 통계
+    """
+    memory_stats = None
+    if translation_memory:
+        memory_stats = await run_in_threadpool(translation_memory.stats)
+        if fuzzy_memory:
+            memory_stats["fuzzy"] = fuzzy_memory.stats()
+
+    return {
+        "enabled": CACHE_ENABLED,
+        **translation_cache.stats(),
+        "translation_memory": memory_stats,
+        "inflight": inflight_translations.stats(),
+        "dedup": segment_dedup.stats(),
+        "latency": provider_latency.stats(),
+    }
+
+
+@app.get("/api/usage")
+async def get_usage(window: int = 86400, interval: Optional[int] = None):
+    """
+    provider 사용량/예상 비용 조회
+
+    과금 모델(Post-Editor는 DeepL과 실제 후수정 모델로 나뉨)별 호출 수, OpenAI 입력/출력 토큰,
+    문자 수, 단가표 기준 예상 비용(USD)을 합산합니다. 모든 워커의 기록을 합친 값입니다.
+
+    Parameters
+    ----------
+    window : int
+        조회 기간(초, 현재부터 거슬러 올라감)
+    interval : Optional[int]
+        주어지면 이 간격(초)의 시간 구간별 모델 합계도 반환
+
+    Returns
+    -------
+    dict
+        기간, 모델별 합계(models), 전체 합계(total), 시간 구간별 합계(intervals)
+    """
+    if usage_ledger is None:
+        raise HTTPException(status_code=503, detail="사용량 장부가 비활성화되어 있습니다 (usage.enabled)")
+    if window <= 0 or (interval is not None and interval <= 0):
+        raise HTTPException(status_code=400, detail="window와 interval은 양수여야 합니다")
+
+    # 이 워커의 아직 합산하지 않은 기록까지 포함
+    await run_in_threadpool(usage_ledger.flush)
+    return await run_in_threadpool(usage_ledger.query, time.time() - window, None, interval)
+
+
+@app.get("/api/scheduler/stats")
+async def get_scheduler_stats():
+    """
+    provider별 요청 스케줄러 통계 반환
+
+    Returns
+    -------
+    dict
+        provider -> 대기열 깊이, 진행 중 요청 수, 평균/최대 대기 시간 등
+    """
+    return scheduler_stats()
+
+
+@app.get("/health")
+async def health():
+    """
+    liveness 체크
+
+    프로세스가 요청을 처리할 수 있으면 항상 200을 반환합니다.
+
+    Returns
+    -------
+    dict
+        상태와 가동 시간(초)
+    """
+    return {"status": "ok", "uptime_seconds": time.time() - health_state.started_at}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """
+    readiness 체크
+
+    시작 시 provider 예열이 끝났고 사용 가능한(클라이언트 초기화, 서킷 닫힘) provider가
+    하나 이상이면 200, 아니면 503을 반환합니다. 두 경우 모두 provider별 상태를 포함합니다.
+
+    Returns
+    -------
+    JSONResponse
+        ready 여부, 예열 완료 여부, provider별 클라이언트 초기화 여부, 예열 결과,
+        서킷 상태, 마지막 성공 시각, 모델별 p50/p95 지연시간
+    """
+    report = health_state.readiness(provider_latency)
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Prometheus 텍스트 형식 메트릭 반환
+
+    요청 수/상태 코드, 엔드포인트 및 provider 지연시간 히스토그램,
+    OpenAI 토큰/DeepL 과금 문자 사용량, 캐시/대기열/서킷 상태를 포함합니다.
+
+    Returns
+    -------
+    PlainTextResponse
+        text/plain; version=0.0.4 형식 메트릭
+    """
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+if __name__ == "__main__":
+    # 실행 옵션(dev/prod, 워커 수, 이벤트 루프 등)은 run_server와 동일하게 처리
+    from backend.run_server import main
 
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    main()
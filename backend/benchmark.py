@@ -0,0 +1,361 @@
+"""
+번역 API 벤치마크 (로컬 스텁 provider 사용)
+
+스텁 provider 서버(backend.stub_providers)와 번역 서버(backend.run_server, prod 모드)를
+별도 프로세스로 띄운 뒤, 모델과 동시성 수준별로 /api/translate에 요청을 보내
+처리량, p50/p95/p99 지연시간, 오류율을 측정합니다.
+API 키나 네트워크 없이 실행되므로 성능 변경마다 같은 조건으로 측정할 수 있습니다.
+
+결과는 커밋 해시와 함께 JSON 파일로 저장되며, 이전 실행 결과와 비교해 변화량을 출력합니다.
+
+실행 방법:
+    rye run python -m backend.benchmark
+    rye run python -m backend.benchmark --models google-translate,gpt-4o-mini --concurrency 1,16,64 --requests 200
+    rye run python -m backend.benchmark --openai-latency 800:0.6:0.02 --workers 2 --compare none
+
+주의사항:
+    - 캐시 적중을 피하도록 요청마다 다른 텍스트를 보냅니다
+    - 번역 메모리는 끄고, 기본적으로 rate_limits의 초당 요청/분당 토큰 한도를 제거합니다
+      (--keep-rate-limits로 유지)
+    - 비동기 작업 API(jobs)를 꺼서 실제 data/jobs.sqlite3의 대기 작업을 스텁 provider로 처리하지 않습니다
+    - 사용량 장부(usage)를 꺼서 스텁 호출의 토큰/비용이 data/usage.sqlite3에 기록되지 않습니다
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+import yaml
+
+from backend.settings import load_config
+
+project_root = Path(__file__).parent.parent
+
+# 벤치마크 대상 모델 (provider별 대표 모델)
+DEFAULT_MODELS = "google-translate,deepl-nmt,gpt-4o-mini,deepl-post-edited"
+
+
+def free_port() -> int:
+    """사용 가능한 로컬 포트를 반환합니다."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """정렬된 값 목록의 nearest-rank 백분위수를 반환합니다."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))]
+
+
+def git_commit() -> str:
+    """현재 커밋 해시(변경 사항이 있으면 "-dirty")를 반환합니다."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=project_root, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=project_root, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_benchmark_config(keep_rate_limits: bool) -> Path:
+    """
+    벤치마크용 설정 파일을 임시 경로에 생성합니다.
+
+    번역 메모리를 끄고(디스크 I/O와 이전 실행 결과 재사용 방지), 작업 API를 꺼서
+    실제 작업 저장소(data/jobs.sqlite3)의 대기 작업을 가져가지 않게 하고, 사용량 장부를 꺼서
+    스텁 호출의 예상 비용이 실제 장부(data/usage.sqlite3)에 쌓이지 않게 하며,
+    keep_rate_limits가 False면 provider 초당 요청/분당 토큰 한도를 제거합니다.
+
+    Parameters
+    ----------
+    keep_rate_limits : bool
+        rate_limits 설정을 그대로 유지할지 여부
+
+    Returns
+    -------
+    Path
+        생성한 설정 파일 경로
+    """
+    config = json.loads(json.dumps(load_config()))
+    config.setdefault("translation_memory", {})["enabled"] = False
+    config.setdefault("jobs", {})["enabled"] = False
+    config.setdefault("usage", {})["enabled"] = False
+
+    if not keep_rate_limits:
+        for limits in (config.get("rate_limits") or {}).values():
+            for key in ("requests_per_second", "tokens_per_minute", "characters_per_minute"):
+                limits.pop(key, None)
+
+    handle, path = tempfile.mkstemp(prefix="benchmark-config-", suffix=".yaml")
+    with os.fdopen(handle, "w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f, allow_unicode=True)
+    return Path(path)
+
+
+async def wait_until_ready(client: httpx.AsyncClient, url: str, timeout: float) -> None:
+    """url이 200을 반환할 때까지 기다립니다."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get(url)).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"서버가 {timeout:.0f}초 안에 준비되지 않았습니다: {url}")
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    url: str,
+    model: str,
+    total_requests: int,
+    concurrency: int,
+    text: str,
+) -> Dict[str, Any]:
+    """
+    한 모델/동시성 수준으로 요청을 보내고 결과를 집계합니다.
+
+    Parameters
+    ----------
+    client : httpx.AsyncClient
+        HTTP 클라이언트
+    url : str
+        번역 엔드포인트 URL
+    model : str
+        모델 ID
+    total_requests : int
+        전체 요청 수
+    concurrency : int
+        동시에 처리할 최대 요청 수
+    text : str
+        번역할 텍스트 (요청마다 고유 번호를 붙여 캐시 적중을 피함)
+
+    Returns
+    -------
+    Dict[str, Any]
+        처리량, p50/p95/p99/최대 지연시간(ms), 오류율, 상태 코드별 개수
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    run_id = uuid.uuid4().hex[:8]
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+
+    async def one_request(index: int) -> None:
+        payload = {
+            "text": f"{text} ({run_id}-{index})",
+            "source_lang": "en",
+            "target_lang": "ko",
+            "model": model,
+        }
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.post(url, json=payload)
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_request(i) for i in range(total_requests)))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    errors = total_requests - statuses.get("200", 0)
+    return {
+        "model": model,
+        "concurrency": concurrency,
+        "requests": total_requests,
+        "elapsed": elapsed,
+        "throughput": total_requests / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+        "error_rate": errors / total_requests if total_requests else 0.0,
+        "statuses": dict(statuses),
+    }
+
+
+def find_baseline(results_dir: Path, compare: str, current: Path) -> Optional[Path]:
+    """비교할 이전 결과 파일을 찾습니다 ("latest": 가장 최근 파일, "none": 비교 안 함)."""
+    if compare == "none":
+        return None
+    if compare != "latest":
+        return Path(compare)
+    previous = sorted(p for p in results_dir.glob("*.json") if p != current)
+    return previous[-1] if previous else None
+
+
+def print_comparison(baseline_path: Path, results: List[Dict[str, Any]]) -> None:
+    """이전 결과 대비 처리량과 p95/p99 지연시간 변화율을 출력합니다."""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    previous = {(r["model"], r["concurrency"]): r for r in baseline["results"]}
+
+    def change(new: float, old: float) -> str:
+        return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+    print()
+    print(f"[INFO] 비교 기준: {baseline_path.name} (commit {baseline.get('commit')})")
+    print(f"{'model':>20} {'conc':>5} {'req/s':>9} {'p95':>9} {'p99':>9} {'errors':>9}")
+    for result in results:
+        old = previous.get((result["model"], result["concurrency"]))
+        if old is None:
+            continue
+        print(
+            f"{result['model']:>20} {result['concurrency']:>5} "
+            f"{change(result['throughput'], old['throughput']):>9} "
+            f"{change(result['p95_ms'], old['p95_ms']):>9} "
+            f"{change(result['p99_ms'], old['p99_ms']):>9} "
+            f"{(result['error_rate'] - old['error_rate']) * 100:>+8.1f}p"
+        )
+
+
+async def run_benchmark(args: argparse.Namespace, api_url: str) -> List[Dict[str, Any]]:
+    """모델/동시성 수준별 측정을 순서대로 실행합니다."""
+    models = [model.strip() for model in args.models.split(",") if model.strip()]
+    levels = [int(level) for level in args.concurrency.split(",")]
+    url = f"{api_url}/api/translate"
+
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    results = []
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        await wait_until_ready(client, f"{api_url}/health/ready", args.startup_timeout)
+
+        print(f"{'model':>20} {'conc':>5} {'req/s':>9} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'errors':>7}")
+        for model in models:
+            # 워커/연결 예열용 요청 (측정에서 제외)
+            await run_level(client, url, model, min(10, args.requests), min(10, max(levels)), args.text)
+            for level in levels:
+                result = await run_level(client, url, model, args.requests, level, args.text)
+                results.append(result)
+                print(
+                    f"{model:>20} {level:>5} {result['throughput']:>9.1f} "
+                    f"{result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f} "
+                    f"{result['p99_ms']:>9.1f} {result['error_rate'] * 100:>6.1f}%"
+                )
+    return results
+
+
+def main(args: argparse.Namespace) -> None:
+    stub_port, api_port = free_port(), free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    api_url = f"http://127.0.0.1:{api_port}"
+    config_path = write_benchmark_config(args.keep_rate_limits)
+
+    env = {
+        **os.environ,
+        "TRANSLATION_CONFIG": str(config_path),
+        "OPENAI_API_KEY": "stub-key",
+        "OPENAI_BASE_URL": f"{stub_url}/openai/v1",
+        "DEEPL_API_KEY": "stub-key",
+        "DEEPL_SERVER_URL": f"{stub_url}/deepl/",
+        "GOOGLE_TRANSLATE_URL": f"{stub_url}/google/m",
+    }
+    stub_cmd = [
+        sys.executable, "-m", "backend.stub_providers", "--port", str(stub_port),
+        "--openai", args.openai_latency, "--deepl", args.deepl_latency, "--google", args.google_latency,
+    ]
+    api_cmd = [
+        sys.executable, "-m", "backend.run_server", "--mode", "prod", "--host", "127.0.0.1",
+        "--port", str(api_port), "--workers", str(args.workers), "--log-level", "warning",
+        "--graceful-timeout", "1",
+    ]
+
+    print("=" * 80)
+    print(f"벤치마크: models={args.models}, concurrency={args.concurrency}, requests={args.requests}")
+    print(
+        f"스텁 지연시간(중앙값ms:sigma:오류율) openai={args.openai_latency}, "
+        f"deepl={args.deepl_latency}, google={args.google_latency}, workers={args.workers}"
+    )
+    print("=" * 80)
+
+    server_log = tempfile.TemporaryFile(mode="w+")
+    processes = []
+    try:
+        processes.append(subprocess.Popen(stub_cmd, cwd=project_root, env=env, stdout=server_log, stderr=subprocess.STDOUT))
+        processes.append(subprocess.Popen(api_cmd, cwd=project_root, env=env, stdout=server_log, stderr=subprocess.STDOUT))
+        results = asyncio.run(run_benchmark(args, api_url))
+    except RuntimeError as e:
+        server_log.seek(0)
+        print(f"[ERROR] {e}")
+        print(server_log.read()[-3000:])
+        raise SystemExit(1)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        config_path.unlink(missing_ok=True)
+
+    results_dir = Path(args.results_dir)
+    if not results_dir.is_absolute():
+        results_dir = project_root / results_dir
+    results_dir.mkdir(parents=True, exist_ok=True)
+
+    commit = git_commit()
+    result_path = results_dir / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_{commit}.json"
+    result_path.write_text(json.dumps({
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "parameters": {
+            "models": args.models,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "workers": args.workers,
+            "keep_rate_limits": args.keep_rate_limits,
+            "openai_latency": args.openai_latency,
+            "deepl_latency": args.deepl_latency,
+            "google_latency": args.google_latency,
+        },
+        "results": results,
+    }, ensure_ascii=False, indent=2), encoding="utf-8")
+    print()
+    print(f"[OK] 결과 저장: {result_path}")
+
+    baseline_path = find_baseline(results_dir, args.compare, result_path)
+    if baseline_path:
+        print_comparison(baseline_path, results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="번역 API 벤치마크 (로컬 스텁 provider)")
+    parser.add_argument("--models", default=DEFAULT_MODELS, help="쉼표로 구분한 모델 ID")
+    parser.add_argument("--concurrency", default="1,8,32", help="쉼표로 구분한 동시성 수준")
+    parser.add_argument("--requests", type=int, default=100, help="모델/동시성 수준별 요청 수")
+    parser.add_argument("--text", default="The quick brown fox jumps over the lazy dog.", help="번역할 텍스트")
+    parser.add_argument("--workers", type=int, default=1, help="번역 서버 워커 수")
+    parser.add_argument("--openai-latency", default="400:0.4:0", help="OpenAI 스텁 중앙값ms:sigma:오류율")
+    parser.add_argument("--deepl-latency", default="150:0.3:0", help="DeepL 스텁 중앙값ms:sigma:오류율")
+    parser.add_argument("--google-latency", default="120:0.3:0", help="Google 스텁 중앙값ms:sigma:오류율")
+    parser.add_argument("--keep-rate-limits", action="store_true", help="rate_limits 한도를 그대로 적용")
+    parser.add_argument("--results-dir", default="data/benchmarks", help="결과 저장 디렉토리 (프로젝트 루트 기준)")
+    parser.add_argument("--compare", default="latest", help="비교할 결과 파일 경로, latest 또는 none")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃(초)")
+    parser.add_argument("--startup-timeout", type=float, default=30.0, help="서버 준비 대기 시간(초)")
+
+    main(parser.parse_args())
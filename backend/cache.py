@@ -0,0 +1,187 @@
+"""
+번역 결과 메모리 캐시
+
+(모델, 원본 언어, 목표 언어, 텍스트 해시)를 키로 번역 결과를 보관합니다.
+항목 수/바이트 상한을 넘으면 가장 오래 사용되지 않은 항목부터 제거(LRU)하고,
+TTL이 지난 항목은 조회 시점에 만료시킵니다.
+"""
+
+import hashlib
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+CacheKey = Tuple[str, str, str, str]
+
+# 항목당 고정 오버헤드 추정치 (키 튜플, OrderedDict 노드 등)
+_ENTRY_OVERHEAD = 200
+
+
+def make_cache_key(
+    model: str,
+    source_lang: str,
+    target_lang: str,
+    text: str,
+) -> CacheKey:
+    """
+    캐시 키를 생성합니다.
+
+    Parameters
+    ----------
+    model : str
+        모델 ID
+    source_lang : str
+        원본 언어 코드
+    target_lang : str
+        목표 언어 코드
+    text : str
+        번역할 텍스트
+
+    Returns
+    -------
+    CacheKey
+        (모델, 정규화된 원본 언어, 정규화된 목표 언어, 텍스트 SHA-256)
+    """
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return (
+        model,
+        source_lang.strip().lower(),
+        target_lang.strip().lower(),
+        text_hash,
+    )
+
+
+class TranslationCache:
+    """
+    LRU + TTL 번역 결과 캐시
+
+    Parameters
+    ----------
+    max_entries : int
+        최대 항목 수
+    max_bytes : int
+        번역 결과가 차지할 수 있는 최대 바이트 (추정치)
+    ttl_seconds : float
+        항목 유효 시간(초), 0 이하이면 만료 없음
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 3600,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (번역 결과, 만료 시각, 추정 크기)
+        self._entries: "OrderedDict[CacheKey, Tuple[str, float, int]]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "TranslationCache":
+        """configs/config.yaml의 cache 섹션으로 캐시를 생성합니다."""
+        return cls(
+            max_entries=int(config.get("max_entries", 10000)),
+            max_bytes=int(config.get("max_bytes", 64 * 1024 * 1024)),
+            ttl_seconds=float(config.get("ttl_seconds", 3600)),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        """
+        캐시된 번역 결과를 조회합니다.
+
+        Parameters
+        ----------
+        key : CacheKey
+            make_cache_key로 생성한 키
+
+        Returns
+        -------
+        Optional[str]
+            번역 결과 (없거나 만료되었으면 None)
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at, _ = entry
+        if expires_at and expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: CacheKey, value: str) -> None:
+        """
+        번역 결과를 저장하고 상한을 넘으면 LRU 항목을 제거합니다.
+
+        Parameters
+        ----------
+        key : CacheKey
+            make_cache_key로 생성한 키
+        value : str
+            번역 결과
+        """
+        size = sys.getsizeof(value) + _ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+        self._entries[key] = (value, expires_at, size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """모든 항목을 제거합니다 (통계는 유지)."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계를 반환합니다.
+
+        Returns
+        -------
+        Dict[str, Any]
+            항목 수, 사용 바이트, 적중/실패/제거 횟수, 적중률
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _remove(self, key: CacheKey) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
@@ -0,0 +1,140 @@
+"""
+서버 헬스 체크 및 provider 예열
+
+- liveness: 프로세스가 요청을 처리할 수 있는지 (항상 성공)
+- readiness: 시작 시 provider 예열이 끝났고 사용 가능한 provider가 하나 이상인지
+
+예열은 provider별 가벼운 요청(모델 목록, 사용량 조회)을 한 번 보내 연결 풀과
+TLS 세션을 미리 만들어 두므로, 배포 직후 첫 사용자 요청이 연결 설정 지연을 겪지 않습니다.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from .hedging import LatencyTracker
+from .models_config import AVAILABLE_MODELS
+from .translators import (
+    breaker_stats,
+    deepl_client_ready,
+    google_client_ready,
+    openai_client_ready,
+    warm_up_deepl,
+    warm_up_openai,
+)
+
+# provider 이름 -> 클라이언트 초기화 여부 확인 함수
+CLIENT_CHECKS: Dict[str, Callable[[], bool]] = {
+    "openai": openai_client_ready,
+    "deepl": deepl_client_ready,
+    "google": google_client_ready,
+}
+
+# provider 이름 -> 예열 함수 (Google은 예열할 연결 풀이 없음)
+WARM_UPS: Dict[str, Callable[[], Awaitable[bool]]] = {
+    "openai": warm_up_openai,
+    "deepl": warm_up_deepl,
+}
+
+
+class HealthState:
+    """시작 시 예열 결과와 readiness 상태를 보관합니다."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.warm_up_done = False
+        # provider 이름 -> "ok" | "skipped" | "failed: ..." | "timeout"
+        self.warm_up: Dict[str, str] = {}
+
+    async def warm_up_providers(self, timeout: float) -> None:
+        """
+        클라이언트가 초기화된 provider를 동시에 예열합니다.
+
+        예열 실패는 경고만 남기며, 끝나면 성공/실패와 무관하게 readiness 판단을 시작합니다.
+
+        Parameters
+        ----------
+        timeout : float
+            provider별 예열 제한 시간(초)
+        """
+
+        async def run(provider: str, warm_up: Callable[[], Awaitable[bool]]) -> None:
+            started = time.perf_counter()
+            try:
+                warmed = await asyncio.wait_for(warm_up(), timeout=timeout)
+            except asyncio.TimeoutError:
+                self.warm_up[provider] = "timeout"
+                print(f"[WARNING] {provider} 예열 시간 초과 ({timeout:.0f}초)")
+            except Exception as e:
+                self.warm_up[provider] = f"failed: {type(e).__name__}"
+                print(f"[WARNING] {provider} 예열 실패: {e}")
+            else:
+                self.warm_up[provider] = "ok" if warmed else "skipped"
+                if warmed:
+                    elapsed = (time.perf_counter() - started) * 1000
+                    print(f"[OK] {provider} 연결 예열 완료 ({elapsed:.0f}ms)")
+
+        try:
+            await asyncio.gather(*(run(name, fn) for name, fn in WARM_UPS.items()))
+        finally:
+            self.warm_up_done = True
+
+    def providers(self, latency: LatencyTracker) -> Dict[str, Dict[str, Any]]:
+        """
+        provider별 상태를 반환합니다.
+
+        Parameters
+        ----------
+        latency : LatencyTracker
+            모델별 최근 지연시간 기록
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            provider -> 클라이언트 초기화 여부, 예열 결과, 서킷 상태,
+            마지막 성공 시각, 모델별 p50/p95 지연시간, 사용 가능 여부
+        """
+        breakers = breaker_stats()
+        latency_stats = latency.stats()
+        report = {}
+        for provider, client_ready in CLIENT_CHECKS.items():
+            breaker = breakers.get(provider, {})
+            initialized = client_ready()
+            circuit = breaker.get("state", "closed")
+            report[provider] = {
+                "client_initialized": initialized,
+                "warm_up": self.warm_up.get(provider, None if provider in WARM_UPS else "skipped"),
+                "circuit": circuit,
+                "last_success_at": breaker.get("last_success_at"),
+                "latency": {
+                    model: latency_stats[model]
+                    for model, config in AVAILABLE_MODELS.items()
+                    if config.get("provider") == provider and model in latency_stats
+                },
+                "available": initialized and circuit != "open",
+            }
+        return report
+
+    def readiness(self, latency: LatencyTracker) -> Dict[str, Any]:
+        """
+        readiness 판단 결과를 반환합니다.
+
+        Parameters
+        ----------
+        latency : LatencyTracker
+            모델별 최근 지연시간 기록
+
+        Returns
+        -------
+        Dict[str, Any]
+            ready 여부, 예열 완료 여부, 가동 시간(초), provider별 상태
+        """
+        providers = self.providers(latency)
+        ready = self.warm_up_done and any(state["available"] for state in providers.values())
+        return {
+            "status": "ready" if ready else "not_ready",
+            "ready": ready,
+            "warm_up_done": self.warm_up_done,
+            "uptime_seconds": time.time() - self.started_at,
+            "providers": providers,
+        }
@@ -0,0 +1,162 @@
+"""
+헤지(hedged) 요청 및 provider 지연시간 추적
+
+여러 provider에 같은 번역을 요청하고 가장 먼저 성공한 결과를 사용합니다.
+- race 모드: 모든 후보에 동시에 요청
+- delayed 모드: 앞 후보가 자신의 p95 지연시간을 넘기거나 실패할 때만 다음 후보에 요청
+남은 요청은 결과가 정해지는 즉시 취소됩니다.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """
+    모델별 최근 성공 호출 지연시간(초)을 보관하고 백분위수를 계산합니다.
+
+    Parameters
+    ----------
+    window : int
+        모델별로 보관할 최근 기록 수
+    """
+
+    def __init__(self, window: int = 100):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, model: str, seconds: float) -> None:
+        """지연시간 기록을 추가합니다."""
+        samples = self._samples.get(model)
+        if samples is None:
+            samples = self._samples[model] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def percentile(self, model: str, q: float, min_samples: int = 5) -> Optional[float]:
+        """
+        모델의 지연시간 백분위수를 반환합니다.
+
+        Parameters
+        ----------
+        model : str
+            모델 ID
+        q : float
+            백분위 (0~1, 예: 0.95)
+        min_samples : int
+            계산에 필요한 최소 기록 수
+
+        Returns
+        -------
+        Optional[float]
+            지연시간(초), 기록이 부족하면 None
+        """
+        samples = self._samples.get(model)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        모델별 지연시간 요약을 반환합니다.
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            모델 ID -> 기록 수, p50/p95 지연시간(ms)
+        """
+        summary = {}
+        for model, samples in self._samples.items():
+            ordered = sorted(samples)
+            summary[model] = {
+                "samples": len(ordered),
+                "p50_ms": ordered[len(ordered) // 2] * 1000,
+                "p95_ms": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000,
+            }
+        return summary
+
+
+async def hedged_call(
+    candidates: List[str],
+    call: Callable[[str], Awaitable[T]],
+    hedge_delay: Callable[[str], Optional[float]],
+) -> Tuple[str, T]:
+    """
+    후보 provider에 순차/동시 요청하여 가장 먼저 성공한 결과를 반환합니다.
+
+    Parameters
+    ----------
+    candidates : List[str]
+        요청할 모델 ID 목록 (우선순위 순)
+    call : Callable[[str], Awaitable[T]]
+        모델 ID를 받아 번역을 수행하는 코루틴 함수
+    hedge_delay : Callable[[str], Optional[float]]
+        방금 시작한 후보 모델 ID를 받아, 다음 후보를 시작하기 전 기다릴 시간(초)을 반환
+        (0이면 즉시 시작, None이면 앞 후보가 실패할 때만 시작)
+
+    Returns
+    -------
+    Tuple[str, T]
+        (성공한 모델 ID, 결과)
+
+    Raises
+    ------
+    Exception
+        모든 후보가 실패하면 마지막 예외
+    """
+    pending: Dict["asyncio.Task[T]", str] = {}
+    next_index = 0
+    last_error: Optional[BaseException] = None
+
+    def launch_next() -> None:
+        nonlocal next_index
+        model = candidates[next_index]
+        next_index += 1
+        pending[asyncio.ensure_future(call(model))] = model
+
+    try:
+        launch_next()
+        while pending:
+            timeout = None
+            if next_index < len(candidates):
+                timeout = hedge_delay(candidates[next_index - 1])
+
+            if timeout is not None and timeout <= 0:
+                launch_next()
+                continue
+
+            done: Set["asyncio.Task[T]"]
+            done, _ = await asyncio.wait(
+                set(pending), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if not done:
+                # 앞 후보가 지연 기준을 넘김 -> 다음 후보 추가 요청
+                launch_next()
+                continue
+
+            succeeded = None
+            for task in done:
+                model = pending.pop(task)
+                if task.exception() is None:
+                    succeeded = succeeded or (model, task.result())
+                    continue
+                last_error = task.exception()
+                print(f"[WARNING] 헤지 후보 실패: {model} ({last_error})")
+
+            if succeeded:
+                return succeeded
+
+            # 진행 중인 후보가 모두 실패했으면 다음 후보를 즉시 시작
+            if not pending and next_index < len(candidates):
+                launch_next()
+
+        raise last_error if last_error else RuntimeError("헤지 후보가 없습니다.")
+
+    finally:
+        for task in pending:
+            task.cancel()
+
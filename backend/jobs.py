@@ -0,0 +1,407 @@
+"""
+비동기 번역 작업 (job) 저장소와 워커 풀
+
+큰 입력은 HTTP 연결을 번역이 끝날 때까지 붙잡지 않도록 작업으로 등록하고 id를 바로 반환합니다.
+작업은 SQLite(WAL)에 저장되므로 워커 프로세스 간에 공유되고 재시작 후에도 이어서 처리됩니다.
+
+- 워커는 트랜잭션 안에서 대기 중인 작업 하나를 가져가고(claim) 소유자로 기록합니다.
+- 진행 중인 작업은 주기적으로 heartbeat와 진행률(완료 청크/전체 청크)을 기록하며,
+  heartbeat가 lease_seconds 이상 끊긴 작업(프로세스 비정상 종료)은 다른 워커가 다시 가져갑니다.
+- 정상 종료 시 진행 중이던 작업은 대기 상태로 되돌립니다. 이미 번역한 청크는
+  캐시/번역 메모리에 남아 있으므로 다시 처리할 때 provider를 다시 호출하지 않습니다.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    model TEXT NOT NULL,
+    source_lang TEXT NOT NULL,
+    target_lang TEXT NOT NULL,
+    source_text TEXT NOT NULL,
+    translated_text TEXT,
+    error TEXT,
+    chunks_done INTEGER NOT NULL DEFAULT 0,
+    chunks_total INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created_at ON jobs (status, created_at);
+"""
+
+
+class JobStore:
+    """
+    SQLite(WAL) 작업 저장소
+
+    sqlite3 연결은 스레드 간 공유할 수 없으므로 스레드마다 별도 연결을 사용합니다.
+    모든 메서드는 블로킹 I/O이므로 이벤트 루프에서는 run_in_threadpool로 호출합니다.
+
+    Parameters
+    ----------
+    path : str or Path
+        SQLite 파일 경로 (상위 디렉토리는 자동 생성)
+    max_attempts : int
+        작업당 최대 처리 시도 횟수 (비정상 종료가 반복되는 작업은 실패 처리)
+    """
+
+    def __init__(self, path, max_attempts: int = 3):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # 트랜잭션은 직접 관리 (claim에서 BEGIN IMMEDIATE 사용)
+            conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _to_dict(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(row)
+        job["error"] = json.loads(job["error"]) if job["error"] else None
+        return job
+
+    def create(
+        self,
+        model: str,
+        source_lang: str,
+        target_lang: str,
+        text: str,
+        translated_text: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        작업을 등록합니다.
+
+        Parameters
+        ----------
+        model : str
+            모델 ID
+        source_lang : str
+            원본 언어 코드
+        target_lang : str
+            목표 언어 코드
+        text : str
+            번역할 텍스트
+        translated_text : Optional[str]
+            이미 있는 번역 결과 (캐시 적중 시). 주어지면 완료 상태로 등록
+
+        Returns
+        -------
+        Dict[str, Any]
+            등록된 작업
+        """
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        status = "queued" if translated_text is None else "done"
+        self._connect().execute(
+            "INSERT INTO jobs (id, status, model, source_lang, target_lang, source_text, "
+            "translated_text, created_at, finished_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                job_id, status, model, source_lang, target_lang, text,
+                translated_text, now, None if translated_text is None else now,
+            ),
+        )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업을 조회합니다 (없으면 None)."""
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row)
+
+    def claim(self, owner: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """
+        가장 오래된 대기 작업(또는 heartbeat가 끊긴 진행 중 작업) 하나를 가져갑니다.
+
+        Parameters
+        ----------
+        owner : str
+            워커 식별자
+        lease_seconds : float
+            진행 중 작업의 heartbeat가 이보다 오래 끊기면 다시 가져갈 수 있음
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            가져간 작업 (없으면 None)
+        """
+        conn = self._connect()
+        while True:
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id, attempts FROM jobs "
+                    "WHERE status = 'queued' OR (status = 'running' AND heartbeat_at < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (now - lease_seconds,),
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                if row["attempts"] >= self.max_attempts:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'failed', owner = NULL, error = ?, finished_at = ? WHERE id = ?",
+                        (
+                            json.dumps({"status_code": 500, "detail": "최대 처리 시도 횟수를 초과했습니다"}),
+                            now,
+                            row["id"],
+                        ),
+                    )
+                    conn.execute("COMMIT")
+                    continue
+
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', owner = ?, attempts = attempts + 1, "
+                    "started_at = COALESCE(started_at, ?), heartbeat_at = ? WHERE id = ?",
+                    (owner, now, now, row["id"]),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return self.get(row["id"])
+
+    def heartbeat(self, owner: str, progress: Dict[str, Tuple[int, int]]) -> None:
+        """
+        워커가 진행 중인 작업의 heartbeat와 진행률을 기록합니다.
+
+        Parameters
+        ----------
+        owner : str
+            워커 식별자
+        progress : Dict[str, Tuple[int, int]]
+            작업 id -> (완료 청크 수, 전체 청크 수)
+        """
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN")
+            conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status = 'running'",
+                (now, owner),
+            )
+            conn.executemany(
+                "UPDATE jobs SET chunks_done = ?, chunks_total = ? WHERE id = ? AND owner = ?",
+                [(done, total, job_id, owner) for job_id, (done, total) in progress.items()],
+            )
+
+    def finish(self, job_id: str, owner: str, translated_text: str, chunks_total: int) -> None:
+        """작업을 완료 상태로 기록합니다."""
+        self._connect().execute(
+            "UPDATE jobs SET status = 'done', translated_text = ?, chunks_done = ?, chunks_total = ?, "
+            "owner = NULL, finished_at = ? WHERE id = ? AND owner = ?",
+            (translated_text, chunks_total, chunks_total, time.time(), job_id, owner),
+        )
+
+    def fail(self, job_id: str, owner: str, status_code: int, detail: Any) -> None:
+        """작업을 실패 상태로 기록합니다."""
+        self._connect().execute(
+            "UPDATE jobs SET status = 'failed', error = ?, owner = NULL, finished_at = ? "
+            "WHERE id = ? AND owner = ?",
+            (json.dumps({"status_code": status_code, "detail": detail}, ensure_ascii=False),
+             time.time(), job_id, owner),
+        )
+
+    def release(self, owner: str) -> int:
+        """
+        워커가 진행 중이던 작업을 대기 상태로 되돌립니다 (정상 종료 시).
+
+        Returns
+        -------
+        int
+            되돌린 작업 수
+        """
+        cursor = self._connect().execute(
+            "UPDATE jobs SET status = 'queued', owner = NULL, attempts = MAX(attempts - 1, 0) "
+            "WHERE owner = ? AND status = 'running'",
+            (owner,),
+        )
+        return cursor.rowcount
+
+    def purge(self, retention_seconds: float) -> int:
+        """보관 기간이 지난 완료/실패 작업을 삭제하고 삭제한 수를 반환합니다."""
+        cursor = self._connect().execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+            (time.time() - retention_seconds,),
+        )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """상태별 작업 수를 반환합니다."""
+        counts = {status: 0 for status in JOB_STATUSES}
+        for status, count in self._connect().execute(
+            "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+        ).fetchall():
+            counts[status] = count
+        return counts
+
+
+# 작업 하나를 처리하는 함수: (작업, 진행률 보고 함수(완료, 전체)) -> 번역 결과
+JobRunner = Callable[[Dict[str, Any], Callable[[int, int], None]], Awaitable[str]]
+
+
+class JobWorkerPool:
+    """
+    JobStore의 작업을 동시에 최대 workers개까지 처리하는 워커 풀
+
+    Parameters
+    ----------
+    store : JobStore
+        작업 저장소
+    run_job : JobRunner
+        작업 하나를 처리하는 코루틴 함수
+    workers : int
+        프로세스당 동시에 처리할 작업 수
+    poll_interval : float
+        새 작업 확인 및 heartbeat 주기(초)
+    lease_seconds : float
+        heartbeat가 끊긴 작업을 다른 워커가 가져가기까지의 시간(초)
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        run_job: JobRunner,
+        workers: int = 2,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 60,
+    ):
+        self.store = store
+        self.run_job = run_job
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        # 작업 id -> (완료 청크 수, 전체 청크 수), heartbeat 때 저장소에 기록
+        self.progress: Dict[str, Tuple[int, int]] = {}
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._wake: Optional[asyncio.Event] = None
+        self.completed = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        """워커와 heartbeat 작업을 시작합니다."""
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.ensure_future(self._heartbeat()))
+        print(f"[OK] 번역 작업 워커 시작: {self.workers}개 ({self.owner})")
+
+    async def stop(self) -> None:
+        """워커를 멈추고 진행 중이던 작업을 대기 상태로 되돌립니다."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        released = await run_in_threadpool(self.store.release, self.owner)
+        if released:
+            print(f"[INFO] 진행 중이던 번역 작업 {released}건을 대기열로 되돌렸습니다.")
+
+    def notify(self) -> None:
+        """새 작업이 등록되었음을 알려 대기 중인 워커를 바로 깨웁니다."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _wait_for_work(self) -> None:
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                job = await run_in_threadpool(self.store.claim, self.owner, self.lease_seconds)
+            except sqlite3.Error as e:
+                print(f"[WARNING] 번역 작업 조회 실패: {e}")
+                job = None
+            if job is None:
+                await self._wait_for_work()
+                continue
+            await self._process(job)
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        self.progress[job_id] = (job["chunks_done"], job["chunks_total"])
+
+        def report(done: int, total: int) -> None:
+            self.progress[job_id] = (done, total)
+
+        started = time.perf_counter()
+        try:
+            translated_text = await self.run_job(job, report)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            status_code = getattr(e, "status_code", 500)
+            detail = getattr(e, "detail", f"번역 중 오류 발생: {str(e)}")
+            await run_in_threadpool(self.store.fail, job_id, self.owner, status_code, detail)
+            print(f"[WARNING] 번역 작업 실패 ({job_id}): {detail}")
+        else:
+            self.completed += 1
+            total = self.progress[job_id][1]
+            await run_in_threadpool(self.store.finish, job_id, self.owner, translated_text, total)
+            elapsed = time.perf_counter() - started
+            print(f"[OK] 번역 작업 완료 ({job_id}, {total}개 청크, {elapsed:.1f}초)")
+        finally:
+            self.progress.pop(job_id, None)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await run_in_threadpool(self.store.heartbeat, self.owner, dict(self.progress))
+            except sqlite3.Error as e:
+                print(f"[WARNING] 번역 작업 heartbeat 기록 실패: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        워커 풀 통계를 반환합니다.
+
+        Returns
+        -------
+        Dict[str, Any]
+            워커 식별자, 워커 수, 처리 중인 작업 수, 이 프로세스의 완료/실패 수
+        """
+        return {
+            "owner": self.owner,
+            "workers": self.workers,
+            "running": len(self.progress),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
@@ -0,0 +1,128 @@
+"""
+번역 API 부하 테스트 스크립트
+
+실행 중인 번역 서버에 동시 요청을 보내고, 동시성 수준별 처리량을 측정합니다.
+Provider 호출이 이벤트 루프를 블로킹하지 않는다면 동시성이 올라갈수록
+처리량(req/s)도 함께 증가해야 합니다.
+
+실행 방법:
+    rye run python -m backend.load_test --model google-translate
+    rye run python -m backend.load_test --model gpt-4o-mini --concurrency 1,4,16 --requests 32
+
+주의사항:
+    - 번역 서버(backend.run_server)가 먼저 실행 중이어야 합니다
+    - 실제 provider를 호출하므로 API 사용량이 발생합니다
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    url: str,
+    payload: Dict[str, str],
+    total_requests: int,
+    concurrency: int,
+) -> Dict[str, float]:
+    """
+    주어진 동시성 수준으로 요청을 보내고 결과를 집계합니다.
+
+    Parameters
+    ----------
+    client : httpx.AsyncClient
+        HTTP 클라이언트
+    url : str
+        번역 엔드포인트 URL
+    payload : Dict[str, str]
+        번역 요청 본문
+    total_requests : int
+        전체 요청 수
+    concurrency : int
+        동시에 처리할 최대 요청 수
+
+    Returns
+    -------
+    Dict[str, float]
+        처리량, 지연시간, 실패 수 통계
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one_request() -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.post(url, json=payload)
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(total_requests)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "elapsed": elapsed,
+        "throughput": total_requests / elapsed if elapsed > 0 else 0.0,
+        "p50": statistics.median(latencies) * 1000,
+        "max": max(latencies) * 1000,
+        "errors": errors,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    url = f"{args.url.rstrip('/')}/api/translate"
+    payload = {
+        "text": args.text,
+        "source_lang": args.source_lang,
+        "target_lang": args.target_lang,
+        "model": args.model,
+    }
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    print("=" * 80)
+    print(f"부하 테스트: {url} (model={args.model}, requests={args.requests})")
+    print("=" * 80)
+    print(f"{'concurrency':>12} {'elapsed(s)':>11} {'req/s':>9} {'p50(ms)':>9} {'max(ms)':>9} {'errors':>7}")
+
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        baseline = None
+        for level in levels:
+            result = await run_level(client, url, payload, args.requests, level)
+            if baseline is None:
+                baseline = result["throughput"]
+            print(
+                f"{result['concurrency']:>12} {result['elapsed']:>11.2f} "
+                f"{result['throughput']:>9.2f} {result['p50']:>9.1f} "
+                f"{result['max']:>9.1f} {result['errors']:>7}"
+            )
+
+        if baseline:
+            print()
+            print(f"[INFO] 최대 동시성 대비 처리량 배율: {result['throughput'] / baseline:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="번역 API 부하 테스트")
+    parser.add_argument("--url", default="http://localhost:8001", help="번역 서버 주소")
+    parser.add_argument("--model", default="google-translate", help="사용할 모델 ID")
+    parser.add_argument("--text", default="Hello, world! This is a load test.", help="번역할 텍스트")
+    parser.add_argument("--source-lang", default="en", help="원본 언어 코드")
+    parser.add_argument("--target-lang", default="ko", help="목표 언어 코드")
+    parser.add_argument("--requests", type=int, default=32, help="동시성 수준별 요청 수")
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="쉼표로 구분한 동시성 수준")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃(초)")
+
+    asyncio.run(main(parser.parse_args()))
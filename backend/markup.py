@@ -0,0 +1,406 @@
+"""
+HTML / Markdown 마크업 보존 번역
+
+문서를 가볍게 토큰화해 번역할 텍스트만 세그먼트로 뽑고, 번역 결과를 원래 구조의 같은 자리에 다시 넣습니다.
+번역 결과를 다시 파싱하지 않으므로 태그, 속성, URL, 코드는 원문 그대로 유지됩니다.
+
+- 블록 요소(p, li, h1 등)와 Markdown 줄이 세그먼트 경계
+- 문장 안의 인라인 요소(a, strong, 링크 등)는 짧은 자리 표시자(<g1>...</g1>)로 바꿔 함께 번역
+- 코드, 이미지, URL, 주석, script/style/pre 등은 번역하지 않음 (인라인이면 <x1/> 자리 표시자)
+
+번역 결과에서 자리 표시자가 사라지거나 중복되면 restore_segment가 None을 반환하고,
+호출 측은 텍스트 조각(runs)을 따로 번역해 fallback_segment로 원래 태그 사이에 넣습니다.
+"""
+
+import html
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Union
+
+# 지원 형식
+MARKUP_FORMATS = ("text", "html", "markdown")
+
+# 번역 결과의 자리 표시자 (번역 엔진이 넣는 공백 허용)
+_PLACEHOLDER_PATTERN = re.compile(r"<\s*(/?)\s*([gx])\s*(\d+)\s*(/?)\s*>", re.IGNORECASE)
+
+# 자리 표시자가 있는 세그먼트를 보낼 때 LLM 프롬프트에 추가하는 지시
+MARKUP_INSTRUCTION = "\nKeep inline tags such as <g1>, </g1> and <x1/> unchanged, around the words they mark."
+
+
+@dataclass
+class MarkupSegment:
+    """
+    번역할 세그먼트 하나
+
+    text는 provider로 보낼 텍스트이며, 인라인 마크업은 자리 표시자로 바뀌어 있습니다.
+    tags는 자리 표시자("<g1>", "</g1>", "<x2/>") -> 원래 마크업입니다.
+    """
+
+    text: str
+    tags: List[Tuple[str, str]] = field(default_factory=list)
+    runs: List[str] = field(default_factory=list)
+    escape: bool = False
+
+
+@dataclass
+class MarkupDocument:
+    """
+    원문 구조
+
+    parts는 그대로 출력할 원문 조각(str)과 세그먼트 인덱스(int)를 문서 순서로 가집니다.
+    """
+
+    parts: List[Union[str, int]]
+    segments: List[MarkupSegment]
+
+    def texts(self) -> List[str]:
+        """세그먼트별 자리 표시자를 뺀 텍스트 (언어 감지용)"""
+        return ["".join(segment.runs) for segment in self.segments]
+
+    def render(self, outputs: List[str]) -> str:
+        """세그먼트별 최종 출력(원래 마크업이 복원된 번역)을 원문 조각 사이에 넣습니다."""
+        return "".join(part if isinstance(part, str) else outputs[part] for part in self.parts)
+
+
+class _SegmentBuilder:
+    """텍스트 조각과 인라인 마크업을 모아 세그먼트로 만듭니다."""
+
+    def __init__(self, escape: bool):
+        self.escape = escape
+        self.parts: List[Union[str, int]] = []
+        self.segments: List[MarkupSegment] = []
+        # ("text", 텍스트) / ("open"|"close"|"void", 원래 마크업, 짝 맞춤용 이름)
+        self._items: List[Tuple[str, str, str]] = []
+
+    def literal(self, text: str) -> None:
+        """번역하지 않는 블록 마크업 (세그먼트 경계)"""
+        self.flush()
+        if text:
+            self.parts.append(text)
+
+    def text(self, text: str) -> None:
+        if text:
+            self._items.append(("text", text, ""))
+
+    def inline(self, kind: str, markup: str, name: str = "") -> None:
+        self._items.append((kind, markup, name))
+
+    def flush(self) -> None:
+        items, self._items = self._items, []
+        if not any(kind == "text" and value.strip() for kind, value, _ in items):
+            # 번역할 텍스트가 없으면 원문 그대로
+            self.parts.extend(value for _, value, _ in items)
+            return
+
+        # 앞뒤 공백은 세그먼트 밖에 원문 그대로 둠
+        leading = trailing = ""
+        if items[0][0] == "text":
+            value = items[0][1]
+            leading = value[:len(value) - len(value.lstrip())]
+            items[0] = ("text", value.lstrip(), "")
+        if items[-1][0] == "text":
+            value = items[-1][1]
+            trailing = value[len(value.rstrip()):]
+            items[-1] = ("text", value.rstrip(), "")
+
+        # 여는/닫는 인라인 마크업의 짝을 맞추고, 짝이 없으면 단독 자리 표시자로 처리
+        pair_of = {}
+        stack: List[Tuple[str, int]] = []
+        for index, (kind, _, name) in enumerate(items):
+            if kind == "open":
+                stack.append((name, index))
+            elif kind == "close":
+                for depth in range(len(stack) - 1, -1, -1):
+                    if stack[depth][0] == name:
+                        pair_of[stack[depth][1]] = index
+                        pair_of[index] = stack[depth][1]
+                        del stack[depth:]
+                        break
+
+        segment = MarkupSegment(text="", escape=self.escape)
+        pieces: List[str] = []
+        run: List[str] = []
+        numbers = {}
+        for index, (kind, value, _) in enumerate(items):
+            if kind == "text":
+                run.append(html.unescape(value) if self.escape else value)
+                pieces.append(run[-1])
+                continue
+            segment.runs.append("".join(run))
+            run = []
+            number = numbers.get(pair_of.get(index))
+            if number is None:
+                number = numbers[index] = len(numbers) + 1
+            if index not in pair_of:
+                placeholder = f"<x{number}/>"
+            elif kind == "open":
+                placeholder = f"<g{number}>"
+            else:
+                placeholder = f"</g{number}>"
+            segment.tags.append((placeholder, value))
+            pieces.append(placeholder)
+        segment.runs.append("".join(run))
+        segment.text = "".join(pieces)
+
+        if leading:
+            self.parts.append(leading)
+        self.parts.append(len(self.segments))
+        self.segments.append(segment)
+        if trailing:
+            self.parts.append(trailing)
+
+    def build(self) -> MarkupDocument:
+        self.flush()
+        return MarkupDocument(self.parts, self.segments)
+
+
+# --- HTML ---
+
+# 내용까지 통째로 번역하지 않는 요소 (블록)
+_HTML_OPAQUE_BLOCK = ("script", "style", "pre", "textarea", "svg", "math", "template")
+# 내용까지 통째로 번역하지 않는 요소 (문장 안)
+_HTML_OPAQUE_INLINE = ("code", "kbd", "samp", "var")
+# 문장 안에서 쓰이는 요소 (그 밖의 요소는 세그먼트 경계)
+_HTML_INLINE = {
+    "a", "abbr", "b", "bdi", "bdo", "br", "cite", "data", "dfn", "em", "font", "i", "img",
+    "ins", "del", "mark", "q", "s", "small", "span", "strong", "sub", "sup", "time", "u", "wbr",
+}
+_HTML_VOID = {"br", "img", "wbr"}
+
+_HTML_TOKEN = re.compile(
+    r"(?P<comment><!--.*?-->)"
+    r"|(?P<opaque><(?P<opaque_name>" + "|".join(_HTML_OPAQUE_BLOCK + _HTML_OPAQUE_INLINE) + r")\b[^>]*>.*?</(?P=opaque_name)\s*>)"
+    r"|(?P<tag></?(?P<name>[a-zA-Z][a-zA-Z0-9-]*)\b[^>]*>)"
+    r"|(?P<declaration><![^>]*>|<\?[^>]*>)",
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def _parse_html(text: str) -> MarkupDocument:
+    builder = _SegmentBuilder(escape=True)
+    position = 0
+    for match in _HTML_TOKEN.finditer(text):
+        builder.text(text[position:match.start()])
+        position = match.end()
+        token = match.group(0)
+
+        if match.group("opaque"):
+            if match.group("opaque_name").lower() in _HTML_OPAQUE_INLINE:
+                builder.inline("void", token)
+            else:
+                builder.literal(token)
+        elif match.group("tag"):
+            name = match.group("name").lower()
+            if name not in _HTML_INLINE:
+                builder.literal(token)
+            elif name in _HTML_VOID or token.endswith("/>"):
+                builder.inline("void", token)
+            elif token.startswith("</"):
+                builder.inline("close", token, name)
+            else:
+                builder.inline("open", token, name)
+        else:
+            # 주석/선언은 문장 안에 있어도 번역 대상이 아님
+            builder.inline("void", token)
+    builder.text(text[position:])
+    return builder.build()
+
+
+# --- Markdown ---
+
+_MD_FENCE = re.compile(r"^\s*(`{3,}|~{3,})")
+# 들여쓰기 코드 블록 (공백 4칸 또는 탭)
+_MD_INDENTED_CODE = re.compile(r"^(?: {4}|\t)")
+_MD_LIST_ITEM = re.compile(r"^\s*(?:>\s?)*(?:[-*+]|\d+[.)])\s")
+_MD_RULE = re.compile(r"^\s*(?:(?:[-*_]\s*){3,}|=+)\s*$")
+_MD_TABLE_DIVIDER = re.compile(r"^\s*\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?\s*$")
+_MD_HTML_BLOCK = re.compile(r"^\s*</?[a-zA-Z][^>]*>\s*$")
+# 줄 앞의 블록 표시 (들여쓰기, 인용, 제목, 목록, 체크박스)
+_MD_PREFIX = re.compile(r"^(\s*(?:>\s?)*(?:#{1,6}\s+|[-*+]\s+(?:\[[ xX]\]\s+)?|\d+[.)]\s+)?)")
+# 링크 대상 (URL 안의 괄호 한 단계 허용)
+_MD_LINK_TARGET = r"(?:\((?:[^()\s]|\([^()\s]*\))*(?:\s+\"[^\"]*\")?\)|\[[^\]]*\])"
+# 강조 내용 (인라인 코드 안의 * _ 는 강조 표시로 보지 않음)
+_MD_EMPHASIS_TEXT = r"(?:`[^`\n]*`|[^`])+?"
+_MD_INLINE = re.compile(
+    r"(?P<code>(`+).+?\2)"
+    r"|(?P<image>!\[[^\]]*\]" + _MD_LINK_TARGET + r")"
+    r"|(?P<link_open>\[)(?=[^\]]+\]" + _MD_LINK_TARGET + r")"
+    r"|(?P<link_close>\]" + _MD_LINK_TARGET + r")"
+    r"|(?P<autolink><https?://[^>]+>)"
+    r"|(?P<url>https?://[^\s<>()]*[^\s<>().,;:!?'\"])"
+    r"|(?P<html></?[a-zA-Z][^>]*>)"
+    # 강조: *x* **x** (단어 안 허용) / _x_ __x__ (단어 경계만)
+    r"|(?<![\\*])(?P<star>\*\*|\*)(?=[^\s*])(?P<star_text>" + _MD_EMPHASIS_TEXT + r")(?<![\s*\\])(?P=star)(?!\*)"
+    r"|(?<![\w\\])(?P<under>__|_)(?=[^\s_])(?P<under_text>" + _MD_EMPHASIS_TEXT + r")(?<![\s_\\])(?P=under)(?!\w)",
+)
+
+
+def _markdown_inline(builder: _SegmentBuilder, text: str) -> None:
+    position = 0
+    for match in _MD_INLINE.finditer(text):
+        builder.text(text[position:match.start()])
+        position = match.end()
+        if match.group("link_open"):
+            builder.inline("open", match.group(0), "link")
+        elif match.group("link_close"):
+            builder.inline("close", match.group(0), "link")
+        elif match.group("star") or match.group("under"):
+            # 강조 표시는 짝 자리 표시자로 감싸고 내용은 계속 번역
+            marker = match.group("star") or match.group("under")
+            builder.inline("open", marker, marker)
+            _markdown_inline(builder, match.group("star_text") or match.group("under_text"))
+            builder.inline("close", marker, marker)
+        else:
+            builder.inline("void", match.group(0))
+    builder.text(text[position:])
+
+
+def _parse_markdown(text: str) -> MarkupDocument:
+    builder = _SegmentBuilder(escape=False)
+    fence = None
+    # 들여쓰기 코드 블록 판별용: 직전 줄이 문단(이어지는 줄)인지, 목록 안인지
+    in_paragraph = False
+    in_list = False
+    for line in text.splitlines(keepends=True):
+        body = line.rstrip("\r\n")
+        newline = line[len(body):]
+
+        fence_match = _MD_FENCE.match(body)
+        if fence is not None:
+            if fence_match and fence_match.group(1)[0] == fence[0] and len(fence_match.group(1)) >= len(fence):
+                fence = None
+            builder.literal(line)
+            continue
+
+        if not body.strip():
+            in_paragraph = False
+            builder.literal(line)
+            continue
+        if _MD_INDENTED_CODE.match(body) and not in_paragraph and not in_list:
+            # 문단/목록에 이어지지 않는 들여쓰기 줄은 코드 블록
+            builder.literal(line)
+            continue
+
+        in_paragraph = False
+        if _MD_LIST_ITEM.match(body):
+            in_list = True
+        elif not body[0].isspace():
+            in_list = False
+
+        if fence_match:
+            fence = fence_match.group(1)
+            builder.literal(line)
+            continue
+        if _MD_RULE.match(body) or _MD_TABLE_DIVIDER.match(body) or _MD_HTML_BLOCK.match(body):
+            builder.literal(line)
+            continue
+
+        if body.lstrip().startswith("|"):
+            # 표: 칸마다 세그먼트
+            cells = re.split(r"(?<!\\)(\|)", body)
+            for cell in cells:
+                if cell == "|":
+                    builder.literal(cell)
+                else:
+                    _markdown_inline(builder, cell)
+                    builder.flush()
+            builder.literal(newline)
+            continue
+
+        prefix = _MD_PREFIX.match(body).group(1)
+        in_paragraph = "#" not in prefix
+        builder.literal(prefix)
+        _markdown_inline(builder, body[len(prefix):])
+        builder.literal(newline)
+    return builder.build()
+
+
+def parse_markup(text: str, markup_format: str) -> MarkupDocument:
+    """
+    문서를 원문 조각과 번역할 세그먼트로 나눕니다.
+
+    Parameters
+    ----------
+    text : str
+        원본 문서
+    markup_format : str
+        "html" 또는 "markdown"
+
+    Returns
+    -------
+    MarkupDocument
+        원문 구조와 세그먼트 목록
+    """
+    if markup_format == "html":
+        return _parse_html(text)
+    if markup_format == "markdown":
+        return _parse_markdown(text)
+    raise ValueError(f"지원하지 않는 형식입니다: {markup_format}")
+
+
+def _finish_text(segment: MarkupSegment, text: str) -> str:
+    """번역된 텍스트 조각을 출력 형식에 맞춥니다 (HTML은 이스케이프)."""
+    return html.escape(text, quote=False) if segment.escape else text
+
+
+def restore_segment(segment: MarkupSegment, translated_text: str) -> Optional[str]:
+    """
+    번역 결과의 자리 표시자를 원래 마크업으로 되돌립니다.
+
+    Parameters
+    ----------
+    segment : MarkupSegment
+        원본 세그먼트
+    translated_text : str
+        자리 표시자가 포함된 번역 결과
+
+    Returns
+    -------
+    Optional[str]
+        마크업이 복원된 번역 (자리 표시자가 빠지거나 중복되면 None)
+    """
+    expected = {placeholder: markup for placeholder, markup in segment.tags}
+    seen = set()
+    pieces = []
+    position = 0
+    for match in _PLACEHOLDER_PATTERN.finditer(translated_text):
+        closing, kind, number, self_closing = match.groups()
+        placeholder = f"<{closing}{kind.lower()}{number}{self_closing}>"
+        if placeholder not in expected or placeholder in seen:
+            return None
+        seen.add(placeholder)
+        pieces.append(_finish_text(segment, translated_text[position:match.start()]))
+        pieces.append(expected[placeholder])
+        position = match.end()
+    if len(seen) != len(expected):
+        return None
+    pieces.append(_finish_text(segment, translated_text[position:]))
+    return "".join(pieces)
+
+
+def fallback_segment(segment: MarkupSegment, run_translations: List[str]) -> str:
+    """
+    텍스트 조각을 따로 번역한 결과를 원래 마크업 사이에 넣습니다 (restore_segment 실패 시).
+
+    Parameters
+    ----------
+    segment : MarkupSegment
+        원본 세그먼트
+    run_translations : List[str]
+        segment.runs 순서의 번역 결과 (공백뿐인 조각은 원문 그대로)
+
+    Returns
+    -------
+    str
+        마크업이 복원된 번역
+    """
+    pieces = [_finish_text(segment, run_translations[0])]
+    for (_, markup), translated_run in zip(segment.tags, run_translations[1:]):
+        pieces.append(markup)
+        pieces.append(_finish_text(segment, translated_run))
+    return "".join(pieces)
+
+
+def format_markup_instruction(texts: List[str]) -> str:
+    """자리 표시자가 있는 텍스트가 있으면 프롬프트에 붙일 지시를, 없으면 빈 문자열을 반환합니다."""
+    return MARKUP_INSTRUCTION if any(_PLACEHOLDER_PATTERN.search(text) for text in texts) else ""
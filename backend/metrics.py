@@ -0,0 +1,322 @@
+"""
+Prometheus 메트릭
+
+외부 의존성 없이 Counter / Histogram을 보관하고 Prometheus 텍스트 형식(0.0.4)으로 내보냅니다.
+캐시, 스케줄러, 서킷 브레이커처럼 이미 통계를 가진 구성 요소는 수집 시점에
+collector 함수를 호출해 gauge로 내보냅니다.
+
+메트릭은 워커 프로세스별로 집계되므로 멀티 워커 환경에서는 각 워커를 따로 수집합니다.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+from .usage import record_usage
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[Dict[str, str], float]
+
+# 번역 지연시간용 기본 버킷(초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+    return "{" + inner + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """레이블 조합의 값을 amount만큼 증가시킵니다."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, value in sorted(self._values.items()):
+            labels = dict(zip(self.labelnames, key))
+            lines.append(f"{self.name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> (버킷별 개수, 합계, 전체 개수)
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """관측값을 기록합니다."""
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(counts):
+                counts[index] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, (counts, total, count) in sorted(self._values.items()):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = {**labels, "le": _format_value(bound)}
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+            lines.append(f'{self.name}_bucket{_format_labels({**labels, "le": "+Inf"})} {count}')
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class Registry:
+    """메트릭과 수집 시점 collector를 모아 텍스트 형식으로 내보냅니다."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        # (이름, 설명, 형식, 샘플 생성 함수)
+        self._collectors: List[Tuple[str, str, str, Callable[[], Iterable[Sample]]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets or DEFAULT_BUCKETS)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Iterable[Sample]],
+        kind: str = "gauge",
+    ) -> None:
+        """
+        수집 시점에 호출되어 (레이블, 값) 샘플을 반환하는 메트릭을 등록합니다.
+
+        Parameters
+        ----------
+        name : str
+            메트릭 이름
+        documentation : str
+            메트릭 설명
+        collect : Callable[[], Iterable[Sample]]
+            샘플 생성 함수
+        kind : str
+            메트릭 형식 ("gauge" 또는 "counter")
+        """
+        self._collectors.append((name, documentation, kind, collect))
+
+    def render(self) -> str:
+        """등록된 모든 메트릭을 Prometheus 텍스트 형식으로 반환합니다."""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, documentation, kind, collect in self._collectors:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in collect():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# 전역 레지스트리 및 번역 서버 메트릭
+REGISTRY = Registry()
+
+TRANSLATION_REQUESTS = REGISTRY.counter(
+    "translation_requests_total",
+    "번역 API 요청 수",
+    ("endpoint", "model", "status"),
+)
+TRANSLATION_LATENCY = REGISTRY.histogram(
+    "translation_request_duration_seconds",
+    "번역 API 요청 처리 시간 (캐시 적중 포함)",
+    ("endpoint", "model"),
+)
+PROVIDER_REQUESTS = REGISTRY.counter(
+    "provider_requests_total",
+    "provider 호출 수",
+    ("model", "provider", "status"),
+)
+PROVIDER_LATENCY = REGISTRY.histogram(
+    "provider_request_duration_seconds",
+    "provider 호출 지연시간",
+    ("model", "provider"),
+)
+OPENAI_TOKENS = REGISTRY.counter(
+    "openai_tokens_total",
+    "OpenAI 사용 토큰 수 (response.usage 기준)",
+    ("model", "type"),
+)
+DEEPL_BILLED_CHARACTERS = REGISTRY.counter(
+    "deepl_billed_characters_total",
+    "DeepL 과금 문자 수",
+)
+GOOGLE_CHARACTERS = REGISTRY.counter(
+    "google_translated_characters_total",
+    "Google Translate로 보낸 문자 수",
+)
+FUZZY_LOOKUPS = REGISTRY.counter(
+    "fuzzy_memory_lookups_total",
+    "번역 메모리 유사 문장 검색 수 (outcome: served | reference | miss)",
+    ("model", "outcome"),
+)
+LANGUAGE_DETECTIONS = REGISTRY.counter(
+    "language_detections_total",
+    "source_lang이 auto인 요청의 로컬 언어 감지 수 (language: 감지한 언어 또는 undetermined)",
+    ("language",),
+)
+MARKUP_FALLBACKS = REGISTRY.counter(
+    "markup_placeholder_fallbacks_total",
+    "자리 표시자가 깨져 텍스트 조각을 따로 번역한 마크업 세그먼트 수",
+    ("format",),
+)
+POST_EDIT_DECISIONS = REGISTRY.counter(
+    "post_edit_decisions_total",
+    "후수정 정책 결정 수 (model=skip이면 후수정 생략)",
+    ("model", "reason"),
+)
+
+
+def record_openai_usage(model: str, usage, characters: int = 0) -> None:
+    """
+    OpenAI 응답의 usage(prompt/completion 토큰)를 메트릭과 사용량 장부에 기록합니다.
+
+    Parameters
+    ----------
+    model : str
+        OpenAI 모델 ID
+    usage : CompletionUsage or None
+        response.usage (없으면 무시)
+    characters : int
+        번역한 원문 문자 수
+    """
+    if usage is None:
+        return
+    prompt_tokens = usage.prompt_tokens or 0
+    completion_tokens = usage.completion_tokens or 0
+    OPENAI_TOKENS.inc(prompt_tokens, model=model, type="prompt")
+    OPENAI_TOKENS.inc(completion_tokens, model=model, type="completion")
+    record_usage(model, "openai", prompt_tokens, completion_tokens, characters)
+
+
+def record_deepl_usage(results) -> None:
+    """
+    DeepL 번역 결과의 billed_characters를 기록합니다.
+
+    Parameters
+    ----------
+    results : TextResult or List[TextResult]
+        translate_text 반환값
+    """
+    if not isinstance(results, list):
+        results = [results]
+    billed_characters = sum(getattr(result, "billed_characters", 0) or 0 for result in results)
+    DEEPL_BILLED_CHARACTERS.inc(billed_characters)
+    record_usage("deepl-nmt", "deepl", characters=billed_characters)
+
+
+def record_google_usage(characters: int) -> None:
+    """Google Translate로 보낸 문자 수를 메트릭과 사용량 장부에 기록합니다."""
+    GOOGLE_CHARACTERS.inc(characters)
+    record_usage("google-translate", "google", characters=characters)
+
+
+@contextmanager
+def track(counter: Counter, histogram: Histogram, **labels: str) -> Iterator[None]:
+    """
+    블록의 처리 시간과 결과 상태 코드를 기록합니다.
+
+    정상 종료는 "200", HTTPException은 해당 상태 코드, 그 밖의 예외는 "500",
+    취소는 "cancelled"로
+    counter의 status 레이블에 기록하고, 처리 시간은 상태와 무관하게 histogram에 기록합니다.
+
+    Parameters
+    ----------
+    counter : Counter
+        status 레이블을 가진 요청 수 카운터
+    histogram : Histogram
+        처리 시간 히스토그램
+    **labels : str
+        status를 제외한 공통 레이블
+    """
+    started = time.perf_counter()
+    status = "200"
+    try:
+        yield
+    except HTTPException as e:
+        status = str(e.status_code)
+        raise
+    except Exception:
+        status = "500"
+        raise
+    except BaseException:
+        # 요청 취소 (클라이언트 연결 종료, 헤지 요청 취소 등)
+        status = "cancelled"
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - started, **labels)
+        counter.inc(status=status, **labels)
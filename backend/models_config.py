@@ -43,6 +43,18 @@ AVAILABLE_MODELS: Dict[str, Dict[str, str]] = {
         "description": "DeepL 번역 후 GPT-4o로 후수정 - 최고 품질",
         "provider": "post-editor",
     },
+    # Hedged (가장 빠른 provider의 결과 사용)
+    "fastest": {
+        "display_name": "Fastest (Hedged)",
+        "description": "Google, DeepL, GPT-4o Mini 중 가장 먼저 응답한 번역 - 낮은 지연시간",
+        "provider": "hedged",
+    },
+    # Routed (언어 쌍별로 설정한 모델 사용)
+    "auto-route": {
+        "display_name": "Auto (언어 쌍별 추천)",
+        "description": "감지한 원본 언어와 목표 언어 쌍에 맞는 모델로 번역",
+        "provider": "routed",
+    },
 }
 
 # 언어 코드 매핑 (전체 이름 -> 코드)
@@ -56,6 +68,10 @@ LANGUAGE_MAPPING: Dict[str, str] = {
     "Deutsch": "de",
 }
 
+# 지역 구분이 번역 결과에 영향이 없어 기본 코드로 합치는 언어 (ko-KR -> ko)
+# en(EN-GB/EN-US), pt(PT-BR/PT-PT), zh(간체/번체)는 지역 코드를 유지
+REGIONLESS_LANGUAGES = {"ko", "ja", "de", "fr", "es"}
+
 # 역 매핑 (코드 -> 전체 이름)
 LANGUAGE_NAMES: Dict[str, str] = {
     "ko": "Korean",
@@ -120,19 +136,43 @@ def get_full_model_name(model_id: str) -> str:
 
 def get_language_code(language_name: str) -> str:
     """
-    언어 전체 이름을 코드로 변환
+    언어 전체 이름 또는 코드를 표준 언어 코드로 변환
+    
+    캐시/번역 메모리 키가 같은 언어 쌍에 대해 하나로 모이도록 대소문자와 지역 코드를 정규화합니다
+    ("English", "english", "EN" -> "en", "ko-KR" -> "ko", "en-gb" -> "en-GB", "zh-hans" -> "zh-Hans",
+    "sr_latn_rs" -> "sr-Latn-RS").
     
     Parameters
     ----------
     language_name : str
-        언어 전체 이름 (예: "한국어", "English")
+        언어 전체 이름 또는 코드 (예: "한국어", "English", "EN", "auto")
     
     Returns
     -------
     str
         언어 코드 (예: "ko", "en")
     """
-    return LANGUAGE_MAPPING.get(language_name, language_name)
+    name = language_name.strip()
+    if name in LANGUAGE_MAPPING:
+        return LANGUAGE_MAPPING[name]
+    for code, english_name in LANGUAGE_NAMES.items():
+        if name.lower() == english_name.lower():
+            return code
+    
+    base, *subtags = name.replace("_", "-").split("-")
+    base = base.lower()
+    if not subtags or base in REGIONLESS_LANGUAGES:
+        return base
+    return "-".join([base] + [_format_subtag(subtag) for subtag in subtags if subtag])
+
+
+def _format_subtag(subtag: str) -> str:
+    """BCP 47 관례대로 하위 태그 대소문자를 맞춥니다 (문자 체계 "Hans", 지역 "GB"/"419", 그 외 소문자)."""
+    if len(subtag) == 4 and subtag.isalpha():
+        return subtag.title()
+    if (len(subtag) == 2 and subtag.isalpha()) or (len(subtag) == 3 and subtag.isdigit()):
+        return subtag.upper()
+    return subtag.lower()
 
 
 def get_language_name(language_code: str) -> str:
@@ -142,12 +182,13 @@ def get_language_name(language_code: str) -> str:
     Parameters
     ----------
     language_code : str
-        언어 코드 (예: "ko", "en")
+        언어 코드 (예: "ko", "en", "en-GB")
     
     Returns
     -------
     str
         영어 언어 이름 (예: "Korean", "English")
     """
-    return LANGUAGE_NAMES.get(language_code, language_code)
+    base = language_code.split("-")[0]
+    return LANGUAGE_NAMES.get(language_code, LANGUAGE_NAMES.get(base, language_code))
 
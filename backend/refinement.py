@@ -0,0 +1,336 @@
+"""
+점진적 번역 결과 저장소
+
+느린 모델(gpt-4o, deepl-post-edited) 요청에 빠른 초안(Google, DeepL)을 먼저 반환하고,
+최종 번역은 백그라운드 작업으로 진행합니다. 결과 id로 상태를 조회(polling)하거나
+완료 이벤트를 기다릴 수 있습니다.
+
+결과 상태는 SQLite(WAL)에 저장하므로 멀티 워커로 실행해도 어느 워커에서나 조회할 수 있습니다.
+최종 번역은 요청을 받은 워커가 진행하고 끝나면 결과 행을 갱신하며, 다른 워커의 SSE 연결은
+결과 행을 주기적으로 확인합니다. 완료 후 TTL이 지나거나 보관 수 상한을 넘으면 오래된 결과부터
+삭제하고, TTL이 지나도록 진행 중인 결과(워커 비정상 종료)는 실패로 기록합니다.
+정상 종료 시 진행 중인 최종 번역은 drain_timeout 동안 끝나기를 기다린 뒤 남은 것만 취소합니다.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+REFINEMENT_STATUSES = ("pending", "done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS refinements (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    model TEXT NOT NULL,
+    source_lang TEXT NOT NULL,
+    target_lang TEXT NOT NULL,
+    draft_model TEXT,
+    draft_text TEXT,
+    translated_text TEXT,
+    cached INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_refinements_status_created_at ON refinements (status, created_at);
+"""
+
+
+class RefinementStore:
+    """
+    결과 id -> 점진적 번역 결과 저장소 (SQLite WAL, 워커 간 공유)
+
+    status는 "pending"(최종 번역 진행 중), "done"(완료), "failed"(실패) 중 하나입니다.
+    저장소 메서드는 블로킹 I/O이므로 이벤트 루프에서는 run_in_threadpool로 호출합니다.
+
+    Parameters
+    ----------
+    path : str or Path
+        SQLite 파일 경로 (상위 디렉토리는 자동 생성)
+    ttl_seconds : float
+        완료된 결과를 보관할 시간(초)
+    max_entries : int
+        보관할 최대 완료 결과 수
+    poll_interval : float
+        다른 워커가 진행 중인 결과를 기다릴 때 결과 행을 확인하는 주기(초)
+    drain_timeout : float
+        종료 시 진행 중인 최종 번역이 끝나기를 기다릴 최대 시간(초)
+    """
+
+    def __init__(
+        self,
+        path,
+        ttl_seconds: float = 600,
+        max_entries: int = 1000,
+        poll_interval: float = 0.5,
+        drain_timeout: float = 30,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.poll_interval = poll_interval
+        self.drain_timeout = drain_timeout
+        self._local = threading.local()
+        self._tasks: Dict[str, "asyncio.Task[None]"] = {}
+        self.created = 0
+        self.completed = 0
+        self.failed = 0
+
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], project_root: Path) -> "RefinementStore":
+        """configs/config.yaml의 refinement 섹션으로 저장소를 생성합니다."""
+        return cls(
+            project_root / config.get("path", "data/refinements.sqlite3"),
+            ttl_seconds=float(config.get("ttl_seconds", 600)),
+            max_entries=int(config.get("max_entries", 1000)),
+            poll_interval=float(config.get("poll_interval", 0.5)),
+            drain_timeout=float(config.get("drain_timeout", 30)),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _to_dict(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        """결과 행을 API 응답용 딕셔너리로 바꿉니다."""
+        if row is None:
+            return None
+        return {
+            "result_id": row["id"],
+            "status": row["status"],
+            "model": row["model"],
+            "source_lang": row["source_lang"],
+            "target_lang": row["target_lang"],
+            "draft_model": row["draft_model"],
+            "draft_text": row["draft_text"],
+            "translated_text": row["translated_text"],
+            "cached": bool(row["cached"]),
+            "error": json.loads(row["error"]) if row["error"] else None,
+        }
+
+    def create(
+        self,
+        model: str,
+        source_lang: str,
+        target_lang: str,
+        translated_text: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        새 결과를 만들고 보관합니다.
+
+        Parameters
+        ----------
+        model : str
+            최종 번역 모델 ID
+        source_lang : str
+            원본 언어 코드
+        target_lang : str
+            목표 언어 코드
+        translated_text : Optional[str]
+            이미 있는 최종 번역 (캐시 적중 시). 주어지면 완료 상태로 생성
+
+        Returns
+        -------
+        Dict[str, Any]
+            생성된 결과 ("pending" 또는 캐시 적중 시 "done")
+        """
+        self.purge()
+        now = time.time()
+        result_id = uuid.uuid4().hex
+        cached = translated_text is not None
+        self._connect().execute(
+            "INSERT INTO refinements (id, status, model, source_lang, target_lang, translated_text, "
+            "cached, created_at, finished_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                result_id, "done" if cached else "pending", model, source_lang, target_lang,
+                translated_text, int(cached), now, now if cached else None,
+            ),
+        )
+        self.created += 1
+        return self.get(result_id)
+
+    def get(self, result_id: str) -> Optional[Dict[str, Any]]:
+        """결과를 조회합니다 (없거나 만료되었으면 None)."""
+        row = self._connect().execute(
+            "SELECT * FROM refinements WHERE id = ?", (result_id,)
+        ).fetchone()
+        return self._to_dict(row)
+
+    def set_draft(self, result_id: str, draft_model: str, draft_text: Optional[str]) -> Dict[str, Any]:
+        """초안을 기록하고 갱신된 결과를 반환합니다."""
+        self._connect().execute(
+            "UPDATE refinements SET draft_model = ?, draft_text = ? WHERE id = ?",
+            (draft_model, draft_text, result_id),
+        )
+        return self.get(result_id)
+
+    def finish(self, result_id: str, translated_text: str) -> None:
+        """최종 번역 결과를 기록합니다."""
+        self._connect().execute(
+            "UPDATE refinements SET status = 'done', translated_text = ?, finished_at = ? "
+            "WHERE id = ? AND status = 'pending'",
+            (translated_text, time.time(), result_id),
+        )
+
+    def fail(self, result_id: str, status_code: int, detail: Any) -> None:
+        """최종 번역 실패를 기록합니다."""
+        self._connect().execute(
+            "UPDATE refinements SET status = 'failed', error = ?, finished_at = ? "
+            "WHERE id = ? AND status = 'pending'",
+            (json.dumps({"status_code": status_code, "detail": detail}, ensure_ascii=False),
+             time.time(), result_id),
+        )
+
+    def purge(self) -> None:
+        """
+        TTL이 지났거나 보관 수 상한을 넘는 완료 결과를 오래된 순으로 삭제하고,
+        TTL이 지나도록 진행 중인 결과(워커 비정상 종료)는 실패로 기록합니다.
+        """
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN")
+            conn.execute(
+                "UPDATE refinements SET status = 'failed', error = ?, finished_at = ? "
+                "WHERE status = 'pending' AND created_at < ?",
+                (
+                    json.dumps(
+                        {"status_code": 503, "detail": "최종 번역을 진행하던 워커가 종료되었습니다"},
+                        ensure_ascii=False,
+                    ),
+                    now,
+                    now - self.ttl_seconds,
+                ),
+            )
+            conn.execute(
+                "DELETE FROM refinements WHERE status != 'pending' AND finished_at < ?",
+                (now - self.ttl_seconds,),
+            )
+            conn.execute(
+                "DELETE FROM refinements WHERE id IN (SELECT id FROM refinements "
+                "WHERE status != 'pending' ORDER BY finished_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def start(self, result_id: str, fn: Callable[[], Awaitable[str]]) -> None:
+        """
+        최종 번역을 백그라운드 작업으로 시작합니다.
+
+        작업이 끝나면 결과에 번역 또는 오류(HTTPException이면 그 상태 코드, 그 외 500)를 기록합니다.
+
+        Parameters
+        ----------
+        result_id : str
+            create로 만든 결과 id
+        fn : Callable[[], Awaitable[str]]
+            최종 번역을 반환하는 코루틴 함수
+        """
+
+        async def run() -> None:
+            try:
+                translated_text = await fn()
+            except asyncio.CancelledError:
+                await run_in_threadpool(self.fail, result_id, 503, "서버 종료로 번역이 취소되었습니다")
+                raise
+            except Exception as e:
+                self.failed += 1
+                await run_in_threadpool(
+                    self.fail,
+                    result_id,
+                    getattr(e, "status_code", 500),
+                    getattr(e, "detail", f"번역 중 오류 발생: {str(e)}"),
+                )
+            else:
+                self.completed += 1
+                await run_in_threadpool(self.finish, result_id, translated_text)
+
+        task = asyncio.ensure_future(run())
+        self._tasks[result_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(result_id, None))
+
+    async def wait(self, result_id: str) -> Optional[Dict[str, Any]]:
+        """
+        결과가 완료/실패 상태가 될 때까지 기다립니다.
+
+        이 워커가 진행 중인 결과는 작업 종료를 기다리고, 다른 워커의 결과는 poll_interval마다
+        결과 행을 확인합니다.
+
+        Parameters
+        ----------
+        result_id : str
+            결과 id
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            완료/실패한 결과 (기다리는 동안 삭제되었으면 None)
+        """
+        while True:
+            result = await run_in_threadpool(self.get, result_id)
+            if result is None or result["status"] != "pending":
+                return result
+            task = self._tasks.get(result_id)
+            if task is not None:
+                await asyncio.wait({task}, timeout=self.poll_interval)
+            else:
+                await asyncio.sleep(self.poll_interval)
+
+    async def drain(self) -> None:
+        """진행 중인 최종 번역을 drain_timeout 동안 기다리고, 끝나지 않은 작업은 취소합니다 (서버 종료 시)."""
+        tasks = list(self._tasks.values())
+        if not tasks:
+            return
+        _, pending = await asyncio.wait(tasks, timeout=self.drain_timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if pending:
+            print(f"[WARNING] 종료 대기 시간 초과로 점진적 번역 {len(pending)}건을 취소했습니다.")
+
+    def counts(self) -> Dict[str, int]:
+        """상태별 결과 수를 반환합니다."""
+        counts = {status: 0 for status in REFINEMENT_STATUSES}
+        for status, count in self._connect().execute(
+            "SELECT status, COUNT(*) FROM refinements GROUP BY status"
+        ).fetchall():
+            counts[status] = count
+        return counts
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        저장소 통계를 반환합니다.
+
+        Returns
+        -------
+        Dict[str, Any]
+            보관 중인 결과 수, 상태별 수, 이 프로세스의 진행 중/생성/완료/실패 수
+        """
+        by_status = self.counts()
+        return {
+            "entries": sum(by_status.values()),
+            "by_status": by_status,
+            "running": len(self._tasks),
+            "created": self.created,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
@@ -4,31 +4,160 @@ FastAPI 서버 실행 스크립트
 OpenAI API 기반 번역 API 서버를 실행합니다.
 
 실행 방법:
-    rye run python -m backend.run_server
+    rye run python -m backend.run_server                  # 개발 모드 (단일 프로세스, 코드 변경 시 자동 재시작)
+    rye run python -m backend.run_server --mode prod      # 운영 모드 (CPU 코어 수만큼 워커)
+    rye run python -m backend.run_server --mode prod --workers 4 --keep-alive 10
     또는
     rye run python backend/run_server.py
 
 주의사항:
     - .env 파일에 OPENAI_API_KEY가 설정되어 있어야 합니다
     - API 키 발급: https://platform.openai.com/api-keys
+    - 기본값은 configs/config.yaml의 server 섹션에서 읽고, CLI 인자가 우선합니다
+    - 캐시, 요청 스케줄러, 메트릭은 워커 프로세스별로 동작합니다
+      (provider 요청 한도는 워커 수로 나누어 적용)
 """
 
+import argparse
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
 import uvicorn
 
-if __name__ == "__main__":
+# 프로젝트 루트를 Python 경로에 추가 (backend/run_server.py로 직접 실행하는 경우)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.settings import get_section
+
+
+def default_workers() -> int:
+    """이 프로세스가 사용할 수 있는 CPU 코어 수를 반환합니다."""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """CLI 인자를 읽습니다 (지정하지 않은 값은 None으로 두고 설정 파일 값을 사용)."""
+    parser = argparse.ArgumentParser(description="번역 API 서버 실행")
+    parser.add_argument("--mode", choices=["dev", "prod"], help="dev: 자동 재시작 단일 프로세스 / prod: 멀티 워커")
+    parser.add_argument("--host", help="바인딩 주소")
+    parser.add_argument("--port", type=int, help="포트")
+    parser.add_argument("--workers", type=int, help="워커 프로세스 수 (0이면 CPU 코어 수, prod 모드 전용)")
+    parser.add_argument("--loop", choices=["auto", "asyncio", "uvloop"], help="이벤트 루프 구현")
+    parser.add_argument("--http", choices=["auto", "h11", "httptools"], help="HTTP 파서 구현")
+    parser.add_argument("--keep-alive", type=int, help="keep-alive 연결 유지 시간(초)")
+    parser.add_argument("--backlog", type=int, help="대기 중인 연결 최대 수 (listen backlog)")
+    parser.add_argument("--graceful-timeout", type=int, help="종료 시 진행 중 요청을 기다릴 최대 시간(초)")
+    parser.add_argument("--log-level", help="uvicorn 로그 레벨")
+    return parser.parse_args(argv)
+
+
+def resolve_implementation(name: str, requested: str) -> str:
+    """
+    요청한 uvloop/httptools가 설치되어 있지 않으면 "auto"로 대체합니다.
+
+    Parameters
+    ----------
+    name : str
+        설정 이름 ("loop" 또는 "http")
+    requested : str
+        요청한 구현 이름
+
+    Returns
+    -------
+    str
+        uvicorn에 전달할 구현 이름
+    """
+    if requested in ("uvloop", "httptools") and importlib.util.find_spec(requested) is None:
+        print(f"[WARNING] {requested}가 설치되지 않아 {name}=auto로 실행합니다.")
+        return "auto"
+    return requested
+
+
+def build_uvicorn_options(args: argparse.Namespace, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    CLI 인자와 server 설정을 합쳐 uvicorn.run 인자를 만듭니다.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        parse_args 결과 (None인 값은 설정 파일 값 사용)
+    config : Dict[str, Any]
+        configs/config.yaml의 server 섹션
+
+    Returns
+    -------
+    Dict[str, Any]
+        uvicorn.run 키워드 인자
+    """
+
+    def option(arg_name: str, config_name: str, default: Any) -> Any:
+        value = getattr(args, arg_name)
+        return value if value is not None else config.get(config_name, default)
+
+    mode = option("mode", "mode", "dev")
+    options = {
+        "host": option("host", "host", "0.0.0.0"),
+        "port": int(option("port", "port", 8001)),
+        "log_level": option("log_level", "log_level", "info"),
+        "timeout_keep_alive": int(option("keep_alive", "keep_alive", 5)),
+        "backlog": int(option("backlog", "backlog", 2048)),
+        "timeout_graceful_shutdown": int(option("graceful_timeout", "graceful_timeout", 30)),
+    }
+
+    if mode == "dev":
+        options["reload"] = True  # 코드 변경 시 자동 재시작
+        return options
+
+    workers = int(option("workers", "workers", 0))
+    options["workers"] = workers if workers > 0 else default_workers()
+    options["loop"] = resolve_implementation("loop", option("loop", "loop", "uvloop"))
+    options["http"] = resolve_implementation("http", option("http", "http", "httptools"))
+    # 운영 모드에서는 요청마다 access log를 남기지 않음 (메트릭은 /metrics 사용)
+    options["access_log"] = bool(config.get("access_log", False))
+    return options
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """서버 실행 옵션을 정하고 uvicorn을 시작합니다."""
+    options = build_uvicorn_options(parse_args(argv), get_section("server"))
+    workers = options.get("workers", 1)
+    # 워커 프로세스는 환경 변수를 상속하므로 provider 요청 한도를 워커 수로 나누는 데 사용
+    os.environ["TRANSLATION_WORKERS"] = str(workers)
+
+    mode = "개발 모드 (자동 재시작)" if options.get("reload") else f"운영 모드 (워커 {workers}개)"
+    if not options.get("reload") and importlib.util.find_spec("tiktoken") is None:
+        print("!" * 80)
+        print("[WARNING] tiktoken이 설치되지 않았습니다. OpenAI 토큰 예산과 413 판정에 보수적 추정치를 사용하므로")
+        print("          max_tokens와 분당 토큰 예약이 실제보다 커지고 긴 요청이 더 일찍 거절됩니다.")
+        print("[INFO] 설치: rye sync (또는 rye add tiktoken)")
+        print("!" * 80)
+    port = options["port"]
+
     print("=" * 80)
-    print("FastAPI 번역 서버 시작 (OpenAI API 기반)")
+    print(f"FastAPI 번역 서버 시작 (OpenAI API 기반) - {mode}")
     print("=" * 80)
     print()
     print("📍 서버 정보:")
-    print("  - 번역 API 서버: http://localhost:8001")
-    print("  - API 문서: http://localhost:8001/docs")
-    print("  - Interactive API: http://localhost:8001/redoc")
+    print(f"  - 번역 API 서버: http://localhost:{port}")
+    print(f"  - API 문서: http://localhost:{port}/docs")
+    print(f"  - Interactive API: http://localhost:{port}/redoc")
+    if not options.get("reload"):
+        print(f"  - 이벤트 루프: {options['loop']}, HTTP 파서: {options['http']}")
+        print(
+            f"  - keep-alive: {options['timeout_keep_alive']}초, backlog: {options['backlog']}, "
+            f"종료 대기: {options['timeout_graceful_shutdown']}초"
+        )
     print()
     print("📡 사용 가능한 엔드포인트:")
     print("  - GET  /api/models    - 모델 목록 조회")
     print("  - POST /api/translate - 텍스트 번역")
-    print("  - GET  /health        - 헬스 체크")
+    print("  - GET  /health        - 헬스 체크 (liveness)")
+    print("  - GET  /health/ready  - 준비 상태 (provider 예열/상태)")
     print()
     print("⚙️  OpenAI API:")
     print("  - 사용 모델: GPT-3.5 Turbo, GPT-4o Mini, GPT-4o")
@@ -41,12 +170,9 @@ if __name__ == "__main__":
     print("서버를 중지하려면 Ctrl+C를 누르세요.")
     print("=" * 80)
     print()
-    
-    uvicorn.run(
-        "backend.api:app",
-        host="0.0.0.0",
-        port=8001,
-        reload=True,  # 코드 변경 시 자동 재시작
-        log_level="info",
-    )
 
+    uvicorn.run("backend.api:app", **options)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+긴 문서 분할 및 병렬 청크 번역
+
+문서를 문단/문장 단위 청크로 나누어 각 청크가 토큰 예산을 넘지 않도록 하고,
+청크들을 동시에 번역한 뒤 원래 순서와 공백/문단 구분을 그대로 살려 다시 합칩니다.
+전체 번역 시간은 청크 수의 합이 아니라 가장 느린 청크에 의해 결정됩니다.
+
+반복되는 머리글, 버튼 라벨, 고지문처럼 같은 세그먼트는 한 번만 번역하고 결과를 모든 위치에 복사합니다.
+"""
+
+import asyncio
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# (텍스트, 번역 대상 여부) - 번역 대상이 아닌 조각은 공백/문단 구분자
+Piece = Tuple[str, bool]
+
+# 빈 줄(문단 구분)
+_PARAGRAPH_BREAK = re.compile(r"(\n[ \t]*\n\s*)")
+
+# 문장 끝 부호 뒤의 공백
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?。！？])(\s+)")
+
+# 중복 판단 시 하나로 합칠 공백 (줄바꿈 제외)
+_HORIZONTAL_SPACE = re.compile(r"[ \t\u00a0]+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수를 대략적으로 추정합니다.
+
+    라틴 문자는 약 4자당 1토큰, 한글/한자/가나 등 비ASCII 문자는 1자당 1토큰으로 계산합니다.
+
+    Parameters
+    ----------
+    text : str
+        대상 텍스트
+
+    Returns
+    -------
+    int
+        추정 토큰 수
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def _split_whitespace(text: str) -> Tuple[str, str, str]:
+    """텍스트를 (앞 공백, 본문, 뒤 공백)으로 나눕니다."""
+    core = text.strip()
+    if not core:
+        return text, "", ""
+    start = text.index(core)
+    return text[:start], core, text[start + len(core):]
+
+
+def _hard_split(text: str, max_tokens: int) -> List[Piece]:
+    """문장 하나가 예산을 넘으면 단어 경계(없으면 문자) 기준으로 자릅니다."""
+    pieces: List[Piece] = []
+    current = ""
+    for word in re.findall(r"\S+\s*", text):
+        if current and estimate_tokens(current + word) > max_tokens:
+            pieces.extend(_with_separator(current))
+            current = ""
+        if estimate_tokens(word) > max_tokens:
+            # 공백 없는 긴 문자열 (CJK 등)은 예산에 맞춰 문자 단위로 자름
+            if current:
+                pieces.extend(_with_separator(current))
+                current = ""
+            core = word.rstrip()
+            while estimate_tokens(core) > max_tokens:
+                cut = max(1, len(core) * max_tokens // estimate_tokens(core))
+                while cut > 1 and estimate_tokens(core[:cut]) > max_tokens:
+                    cut -= 1
+                pieces.append((core[:cut], True))
+                core = core[cut:]
+            word = core + word[len(word.rstrip()):]
+        current += word
+    if current:
+        pieces.extend(_with_separator(current))
+    return pieces
+
+
+def _with_separator(text: str) -> List[Piece]:
+    """텍스트 끝의 공백을 번역 대상이 아닌 조각으로 분리합니다."""
+    core = text.rstrip()
+    pieces: List[Piece] = [(core, True)] if core else []
+    if len(core) < len(text):
+        pieces.append((text[len(core):], False))
+    return pieces
+
+
+def _segment_paragraph(paragraph: str, max_tokens: int) -> List[Piece]:
+    """문단을 예산 이하의 문장 묶음 청크로 나눕니다."""
+    if estimate_tokens(paragraph) <= max_tokens:
+        return [(paragraph, True)]
+
+    # 문장과 문장 사이 공백을 번갈아 가진 목록
+    parts = _SENTENCE_BREAK.split(paragraph)
+    pieces: List[Piece] = []
+    current = ""
+    for i in range(0, len(parts), 2):
+        sentence = parts[i]
+        gap = parts[i + 1] if i + 1 < len(parts) else ""
+
+        if estimate_tokens(sentence) > max_tokens:
+            if current:
+                pieces.extend(_with_separator(current))
+                current = ""
+            pieces.extend(_hard_split(sentence + gap, max_tokens))
+            continue
+
+        if current and estimate_tokens(current + sentence) > max_tokens:
+            pieces.extend(_with_separator(current))
+            current = ""
+        current += sentence + gap
+
+    if current:
+        pieces.extend(_with_separator(current))
+    return pieces
+
+
+def segment_text(text: str, max_tokens: int) -> List[Piece]:
+    """
+    문서를 번역 대상 청크와 공백 구분자 조각으로 나눕니다.
+
+    모든 조각을 순서대로 이어 붙이면 원문과 정확히 같습니다.
+
+    Parameters
+    ----------
+    text : str
+        원본 문서
+    max_tokens : int
+        청크당 최대 토큰 수 (estimate_tokens 기준)
+
+    Returns
+    -------
+    List[Piece]
+        (텍스트, 번역 대상 여부) 목록
+    """
+    pieces: List[Piece] = []
+    for part in _PARAGRAPH_BREAK.split(text):
+        if not part:
+            continue
+        leading, core, trailing = _split_whitespace(part)
+        if leading:
+            pieces.append((leading, False))
+        if core:
+            pieces.extend(_segment_paragraph(core, max_tokens))
+        if trailing:
+            pieces.append((trailing, False))
+    return pieces
+
+
+def normalize_segment(text: str) -> str:
+    """중복 판단용 정규화 (앞뒤 공백 제거, 연속 공백/탭을 하나로, 줄바꿈은 구조이므로 유지)"""
+    return _HORIZONTAL_SPACE.sub(" ", text.strip())
+
+
+def deduplicate_segments(texts: List[str]) -> Tuple[List[str], List[int]]:
+    """
+    정규화한 텍스트가 같은 세그먼트를 하나로 합칩니다.
+
+    Parameters
+    ----------
+    texts : List[str]
+        세그먼트 목록
+
+    Returns
+    -------
+    Tuple[List[str], List[int]]
+        (번역할 고유 세그먼트 - 첫 출현의 앞뒤 공백을 뗀 텍스트, 세그먼트별 고유 세그먼트 인덱스)
+    """
+    unique: List[str] = []
+    first_index: Dict[str, int] = {}
+    positions: List[int] = []
+    for text in texts:
+        key = normalize_segment(text)
+        position = first_index.get(key)
+        if position is None:
+            position = first_index[key] = len(unique)
+            unique.append(text.strip())
+        positions.append(position)
+    return unique, positions
+
+
+def expand_translations(texts: List[str], positions: List[int], translations: List[str]) -> List[str]:
+    """
+    고유 세그먼트 번역을 모든 출현 위치로 복사합니다 (각 출현의 앞뒤 공백은 그대로 유지).
+
+    Parameters
+    ----------
+    texts : List[str]
+        원래 세그먼트 목록
+    positions : List[int]
+        deduplicate_segments가 반환한 세그먼트별 고유 세그먼트 인덱스
+    translations : List[str]
+        고유 세그먼트 순서의 번역 결과
+
+    Returns
+    -------
+    List[str]
+        원래 세그먼트 순서의 번역 결과
+    """
+    results = []
+    for text, position in zip(texts, positions):
+        leading, core, trailing = _split_whitespace(text)
+        results.append(leading + translations[position] + trailing if core else text)
+    return results
+
+
+class DedupStats:
+    """경로(batch, document)별 세그먼트 중복 제거 통계"""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, path: str, texts: List[str], unique: List[str]) -> None:
+        """
+        중복 제거 결과를 기록합니다.
+
+        Parameters
+        ----------
+        path : str
+            번역 경로 ("batch", "document")
+        texts : List[str]
+            중복 제거 전 세그먼트 목록
+        unique : List[str]
+            중복 제거 후 번역한 고유 세그먼트 목록
+        """
+        stats = self._stats.setdefault(
+            path, {"segments": 0, "unique": 0, "saved_segments": 0, "saved_tokens": 0}
+        )
+        stats["segments"] += len(texts)
+        stats["unique"] += len(unique)
+        stats["saved_segments"] += len(texts) - len(unique)
+        if len(texts) > len(unique):
+            stats["saved_tokens"] += (
+                sum(estimate_tokens(text) for text in texts)
+                - sum(estimate_tokens(text) for text in unique)
+            )
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        경로별 통계를 반환합니다.
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+            경로별 세그먼트 수, 고유 세그먼트 수, 절약한 세그먼트(provider 호출/배치 항목) 수와 추정 토큰 수
+        """
+        return {path: dict(stats) for path, stats in self._stats.items()}
+
+
+def reassemble(pieces: List[Piece], translations: List[str]) -> str:
+    """
+    번역된 청크를 원래 구분자 사이에 순서대로 다시 끼워 넣습니다.
+
+    Parameters
+    ----------
+    pieces : List[Piece]
+        segment_text 결과
+    translations : List[str]
+        번역 대상 조각 순서의 번역 결과
+
+    Returns
+    -------
+    str
+        재조립된 번역 문서
+    """
+    translated = iter(translations)
+    return "".join(next(translated) if translatable else text for text, translatable in pieces)
+
+
+async def translate_document(
+    text: str,
+    translate_chunk: Callable[[str], Awaitable[str]],
+    max_tokens: int,
+    max_parallel: int,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    dedup_stats: Optional[DedupStats] = None,
+) -> Tuple[str, int]:
+    """
+    문서를 청크로 나누어 동시에 번역한 뒤 재조립합니다.
+
+    정규화한 텍스트가 같은 청크는 한 번만 번역합니다.
+
+    Parameters
+    ----------
+    text : str
+        원본 문서
+    translate_chunk : Callable[[str], Awaitable[str]]
+        청크 하나를 번역하는 코루틴 함수
+    max_tokens : int
+        청크당 최대 토큰 수
+    max_parallel : int
+        동시에 번역할 최대 청크 수
+    on_progress : Optional[Callable[[int, int], None]]
+        청크 번역이 끝날 때마다 (완료 청크 수, 전체 청크 수)로 호출 (시작 시 (0, 전체)로 한 번 호출)
+        청크 수는 중복을 제거한 고유 청크 기준
+    dedup_stats : Optional[DedupStats]
+        주어지면 "document" 경로의 중복 제거 결과를 기록
+
+    Returns
+    -------
+    Tuple[str, int]
+        (번역된 문서, 번역한 고유 청크 수)
+    """
+    pieces = segment_text(text, max_tokens)
+    all_chunks = [piece for piece, translatable in pieces if translatable]
+    chunks, positions = deduplicate_segments(all_chunks)
+    if dedup_stats is not None:
+        dedup_stats.record("document", all_chunks, chunks)
+    semaphore = asyncio.Semaphore(max_parallel)
+    done = 0
+    if on_progress:
+        on_progress(0, len(chunks))
+
+    async def run(chunk: str) -> str:
+        nonlocal done
+        async with semaphore:
+            translated = await translate_chunk(chunk)
+        done += 1
+        if on_progress:
+            on_progress(done, len(chunks))
+        return translated
+
+    translations = await asyncio.gather(*(run(chunk) for chunk in chunks))
+    return reassemble(pieces, expand_translations(all_chunks, positions, translations)), len(chunks)
@@ -0,0 +1,57 @@
+"""
+백엔드 설정 로더
+
+configs/config.yaml을 읽어 각 모듈에 섹션 단위로 제공합니다.
+TRANSLATION_CONFIG 환경 변수로 다른 설정 파일을 지정할 수 있습니다.
+.env 파일(API 키 등)도 이 모듈을 처음 import할 때 한 번만 로드합니다.
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict
+
+import yaml
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 기본 설정 파일 경로 (프로젝트 루트 기준)
+DEFAULT_CONFIG_PATH = Path(__file__).parent.parent / "configs" / "config.yaml"
+
+
+@lru_cache(maxsize=1)
+def load_config() -> Dict[str, Any]:
+    """
+    설정 파일 전체를 읽어 반환합니다.
+
+    Returns
+    -------
+    Dict[str, Any]
+        설정 딕셔너리 (파일이 없으면 빈 딕셔너리)
+    """
+    config_path = Path(os.getenv("TRANSLATION_CONFIG", str(DEFAULT_CONFIG_PATH)))
+
+    if not config_path.exists():
+        print(f"[WARNING] 설정 파일을 찾을 수 없습니다: {config_path}")
+        return {}
+
+    with open(config_path, encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def get_section(name: str) -> Dict[str, Any]:
+    """
+    설정 파일의 최상위 섹션을 반환합니다.
+
+    Parameters
+    ----------
+    name : str
+        섹션 이름 (예: "cache", "api")
+
+    Returns
+    -------
+    Dict[str, Any]
+        섹션 딕셔너리 (없으면 빈 딕셔너리)
+    """
+    return dict(load_config().get(name) or {})
@@ -0,0 +1,79 @@
+"""
+동일 요청 병합 (single-flight)
+
+같은 키의 작업이 이미 진행 중이면 새로 시작하지 않고 진행 중인 작업의 결과를
+함께 기다립니다. 작업이 실패하면 기다리던 모든 요청에 같은 예외가 전달됩니다.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    키별 진행 중 작업을 공유하는 병합기
+
+    작업은 별도 Task로 실행되므로 기다리던 요청 하나가 취소(클라이언트 연결 종료 등)되어도
+    나머지 대기자의 작업은 계속 진행됩니다.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        키에 해당하는 작업을 실행하거나, 진행 중인 작업의 결과를 기다립니다.
+
+        Parameters
+        ----------
+        key : Hashable
+            작업 식별 키 (예: 캐시 키)
+        fn : Callable[[], Awaitable[T]]
+            진행 중인 작업이 없을 때 실행할 코루틴 함수
+
+        Returns
+        -------
+        T
+            작업 결과
+
+        Raises
+        ------
+        Exception
+            작업에서 발생한 예외 (모든 대기자에게 동일하게 전달)
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._on_done(key, done))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 모든 대기자가 취소된 경우에도 예외가 "never retrieved" 경고를 남기지 않도록 소비
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        병합 통계를 반환합니다.
+
+        Returns
+        -------
+        Dict[str, int]
+            진행 중 작업 수, 실제 실행 횟수, 병합된 요청 수
+        """
+        return {
+            "inflight": len(self._inflight),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
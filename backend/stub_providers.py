@@ -0,0 +1,244 @@
+"""
+벤치마크용 로컬 스텁 provider 서버
+
+OpenAI(chat completions), DeepL(v2 translate), Google Translate(모바일 웹) API를 흉내 내는
+FastAPI 앱입니다. 실제 번역 대신 입력 앞에 "[stub]"을 붙여 반환하며, provider별로
+지연시간 분포(로그 정규 분포)와 오류율을 설정할 수 있어 API 키와 네트워크 없이 성능을 측정할 수 있습니다.
+
+번역 서버는 다음 환경 변수로 스텁 서버를 사용합니다 (backend.benchmark가 자동 설정).
+    OPENAI_BASE_URL=http://127.0.0.1:<port>/openai/v1
+    DEEPL_SERVER_URL=http://127.0.0.1:<port>/deepl/
+    GOOGLE_TRANSLATE_URL=http://127.0.0.1:<port>/google/m
+
+실행 방법:
+    rye run python -m backend.stub_providers --port 8900 --openai 400:0.4:0.01
+"""
+
+import argparse
+import asyncio
+import html
+import json
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+
+STUB_PREFIX = "[stub] "
+
+
+@dataclass
+class LatencyProfile:
+    """
+    스텁 provider의 응답 지연시간 분포와 오류율
+
+    Parameters
+    ----------
+    median_ms : float
+        지연시간 중앙값(ms)
+    sigma : float
+        로그 정규 분포의 표준편차 (0이면 항상 중앙값, 클수록 꼬리가 김)
+    error_rate : float
+        503 오류를 반환할 확률 (0~1)
+    """
+
+    median_ms: float = 100.0
+    sigma: float = 0.3
+    error_rate: float = 0.0
+
+    def sample_delay(self) -> float:
+        """응답 지연시간(초)을 하나 뽑습니다."""
+        return self.median_ms / 1000 * math.exp(random.gauss(0, self.sigma))
+
+    def should_fail(self) -> bool:
+        """이번 요청을 실패시킬지 정합니다."""
+        return random.random() < self.error_rate
+
+    def __str__(self) -> str:
+        return f"{self.median_ms:g}:{self.sigma:g}:{self.error_rate:g}"
+
+
+def parse_profile(value: str) -> LatencyProfile:
+    """
+    "중앙값ms[:sigma[:오류율]]" 형식 문자열을 LatencyProfile로 변환합니다.
+
+    Parameters
+    ----------
+    value : str
+        예: "400", "400:0.5", "400:0.5:0.02"
+
+    Returns
+    -------
+    LatencyProfile
+        지연시간/오류율 설정
+    """
+    parts = [float(part) for part in value.split(":")]
+    return LatencyProfile(*parts)
+
+
+def _stub_translate(text: str) -> str:
+    return STUB_PREFIX + text
+
+
+def _chat_content(body: Dict[str, Any]) -> str:
+    """chat completions 요청에 대한 스텁 응답 본문을 만듭니다."""
+    user_message = body["messages"][-1]["content"]
+
+    # 배치 번역/후수정 (JSON 출력): 세그먼트마다 id를 유지해 응답
+    if body.get("response_format"):
+        segments = json.loads(user_message[user_message.index("{"):])["segments"]
+        return json.dumps({
+            "translations": [
+                {
+                    "id": segment["id"],
+                    "text": _stub_translate(segment.get("text") or segment.get("machine_translation", "")),
+                }
+                for segment in segments
+            ]
+        }, ensure_ascii=False)
+
+    # 단건 번역: 프롬프트 머리말 뒤의 원문만 번역
+    _, _, text = user_message.partition("\n\n")
+    return _stub_translate(text or user_message)
+
+
+def _usage(body: Dict[str, Any], content: str) -> Dict[str, int]:
+    prompt_tokens = sum(len(message["content"]) for message in body["messages"]) // 4
+    completion_tokens = len(content) // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def create_stub_app(profiles: Dict[str, LatencyProfile]) -> FastAPI:
+    """
+    스텁 provider 앱을 생성합니다.
+
+    Parameters
+    ----------
+    profiles : Dict[str, LatencyProfile]
+        provider 이름("openai", "deepl", "google") -> 지연시간/오류율 설정
+
+    Returns
+    -------
+    FastAPI
+        스텁 앱 (/stats에서 provider별 요청/오류 수 확인)
+    """
+    app = FastAPI(title="Stub Providers")
+    stats = {provider: {"requests": 0, "errors": 0} for provider in profiles}
+
+    async def simulate(provider: str) -> bool:
+        """지연시간을 흉내 내고, 실패시킬 요청이면 False를 반환합니다."""
+        profile = profiles[provider]
+        stats[provider]["requests"] += 1
+        await asyncio.sleep(profile.sample_delay())
+        if profile.should_fail():
+            stats[provider]["errors"] += 1
+            return False
+        return True
+
+    def unavailable(provider: str) -> JSONResponse:
+        return JSONResponse(
+            {"error": {"message": f"stub {provider} unavailable", "type": "server_error"}},
+            status_code=503,
+        )
+
+    @app.get("/openai/v1/models")
+    async def openai_models():
+        return {"object": "list", "data": []}
+
+    @app.post("/openai/v1/chat/completions")
+    async def openai_chat(request: Request):
+        body = await request.json()
+        if not await simulate("openai"):
+            return unavailable("openai")
+
+        content = _chat_content(body)
+        created = int(time.time())
+        if not body.get("stream"):
+            return {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": created,
+                "model": body["model"],
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": _usage(body, content),
+            }
+
+        async def chunks() -> AsyncIterator[str]:
+            base = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": created, "model": body["model"]}
+            for word in content.split(" "):
+                delta = {"index": 0, "delta": {"content": word + " "}, "finish_reason": None}
+                yield f"data: {json.dumps({**base, 'choices': [delta]}, ensure_ascii=False)}\n\n"
+            done = {"index": 0, "delta": {}, "finish_reason": "stop"}
+            yield f"data: {json.dumps({**base, 'choices': [done]})}\n\n"
+            if (body.get("stream_options") or {}).get("include_usage"):
+                yield f"data: {json.dumps({**base, 'choices': [], 'usage': _usage(body, content)})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    @app.get("/deepl/v2/usage")
+    async def deepl_usage():
+        return {"character_count": 0, "character_limit": 1_000_000_000}
+
+    @app.post("/deepl/v2/translate")
+    async def deepl_translate(request: Request):
+        body = await request.json()
+        if not await simulate("deepl"):
+            return JSONResponse({"message": "stub deepl unavailable"}, status_code=503)
+
+        texts: List[str] = body["text"]
+        return {
+            "translations": [
+                {
+                    "detected_source_language": body.get("source_lang") or "EN",
+                    "text": _stub_translate(text),
+                    "billed_characters": len(text),
+                }
+                for text in texts
+            ]
+        }
+
+    @app.get("/google/m")
+    async def google_translate(q: str = ""):
+        if not await simulate("google"):
+            return HTMLResponse("stub google unavailable", status_code=503)
+        return HTMLResponse(f'<html><body><div class="t0">{html.escape(_stub_translate(q))}</div></body></html>')
+
+    @app.get("/stats")
+    async def get_stats():
+        return {
+            "profiles": {provider: str(profile) for provider, profile in profiles.items()},
+            "stats": stats,
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="벤치마크용 스텁 provider 서버")
+    parser.add_argument("--host", default="127.0.0.1", help="바인딩 주소")
+    parser.add_argument("--port", type=int, default=8900, help="포트")
+    parser.add_argument("--openai", default="400:0.4:0", help="OpenAI 지연시간 중앙값ms:sigma:오류율")
+    parser.add_argument("--deepl", default="150:0.3:0", help="DeepL 지연시간 중앙값ms:sigma:오류율")
+    parser.add_argument("--google", default="120:0.3:0", help="Google 지연시간 중앙값ms:sigma:오류율")
+    args = parser.parse_args()
+
+    stub_app = create_stub_app({
+        "openai": parse_profile(args.openai),
+        "deepl": parse_profile(args.deepl),
+        "google": parse_profile(args.google),
+    })
+    uvicorn.run(stub_app, host=args.host, port=args.port, log_level="warning", access_log=False)
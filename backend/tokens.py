@@ -0,0 +1,207 @@
+"""
+토큰 수 계산과 출력 토큰 예산
+
+tiktoken(기본 의존성)으로 모델의 실제 인코딩(gpt-4o 계열 o200k_base, gpt-3.5 cl100k_base)을 사용해
+토큰 수를 셉니다. tiktoken이 없거나 인코딩 파일을 받지 못하면 실제보다 크게 잡는 보수적 추정치를
+사용하므로, max_tokens가 부족해 번역이 잘리지는 않습니다 (대신 413 거절이 조금 일찍 일어날 수 있음).
+
+OpenAI 호출의 max_tokens는 고정값 대신 입력 토큰 수와 목표 언어별 출력 배율로 정합니다.
+짧은 입력은 분당 토큰 예산을 덜 예약하고, 긴 입력은 출력이 잘리지 않습니다.
+"""
+
+import importlib.util
+import math
+import threading
+from typing import Dict, Iterable, Optional
+
+from fastapi import HTTPException
+
+from .settings import get_section
+
+# tiktoken 설치 여부 (인코딩 파일을 읽는 import는 첫 사용 시 수행)
+TIKTOKEN_AVAILABLE = importlib.util.find_spec("tiktoken") is not None
+if not TIKTOKEN_AVAILABLE:
+    print("[WARNING] tiktoken이 설치되지 않아 토큰 수를 보수적으로 추정합니다 (413 거절이 늘 수 있음).")
+    print("[INFO] 설치: rye sync (또는 rye add tiktoken)")
+
+_token_budget_config = get_section("token_budget")
+DEFAULT_OUTPUT_RATIO = float(_token_budget_config.get("output_ratio", 1.5))
+OUTPUT_RATIOS: Dict[str, float] = {
+    str(language): float(ratio)
+    for language, ratio in (_token_budget_config.get("output_ratios") or {"ko": 2.5, "ja": 2.5, "zh": 2.5}).items()
+}
+OUTPUT_MARGIN = int(_token_budget_config.get("margin", 32))
+MIN_OUTPUT_TOKENS = int(_token_budget_config.get("min_output_tokens", 64))
+# 배치 요청의 세그먼트당 JSON 구조({"id": 1, "text": "..."}) 토큰
+SEGMENT_OVERHEAD_TOKENS = int(_token_budget_config.get("segment_overhead", 12))
+MAX_OUTPUT_TOKENS: Dict[str, int] = {
+    str(model): int(limit)
+    for model, limit in (
+        _token_budget_config.get("max_output_tokens")
+        or {"gpt-3.5-turbo": 4096, "gpt-4o-mini": 16384, "gpt-4o": 16384}
+    ).items()
+}
+
+# 모델 ID -> tiktoken 인코딩 (load_encodings로 서버 시작 시 불러옴)
+_encodings: Dict[str, object] = {}
+_encodings_lock = threading.Lock()
+
+
+def load_encodings(models: Iterable[str]) -> int:
+    """
+    모델들의 tiktoken 인코딩을 불러옵니다 (서버 시작 시 스레드풀에서 호출).
+
+    처음 불러올 때 인코딩 파일을 내려받으므로 요청 처리 중(이벤트 루프)에는 불러오지 않으며,
+    불러오기 전이나 실패한 모델의 토큰 수는 보수적 추정치로 계산합니다.
+
+    Parameters
+    ----------
+    models : Iterable[str]
+        OpenAI 모델 ID 목록
+
+    Returns
+    -------
+    int
+        인코딩을 불러온 모델 수
+    """
+    if not TIKTOKEN_AVAILABLE:
+        return 0
+
+    import tiktoken
+
+    loaded = 0
+    for model in models:
+        with _encodings_lock:
+            if model in _encodings:
+                loaded += 1
+                continue
+        try:
+            try:
+                encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                encoding = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            # 인코딩 파일을 받지 못한 경우 등: 보수적 추정치로 대체
+            print(f"[WARNING] tiktoken 인코딩 로드 실패, 토큰 수를 보수적으로 추정합니다 (model={model}): {e}")
+            continue
+        with _encodings_lock:
+            _encodings[model] = encoding
+        loaded += 1
+    return loaded
+
+
+def _get_encoding(model: str):
+    """모델의 tiktoken 인코딩을 반환합니다 (불러오지 않았으면 None)."""
+    return _encodings.get(model)
+
+
+def estimate_tokens_upper_bound(text: str) -> int:
+    """
+    tiktoken 없이 토큰 수를 실제보다 크게 추정합니다.
+
+    영문자/공백은 3자당 1토큰(BPE 인코딩은 보통 4자 이상), 숫자와 문장 부호 등 그 밖의 ASCII 문자는
+    1자당 1토큰, 한글/한자/가나 등 비ASCII 문자는 1자당 2토큰(cl100k_base 최악의 경우 수준)으로 계산합니다.
+
+    Parameters
+    ----------
+    text : str
+        대상 텍스트
+
+    Returns
+    -------
+    int
+        추정 토큰 수 (상한)
+    """
+    letters = sum(1 for ch in text if ch.isascii() and (ch.isalpha() or ch.isspace()))
+    other_ascii = sum(1 for ch in text if ch.isascii()) - letters
+    return (letters + 2) // 3 + other_ascii + 2 * (len(text) - letters - other_ascii)
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    텍스트의 토큰 수를 반환합니다.
+
+    Parameters
+    ----------
+    text : str
+        대상 텍스트
+    model : Optional[str]
+        OpenAI 모델 ID (주어지고 tiktoken이 있으면 해당 인코딩으로 계산)
+
+    Returns
+    -------
+    int
+        토큰 수 (인코딩을 사용할 수 없으면 estimate_tokens_upper_bound 추정치)
+    """
+    encoding = _get_encoding(model) if model else None
+    if encoding is None:
+        return estimate_tokens_upper_bound(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def max_source_tokens(model: str, target_lang: Optional[str] = None, segments: int = 0) -> int:
+    """
+    plan_output_tokens가 거절하지 않는 최대 입력 토큰 수를 반환합니다 (배치 그룹 크기 제한용).
+
+    Parameters
+    ----------
+    model : str
+        OpenAI 모델 ID
+    target_lang : Optional[str]
+        목표 언어 코드
+    segments : int
+        배치 요청의 세그먼트 수
+
+    Returns
+    -------
+    int
+        최대 입력 토큰 수
+    """
+    ratio = OUTPUT_RATIOS.get((target_lang or "").split("-")[0], DEFAULT_OUTPUT_RATIO)
+    limit = MAX_OUTPUT_TOKENS.get(model, 4096)
+    return max(1, int((limit - OUTPUT_MARGIN - segments * SEGMENT_OVERHEAD_TOKENS) / ratio))
+
+
+def plan_output_tokens(
+    model: str,
+    source_tokens: int,
+    target_lang: Optional[str] = None,
+    segments: int = 0,
+) -> int:
+    """
+    입력 토큰 수로 요청의 max_tokens를 정합니다.
+
+    필요한 출력 토큰은 (입력 토큰 x 목표 언어 배율 + 여유분 + 세그먼트당 JSON 구조 토큰)이며,
+    모델의 최대 출력 토큰을 넘으면 잘린 번역을 반환하는 대신 413으로 거절합니다
+    (API는 긴 텍스트를 미리 청크로 나누므로 보통 도달하지 않음).
+
+    Parameters
+    ----------
+    model : str
+        OpenAI 모델 ID
+    source_tokens : int
+        번역할 텍스트(후수정은 초안)의 토큰 수
+    target_lang : Optional[str]
+        목표 언어 코드 (한국어/일본어/중국어처럼 토큰이 많은 언어는 배율이 큼)
+    segments : int
+        배치 요청의 세그먼트 수
+
+    Returns
+    -------
+    int
+        max_tokens
+
+    Raises
+    ------
+    HTTPException
+        필요한 출력 토큰이 모델의 최대 출력 토큰을 넘는 경우 (413)
+    """
+    ratio = OUTPUT_RATIOS.get((target_lang or "").split("-")[0], DEFAULT_OUTPUT_RATIO)
+    needed = math.ceil(source_tokens * ratio) + OUTPUT_MARGIN + segments * SEGMENT_OVERHEAD_TOKENS
+    limit = MAX_OUTPUT_TOKENS.get(model, 4096)
+    if needed > limit:
+        raise HTTPException(
+            status_code=413,
+            detail=f"번역 결과가 {model}의 최대 출력 토큰({limit})을 넘습니다 (예상 {needed}토큰). 텍스트를 나누어 요청하세요.",
+        )
+    return max(MIN_OUTPUT_TOKENS, needed)
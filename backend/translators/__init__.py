@@ -1,19 +1,72 @@
 """
 번역기 모듈
 
-OpenAI, Google Translate, DeepL, Post-Editor 번역 함수를 제공합니다.
+OpenAI, Google Translate, DeepL, Post-Editor 번역 함수와
+번역 결과를 영구 저장하는 번역 메모리와 유사 문장 검색 인덱스, 용어집, provider별 요청 스케줄러와 서킷 브레이커, provider 공용 HTTP 클라이언트를 제공합니다.
 """
 
-from .openai_translator import translate_with_openai
-from .google_translator import translate_with_google
-from .deepl_translator import translate_with_deepl, init_deepl_client
-from .post_editor_translator import translate_with_post_editor
+from .openai_translator import (
+    translate_with_openai,
+    translate_batch_with_openai,
+    stream_with_openai,
+    get_openai_client,
+    openai_client_ready,
+    warm_up_openai,
+)
+from .google_translator import (
+    translate_with_google,
+    translate_batch_with_google,
+    google_client_ready,
+)
+from .deepl_translator import (
+    translate_with_deepl,
+    translate_batch_with_deepl,
+    get_deepl_client,
+    deepl_client_ready,
+    warm_up_deepl,
+)
+from .post_editor_translator import (
+    translate_with_post_editor,
+    translate_batch_with_post_editor,
+    stream_with_post_editor,
+    DraftFallback,
+)
+from .translation_memory import TranslationMemory
+from .fuzzy_memory import FuzzyMatch, FuzzyMemory
+from .glossary import Glossary, get_glossary
+from .scheduler import get_scheduler, scheduler_stats
+from .resilience import breaker_stats
+from .http_clients import close_http_clients, http_client_stats, open_http_clients
 
 __all__ = [
     "translate_with_openai",
     "translate_with_google",
     "translate_with_deepl",
     "translate_with_post_editor",
-    "init_deepl_client",
+    "translate_batch_with_openai",
+    "translate_batch_with_google",
+    "translate_batch_with_deepl",
+    "translate_batch_with_post_editor",
+    "stream_with_openai",
+    "stream_with_post_editor",
+    "DraftFallback",
+    "get_openai_client",
+    "get_deepl_client",
+    "openai_client_ready",
+    "deepl_client_ready",
+    "google_client_ready",
+    "warm_up_openai",
+    "warm_up_deepl",
+    "TranslationMemory",
+    "FuzzyMemory",
+    "FuzzyMatch",
+    "Glossary",
+    "get_glossary",
+    "get_scheduler",
+    "scheduler_stats",
+    "breaker_stats",
+    "open_http_clients",
+    "close_http_clients",
+    "http_client_stats",
 ]
 
@@ -2,47 +2,168 @@
 DeepL을 사용한 번역 모듈
 """
 
+import asyncio
+import importlib.util
 import os
+import threading
+from typing import List, Optional, Tuple
+
 from fastapi import HTTPException
-from dotenv import load_dotenv
+from fastapi.concurrency import run_in_threadpool
 
-load_dotenv()
+from ..metrics import record_deepl_usage
+from .glossary import protect_terms, restore_terms
+from .http_clients import get_http_session, http_clients
+from .resilience import call_provider
 
-try:
-    import deepl
-    DEEPL_AVAILABLE = True
-    print("[OK] DeepL 모듈 로드 성공")
-except ImportError:
-    DEEPL_AVAILABLE = False
+# deepl 패키지 설치 여부 (SDK import는 첫 사용 시 수행)
+DEEPL_AVAILABLE = importlib.util.find_spec("deepl") is not None
+if not DEEPL_AVAILABLE:
     print("[WARNING] deepl이 설치되지 않았습니다.")
     print("[INFO] 설치: rye add deepl")
 
-# DeepL 클라이언트
+# DeepL 클라이언트 (첫 사용 시 생성)
 deepl_translator = None
+_deepl_client_loaded = False
+_deepl_client_lock = threading.Lock()
 
 
-def init_deepl_client():
-    """DeepL 클라이언트를 초기화합니다."""
-    global deepl_translator
+def _use_shared_session(translator) -> None:
+    """
+    SDK가 만든 세션을 공용 requests.Session으로 바꿉니다.
+
+    SDK에 세션을 넘기는 공개 인자가 없어 내부 속성(_client._session)을 바꾸므로,
+    pyproject에서 검증한 버전 범위(deepl 1.x)로 고정하고 구조가 다르면 SDK 세션을 그대로 사용합니다.
+    SDK는 미리 준비한 요청을 session.send로 보내므로 세션 상태(헤더, 쿠키)를 공유해도 무관합니다.
+    """
+    import requests
+
+    client = getattr(translator, "_client", None)
+    if not isinstance(getattr(client, "_session", None), requests.Session):
+        print("[WARNING] DeepL SDK 구조가 달라 공용 세션 대신 SDK 세션을 사용합니다 (연결 풀/DNS 캐시 미적용).")
+        return
+    client._session.close()
+    client._session = get_http_session()
+
+
+def get_deepl_client():
+    """
+    DeepL 클라이언트를 반환합니다.
     
+    첫 호출 시 deepl SDK를 import하고 클라이언트를 생성합니다.
+    SDK가 만든 세션 대신 공용 requests.Session(연결 풀, keep-alive)을 사용합니다.
+    
+    Returns
+    -------
+    Optional[deepl.Translator]
+        클라이언트 (패키지나 DEEPL_API_KEY가 없거나 생성에 실패하면 None)
+    """
+    global deepl_translator, _deepl_client_loaded
+    
+    if _deepl_client_loaded:
+        return deepl_translator
+    
+    with _deepl_client_lock:
+        if _deepl_client_loaded:
+            return deepl_translator
+        
+        deepl_api_key = os.getenv("DEEPL_API_KEY")
+        if not DEEPL_AVAILABLE:
+            print("[WARNING] DeepL 라이브러리가 없어 초기화를 건너뜁니다.")
+        elif deepl_api_key:
+            try:
+                import deepl
+                
+                # 재시도는 resilience 계층에서 처리하므로 SDK 자체 재시도는 끔
+                deepl.http_client.max_network_retries = 0
+                # DEEPL_SERVER_URL로 다른 서버(벤치마크용 스텁 등)를 지정할 수 있음
+                deepl_translator = deepl.Translator(
+                    deepl_api_key, server_url=os.getenv("DEEPL_SERVER_URL") or None
+                )
+                _use_shared_session(deepl_translator)
+                print("[OK] DeepL 클라이언트 초기화 성공")
+            except Exception as e:
+                print(f"[ERROR] DeepL 클라이언트 초기화 실패: {e}")
+                deepl_translator = None
+        else:
+            print("[WARNING] DEEPL_API_KEY가 설정되지 않았습니다.")
+        
+        _deepl_client_loaded = True
+    
+    return deepl_translator
+
+
+def _reset_deepl_client() -> None:
+    """공용 HTTP 세션이 닫히면 다음 사용 시 클라이언트를 다시 생성하도록 합니다."""
+    global deepl_translator, _deepl_client_loaded
+    
+    with _deepl_client_lock:
+        deepl_translator = None
+        _deepl_client_loaded = False
+
+
+http_clients.on_close(_reset_deepl_client)
+
+
+def deepl_client_ready() -> bool:
+    """DeepL 클라이언트가 초기화되었는지 반환합니다 (필요하면 생성)."""
+    return get_deepl_client() is not None
+
+
+async def warm_up_deepl() -> bool:
+    """
+    DeepL 연결 풀과 TLS 세션을 미리 연결합니다 (사용량 조회 1회, 과금 없음).
+    
+    Returns
+    -------
+    bool
+        연결했으면 True, 클라이언트가 초기화되지 않았으면 False
+    """
+    # SDK import가 이벤트 루프를 막지 않도록 스레드풀에서 클라이언트 생성
+    translator = await run_in_threadpool(get_deepl_client)
+    if not translator:
+        return False
+    await run_in_threadpool(translator.get_usage)
+    return True
+
+
+# DeepL API가 한 번의 요청으로 받는 최대 텍스트 수
+DEEPL_MAX_TEXTS_PER_REQUEST = 50
+
+
+def _require_deepl_client():
+    """DeepL 클라이언트를 반환하고, 사용할 수 없으면 HTTPException을 발생시킵니다."""
     if not DEEPL_AVAILABLE:
-        print("[WARNING] DeepL 라이브러리가 없어 초기화를 건너뜁니다.")
-        return
+        raise HTTPException(
+            status_code=503,
+            detail="DeepL이 설치되지 않았습니다. deepl 패키지를 설치하세요.",
+        )
+    
+    translator = get_deepl_client()
+    if not translator:
+        raise HTTPException(
+            status_code=503,
+            detail="DeepL 클라이언트가 초기화되지 않았습니다. DEEPL_API_KEY를 확인하세요.",
+        )
+    return translator
+
+
+def _to_deepl_lang_codes(source_lang: str, target_lang: str) -> Tuple[Optional[str], str]:
+    """언어 코드를 DeepL 형식(대문자, EN-US 등)으로 변환합니다."""
+    # DeepL은 언어 코드를 대문자로 사용
+    source_lang_upper = source_lang.upper() if source_lang != "auto" else None
+    target_lang_upper = target_lang.upper()
     
-    deepl_api_key = os.getenv("DEEPL_API_KEY")
+    # DeepL 특수 처리 (EN -> EN-US, PT -> PT-BR 등)
+    if target_lang_upper == "EN":
+        target_lang_upper = "EN-US"
+    elif target_lang_upper == "PT":
+        target_lang_upper = "PT-BR"
     
-    if deepl_api_key:
-        try:
-            deepl_translator = deepl.Translator(deepl_api_key)
-            print("[OK] DeepL 클라이언트 초기화 성공")
-        except Exception as e:
-            print(f"[ERROR] DeepL 클라이언트 초기화 실패: {e}")
-            deepl_translator = None
-    else:
-        print("[WARNING] DEEPL_API_KEY가 설정되지 않았습니다.")
+    return source_lang_upper, target_lang_upper
 
 
-def translate_with_deepl(
+async def translate_with_deepl(
     text: str,
     source_lang: str,
     target_lang: str,
@@ -50,6 +171,10 @@ def translate_with_deepl(
     """
     DeepL을 사용하여 텍스트를 번역합니다.
     
+    DeepL SDK는 동기 방식이므로 스레드풀에서 실행하여
+    이벤트 루프를 블로킹하지 않습니다. 용어집 용어는 자리 표시자로 바꿔 보낸 뒤
+    지정 번역으로 되돌립니다.
+    
     Parameters
     ----------
     text : str
@@ -69,40 +194,128 @@ def translate_with_deepl(
     HTTPException
         번역 실패 시
     """
-    if not DEEPL_AVAILABLE:
-        raise HTTPException(
-            status_code=503,
-            detail="DeepL이 설치되지 않았습니다. deepl 패키지를 설치하세요.",
-        )
+    translator = _require_deepl_client()
     
-    if not deepl_translator:
-        raise HTTPException(
-            status_code=503,
-            detail="DeepL 클라이언트가 초기화되지 않았습니다. DEEPL_API_KEY를 확인하세요.",
+    try:
+        source_lang_upper, target_lang_upper = _to_deepl_lang_codes(source_lang, target_lang)
+        protected_text, replacements = protect_terms(text, source_lang, target_lang)
+        
+        result = await call_provider(
+            "deepl",
+            lambda: run_in_threadpool(
+                translator.translate_text,
+                protected_text,
+                source_lang=source_lang_upper,
+                target_lang=target_lang_upper,
+            ),
+            is_transient_deepl_error,
+            units=len(protected_text),
         )
+        record_deepl_usage(result)
+        
+        return restore_terms(result.text, replacements)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        _raise_deepl_error(e)
+
+
+async def translate_batch_with_deepl(
+    texts: List[str],
+    source_lang: str,
+    target_lang: str,
+) -> List[str]:
+    """
+    DeepL의 다중 텍스트 번역으로 여러 텍스트를 한 번에 번역합니다.
+    
+    DeepL은 요청당 최대 50개의 텍스트를 받으므로 50개 단위로 나누어
+    동시에 요청합니다.
+    
+    Parameters
+    ----------
+    texts : List[str]
+        번역할 텍스트 목록
+    source_lang : str
+        원본 언어 코드 (예: "en", "auto"면 자동 감지)
+    target_lang : str
+        목표 언어 코드 (예: "ko")
+    
+    Returns
+    -------
+    List[str]
+        입력 순서와 동일한 번역 결과 목록
+    
+    Raises
+    ------
+    HTTPException
+        번역 실패 시
+    """
+    translator = _require_deepl_client()
     
     try:
-        # DeepL은 언어 코드를 대문자로 사용
-        source_lang_upper = source_lang.upper() if source_lang != "auto" else None
-        target_lang_upper = target_lang.upper()
-        
-        # DeepL 특수 처리 (EN -> EN-US, PT -> PT-BR 등)
-        if target_lang_upper == "EN":
-            target_lang_upper = "EN-US"
-        elif target_lang_upper == "PT":
-            target_lang_upper = "PT-BR"
+        source_lang_upper, target_lang_upper = _to_deepl_lang_codes(source_lang, target_lang)
+        protected = [protect_terms(text, source_lang, target_lang) for text in texts]
+        protected_texts = [protected_text for protected_text, _ in protected]
         
-        result = deepl_translator.translate_text(
-            text,
-            source_lang=source_lang_upper,
-            target_lang=target_lang_upper,
-        )
+        chunks = [
+            protected_texts[i:i + DEEPL_MAX_TEXTS_PER_REQUEST]
+            for i in range(0, len(protected_texts), DEEPL_MAX_TEXTS_PER_REQUEST)
+        ]
+        results = await asyncio.gather(*(
+            call_provider(
+                "deepl",
+                lambda chunk=chunk: run_in_threadpool(
+                    translator.translate_text,
+                    chunk,
+                    source_lang=source_lang_upper,
+                    target_lang=target_lang_upper,
+                ),
+                is_transient_deepl_error,
+                units=sum(len(text) for text in chunk),
+            )
+            for chunk in chunks
+        ))
+        for chunk_result in results:
+            record_deepl_usage(chunk_result)
         
-        return result.text
+        translated = [item.text for chunk_result in results for item in chunk_result]
+        return [
+            restore_terms(text, replacements)
+            for text, (_, replacements) in zip(translated, protected)
+        ]
     
+    except HTTPException:
+        raise
     except Exception as e:
+        _raise_deepl_error(e)
+
+
+def is_transient_deepl_error(e: Exception) -> bool:
+    """재시도할 DeepL 일시적 오류(연결 실패, 429, 5xx)인지 판단합니다."""
+    import deepl
+    
+    if isinstance(e, (deepl.ConnectionException, deepl.TooManyRequestsException)):
+        return True
+    status_code = getattr(e, "http_status_code", None)
+    return status_code is not None and status_code >= 500
+
+
+def _raise_deepl_error(e: Exception):
+    """DeepL 예외를 HTTPException으로 변환합니다 (요청 한도 초과는 429, 시간 초과는 504)."""
+    import deepl
+    
+    if isinstance(e, asyncio.TimeoutError):
         raise HTTPException(
-            status_code=500,
-            detail=f"DeepL 번역 실패: {str(e)}",
+            status_code=504,
+            detail="DeepL 응답 시간이 초과되었습니다.",
         )
-
+    if isinstance(e, (deepl.TooManyRequestsException, deepl.QuotaExceededException)):
+        raise HTTPException(
+            status_code=429,
+            detail=f"DeepL 요청 한도를 초과했습니다: {str(e)}",
+        )
+    raise HTTPException(
+        status_code=500,
+        detail=f"DeepL 번역 실패: {str(e)}",
+    )
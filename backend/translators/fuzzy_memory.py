@@ -0,0 +1,320 @@
+"""
+번역 메모리 유사 문장 검색 (MinHash + LSH)
+
+정확히 같은 텍스트만 찾는 캐시/번역 메모리와 달리, 단어 하나나 문장 부호만 다른
+이전 번역을 찾습니다. 원문을 문자 n-gram 집합으로 바꾼 뒤 MinHash 서명을 만들고,
+서명을 band로 나눈 LSH 버킷을 번역 메모리와 같은 SQLite 파일에 저장합니다.
+
+조회는 band 수만큼의 버킷 PK 조회와 소수 후보의 n-gram Jaccard 유사도 계산뿐이라
+저장된 문장 수와 거의 무관하게 일반적인 문장 기준 1ms 이내에 끝납니다.
+
+인덱스가 생기기 전에 저장된 번역 메모리 항목은 서버 시작 시 backfill로 한 번 색인합니다
+(이후 저장되는 항목은 저장할 때 색인되므로 다시 확인하지 않음).
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+# (모델, 원본 언어, 목표 언어, 텍스트 해시) - backend.cache.CacheKey와 동일한 형식
+MemoryKey = Tuple[str, str, str, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fuzzy_buckets (
+    bucket INTEGER NOT NULL,
+    text_hash TEXT NOT NULL,
+    PRIMARY KEY (bucket, text_hash)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS fuzzy_state (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class FuzzyMatch:
+    """유사 문장 검색 결과"""
+
+    source_text: str
+    translated_text: str
+    similarity: float
+
+
+def normalize(text: str) -> str:
+    """비교용 정규화 (소문자, 연속 공백을 하나로)"""
+    return " ".join(text.lower().split())
+
+
+class FuzzyMemory:
+    """
+    번역 메모리 원문에 대한 MinHash LSH 인덱스
+
+    sqlite3 연결은 스레드 간 공유할 수 없으므로 스레드마다 별도 연결을 사용합니다.
+
+    Parameters
+    ----------
+    path : str or Path
+        번역 메모리 SQLite 파일 경로 (translations 테이블과 같은 파일)
+    bands : int
+        LSH band 수 (많을수록 낮은 유사도의 문장도 후보가 됨)
+    rows : int
+        band당 MinHash 값 수 (많을수록 무관한 문장이 후보가 될 확률이 낮아짐)
+    ngram : int
+        문자 n-gram 길이
+    max_candidates : int
+        유사도를 직접 계산할 최대 후보 수 (버킷 일치 수 순)
+    """
+
+    def __init__(
+        self,
+        path,
+        bands: int = 10,
+        rows: int = 4,
+        ngram: int = 3,
+        max_candidates: int = 5,
+    ):
+        self.path = Path(path)
+        self.bands = bands
+        self.rows = rows
+        self.ngram = ngram
+        self.max_candidates = max_candidates
+
+        self._local = threading.local()
+        self.lookups = 0
+        self.matches = 0
+        self.indexed = 0
+        self.backfilled = 0
+
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+    @classmethod
+    def from_config(cls, path, config: Dict[str, Any]) -> "FuzzyMemory":
+        """configs/config.yaml의 fuzzy_memory 섹션으로 인덱스를 생성합니다."""
+        return cls(
+            path,
+            bands=int(config.get("bands", 10)),
+            rows=int(config.get("rows", 4)),
+            ngram=int(config.get("ngram", 3)),
+            max_candidates=int(config.get("max_candidates", 5)),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def shingles(self, text: str) -> FrozenSet[str]:
+        """정규화한 텍스트의 문자 n-gram 집합을 반환합니다."""
+        text = normalize(text)
+        if len(text) <= self.ngram:
+            return frozenset([text])
+        return frozenset(text[i:i + self.ngram] for i in range(len(text) - self.ngram + 1))
+
+    def signature(self, shingles: FrozenSet[str]) -> array:
+        """
+        MinHash 서명을 계산합니다.
+
+        n-gram마다 shake_128로 (bands * rows)개의 32비트 해시를 한 번에 만들고
+        위치별 최솟값을 취합니다 (해시 함수 bands * rows개를 쓰는 것과 같은 효과).
+        """
+        size = self.bands * self.rows * 4
+        rows = [array("I", hashlib.shake_128(shingle.encode("utf-8")).digest(size)) for shingle in shingles]
+        return array("I", map(min, zip(*rows)))
+
+    def buckets(
+        self,
+        model: str,
+        source_lang: str,
+        target_lang: str,
+        shingles: FrozenSet[str],
+    ) -> List[int]:
+        """
+        n-gram 집합의 LSH 버킷 id 목록을 반환합니다.
+
+        버킷 id는 (모델, 언어 쌍, band 번호, band의 MinHash 값)의 64비트 해시이므로
+        모델/언어 쌍이 다른 문장과는 섞이지 않습니다.
+        """
+        signature = self.signature(shingles)
+        prefix = f"{model}\x1f{source_lang}\x1f{target_lang}\x1f".encode("utf-8")
+        buckets = []
+        for band in range(self.bands):
+            values = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(prefix + bytes([band]) + values, digest_size=8).digest()
+            buckets.append(int.from_bytes(digest, "big", signed=True))
+        return buckets
+
+    def _bucket_rows(self, entries: List[Tuple[MemoryKey, str]]) -> List[Tuple[int, str]]:
+        return [
+            (bucket, key[3])
+            for key, source_text in entries
+            for bucket in self.buckets(key[0], key[1], key[2], self.shingles(source_text))
+        ]
+
+    def add_many(self, entries: List[Tuple[MemoryKey, str]]) -> None:
+        """
+        번역 메모리에 저장한 원문을 인덱스에 추가합니다.
+
+        Parameters
+        ----------
+        entries : List[Tuple[MemoryKey, str]]
+            (번역 메모리 키, 원본 텍스트) 목록
+        """
+        rows = self._bucket_rows(entries)
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO fuzzy_buckets (bucket, text_hash) VALUES (?, ?)", rows
+            )
+        self.indexed += len(entries)
+
+    def backfill(self, batch_size: int = 500) -> int:
+        """
+        인덱스가 생기기 전에 저장된 번역 메모리 항목을 색인합니다 (서버 시작 시 스레드풀에서 실행).
+
+        번역 메모리 PK 순으로 배치마다 쓰기 트랜잭션(BEGIN IMMEDIATE) 안에서 색인하고 마지막 키를
+        기록하므로, 여러 워커가 동시에 실행해도 같은 행을 두 번 색인하지 않고 중간에 종료되어도
+        다음 시작 때 이어서 색인합니다. 끝까지 색인하면 완료로 기록해 다음부터는 건너뜁니다.
+
+        Parameters
+        ----------
+        batch_size : int
+            트랜잭션 하나에서 색인할 행 수
+
+        Returns
+        -------
+        int
+            이번에 색인한 행 수
+        """
+        conn = self._connect()
+        total = 0
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                state = conn.execute("SELECT value FROM fuzzy_state WHERE name = 'backfill'").fetchone()
+                state = json.loads(state[0]) if state else {"done": False, "last_key": None}
+                if state["done"]:
+                    conn.execute("COMMIT")
+                    break
+
+                last_key = state["last_key"] or ["", "", "", ""]
+                rows = conn.execute(
+                    "SELECT model, source_lang, target_lang, text_hash, source_text FROM translations "
+                    "WHERE (model, source_lang, target_lang, text_hash) > (?, ?, ?, ?) "
+                    "ORDER BY model, source_lang, target_lang, text_hash LIMIT ?",
+                    (*last_key, batch_size),
+                ).fetchall()
+                entries = [(tuple(row[:4]), row[4]) for row in rows]
+                conn.executemany(
+                    "INSERT OR IGNORE INTO fuzzy_buckets (bucket, text_hash) VALUES (?, ?)",
+                    self._bucket_rows(entries),
+                )
+                state = {"done": len(rows) < batch_size, "last_key": list(rows[-1][:4]) if rows else last_key}
+                conn.execute(
+                    "INSERT OR REPLACE INTO fuzzy_state (name, value) VALUES ('backfill', ?)",
+                    (json.dumps(state),),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            total += len(rows)
+        self.backfilled += total
+        return total
+
+    def lookup(
+        self,
+        model: str,
+        source_lang: str,
+        target_lang: str,
+        text: str,
+        threshold: float,
+    ) -> Optional[FuzzyMatch]:
+        """
+        유사도가 threshold 이상인 가장 비슷한 이전 번역을 찾습니다.
+
+        유사도는 정규화한 텍스트의 문자 n-gram Jaccard 유사도이며,
+        정규화한 텍스트가 완전히 같을 때만 1.0입니다.
+
+        Parameters
+        ----------
+        model : str
+            모델 ID
+        source_lang : str
+            원본 언어 코드
+        target_lang : str
+            목표 언어 코드
+        text : str
+            번역할 텍스트
+        threshold : float
+            최소 유사도 (0~1)
+
+        Returns
+        -------
+        Optional[FuzzyMatch]
+            가장 비슷한 이전 번역 (없으면 None)
+        """
+        self.lookups += 1
+        query_shingles = self.shingles(text)
+        buckets = self.buckets(model, source_lang, target_lang, query_shingles)
+        conn = self._connect()
+        candidates = conn.execute(
+            f"SELECT text_hash FROM fuzzy_buckets WHERE bucket IN ({','.join('?' * len(buckets))}) "
+            "GROUP BY text_hash ORDER BY COUNT(*) DESC LIMIT ?",
+            (*buckets, self.max_candidates),
+        ).fetchall()
+        if not candidates:
+            return None
+
+        rows = conn.execute(
+            "SELECT source_text, translated_text FROM translations "
+            "WHERE model = ? AND source_lang = ? AND target_lang = ? "
+            f"AND text_hash IN ({','.join('?' * len(candidates))})",
+            (model, source_lang, target_lang, *(row[0] for row in candidates)),
+        ).fetchall()
+
+        query_text = normalize(text)
+        best = None
+        for source_text, translated_text in rows:
+            if normalize(source_text) == query_text:
+                similarity = 1.0
+            else:
+                candidate_shingles = self.shingles(source_text)
+                similarity = len(query_shingles & candidate_shingles) / len(query_shingles | candidate_shingles)
+                similarity = min(similarity, 0.999)
+            if similarity >= threshold and (best is None or similarity > best.similarity):
+                best = FuzzyMatch(source_text, translated_text, similarity)
+
+        if best is not None:
+            self.matches += 1
+        return best
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        인덱스 통계를 반환합니다.
+
+        Returns
+        -------
+        Dict[str, Any]
+            LSH 설정, 이 프로세스의 조회/일치/색인/기존 항목 색인 수
+        """
+        return {
+            "bands": self.bands,
+            "rows": self.rows,
+            "ngram": self.ngram,
+            "lookups": self.lookups,
+            "matches": self.matches,
+            "indexed": self.indexed,
+            "backfilled": self.backfilled,
+        }
@@ -0,0 +1,339 @@
+"""
+용어집 (Glossary) 적용
+
+언어 쌍별 용어집을 Aho-Corasick 오토마톤으로 만들어 입력 텍스트를 한 번 훑는 것(선형 시간)으로
+용어 위치를 모두 찾습니다.
+
+- Google/DeepL: 용어를 자리 표시자(⟦0⟧)로 바꿔 번역한 뒤 지정 번역으로 되돌림
+- OpenAI/Post-Editor: 텍스트에 나온 용어의 지정 번역만 프롬프트에 넣음
+
+용어집은 configs/config.yaml의 glossary 섹션이 가리키는 YAML 파일에서 처음 사용할 때 읽습니다.
+
+    en-ko:
+      pull request: 풀 리퀘스트
+      Project Wed: 프로젝트 웨드
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+from ..settings import get_section
+
+# 프로젝트 루트 (용어집 경로 기준)
+_PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# 번역 엔진이 자리 표시자 안에 공백을 넣는 경우까지 복원
+_PLACEHOLDER_PATTERN = re.compile(r"⟦\s*(\d+)\s*⟧")
+
+
+def placeholder(index: int) -> str:
+    """index번째 용어의 자리 표시자를 반환합니다."""
+    return f"⟦{index}⟧"
+
+
+class AhoCorasick:
+    """
+    여러 패턴을 한 번의 스캔으로 찾는 Aho-Corasick 오토마톤
+
+    Parameters
+    ----------
+    patterns : List[str]
+        찾을 패턴 목록 (빈 문자열 제외)
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = patterns
+        # 상태별 전이, 실패 링크, 그 상태에서 끝나는 패턴 인덱스
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(index)
+
+        # 너비 우선으로 실패 링크를 계산하고 출력 목록을 합침
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        텍스트의 모든 패턴 출현 위치를 반환합니다 (겹치는 출현 포함).
+
+        Yields
+        ------
+        Tuple[int, int]
+            (시작 위치, 패턴 인덱스)
+        """
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._output[state]:
+                yield position + 1 - len(self.patterns[index]), index
+
+
+@dataclass
+class GlossaryMatch:
+    """텍스트에서 찾은 용어 (term은 용어집에 등록된 표기)"""
+
+    start: int
+    end: int
+    term: str
+    translation: str
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _fold_char(char: str) -> str:
+    lowered = char.lower()
+    return lowered if len(lowered) == 1 else char
+
+
+class Glossary:
+    """
+    한 언어 쌍의 용어집
+
+    Parameters
+    ----------
+    entries : Dict[str, str]
+        원문 용어 -> 지정 번역
+    case_sensitive : bool
+        False면 대소문자를 무시하고 찾음
+    """
+
+    def __init__(self, entries: Dict[str, str], case_sensitive: bool = False):
+        self.case_sensitive = case_sensitive
+        self.terms = [term for term in entries if term.strip()]
+        self.translations = [str(entries[term]) for term in self.terms]
+        self._automaton = AhoCorasick([self._fold(term) for term in self.terms])
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _fold(self, text: str) -> str:
+        # 찾은 위치를 원문 위치로 그대로 쓰므로 글자 수를 유지해야 함
+        # casefold()/lower()는 길이가 바뀔 수 있어(ß -> ss, İ -> i̇) 글자마다 바꾸고 길이가 바뀌는 글자는 그대로 둠
+        if self.case_sensitive:
+            return text
+        return "".join(_fold_char(char) for char in text)
+
+    def find(self, text: str) -> List[GlossaryMatch]:
+        """
+        텍스트에서 용어를 찾습니다.
+
+        단어 문자로 시작/끝나는 용어는 단어 경계에서만 인정하며("cat"은 "category"에서 찾지 않음),
+        겹치는 출현은 먼저 시작하고 긴 것을 택합니다.
+
+        Parameters
+        ----------
+        text : str
+            원문
+
+        Returns
+        -------
+        List[GlossaryMatch]
+            위치 순으로 정렬된 겹치지 않는 용어 목록
+        """
+        if not self.terms:
+            return []
+
+        candidates = []
+        for start, index in self._automaton.iter_matches(self._fold(text)):
+            end = start + len(self.terms[index])
+            term = self.terms[index]
+            if _is_word_char(term[0]) and start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if _is_word_char(term[-1]) and end < len(text) and _is_word_char(text[end]):
+                continue
+            candidates.append((start, -end, index))
+
+        matches = []
+        last_end = 0
+        for start, negative_end, index in sorted(candidates):
+            if start < last_end:
+                continue
+            matches.append(GlossaryMatch(start, -negative_end, self.terms[index], self.translations[index]))
+            last_end = -negative_end
+        return matches
+
+    def relevant_terms(self, texts: List[str]) -> Dict[str, str]:
+        """
+        텍스트들에 나온 용어와 지정 번역을 반환합니다 (프롬프트 주입용).
+
+        Parameters
+        ----------
+        texts : List[str]
+            원문 목록
+
+        Returns
+        -------
+        Dict[str, str]
+            용어집에 등록된 용어 -> 지정 번역
+        """
+        return {match.term: match.translation for text in texts for match in self.find(text)}
+
+    def protect(self, text: str) -> Tuple[str, List[str]]:
+        """
+        용어를 자리 표시자로 바꿉니다.
+
+        Parameters
+        ----------
+        text : str
+            원문
+
+        Returns
+        -------
+        Tuple[str, List[str]]
+            (자리 표시자로 바꾼 텍스트, 자리 표시자 순서의 지정 번역 목록)
+        """
+        matches = self.find(text)
+        if not matches:
+            return text, []
+
+        parts = []
+        last_end = 0
+        for index, match in enumerate(matches):
+            parts.append(text[last_end:match.start])
+            parts.append(placeholder(index))
+            last_end = match.end
+        parts.append(text[last_end:])
+        return "".join(parts), [match.translation for match in matches]
+
+
+def restore_terms(translated_text: str, replacements: List[str]) -> str:
+    """
+    번역 결과의 자리 표시자를 지정 번역으로 되돌립니다.
+
+    Parameters
+    ----------
+    translated_text : str
+        자리 표시자가 포함된 번역 결과
+    replacements : List[str]
+        Glossary.protect가 반환한 지정 번역 목록
+
+    Returns
+    -------
+    str
+        용어가 지정 번역으로 바뀐 번역 결과
+    """
+    if not replacements:
+        return translated_text
+
+    restored = set()
+
+    def replace(match: "re.Match[str]") -> str:
+        index = int(match.group(1))
+        if index >= len(replacements):
+            return match.group(0)
+        restored.add(index)
+        return replacements[index]
+
+    result = _PLACEHOLDER_PATTERN.sub(replace, translated_text)
+    if len(restored) < len(replacements):
+        print(f"[WARNING] 용어집 자리 표시자 {len(replacements) - len(restored)}개가 번역 결과에서 사라졌습니다.")
+    return result
+
+
+_glossaries: Optional[Dict[str, Glossary]] = None
+_glossaries_lock = threading.Lock()
+
+
+def _load_glossaries() -> Dict[str, Glossary]:
+    """glossary 설정의 YAML 파일에서 언어 쌍별 용어집을 읽습니다."""
+    config = get_section("glossary")
+    if not config.get("enabled", True):
+        return {}
+
+    path = _PROJECT_ROOT / config.get("path", "configs/glossary.yaml")
+    if not path.exists():
+        return {}
+
+    with open(path, encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+
+    case_sensitive = bool(config.get("case_sensitive", False))
+    glossaries = {
+        str(pair).strip().lower(): Glossary({str(term): str(value) for term, value in entries.items()}, case_sensitive)
+        for pair, entries in data.items()
+        if entries
+    }
+    total = sum(len(glossary) for glossary in glossaries.values())
+    print(f"[OK] 용어집 로드 완료: {len(glossaries)}개 언어 쌍, {total}개 용어")
+    return glossaries
+
+
+def get_glossary(source_lang: str, target_lang: str) -> Optional[Glossary]:
+    """
+    언어 쌍의 용어집을 반환합니다 (첫 호출 시 파일에서 로드).
+
+    Parameters
+    ----------
+    source_lang : str
+        원본 언어 코드 (예: "en", "auto"면 용어집 없음)
+    target_lang : str
+        목표 언어 코드 (예: "ko")
+
+    Returns
+    -------
+    Optional[Glossary]
+        용어집 (없으면 None)
+    """
+    global _glossaries
+
+    if _glossaries is None:
+        with _glossaries_lock:
+            if _glossaries is None:
+                _glossaries = _load_glossaries()
+    return _glossaries.get(f"{source_lang}-{target_lang}".lower())
+
+
+def protect_terms(text: str, source_lang: str, target_lang: str) -> Tuple[str, List[str]]:
+    """용어집이 있으면 용어를 자리 표시자로 바꿉니다 (Google/DeepL 번역 전)."""
+    glossary = get_glossary(source_lang, target_lang)
+    if glossary is None:
+        return text, []
+    return glossary.protect(text)
+
+
+def glossary_terms(texts: List[str], source_lang: str, target_lang: str) -> Dict[str, str]:
+    """텍스트들에 나온 용어의 지정 번역을 반환합니다 (OpenAI 프롬프트용)."""
+    glossary = get_glossary(source_lang, target_lang)
+    if glossary is None:
+        return {}
+    return glossary.relevant_terms(texts)
+
+
+def format_glossary(terms: Dict[str, str]) -> str:
+    """지정 번역 목록을 시스템 프롬프트에 덧붙일 블록으로 만듭니다 (없으면 빈 문자열)."""
+    if not terms:
+        return ""
+    lines = "\n".join(f"- {term} => {translation}" for term, translation in terms.items())
+    return f"""
+
+Glossary (mandatory): translate these terms exactly as given, adjusting only surrounding grammar.
+{lines}"""
@@ -2,18 +2,111 @@
 Google Translate를 사용한 번역 모듈 (deep-translator 사용)
 """
 
+import asyncio
+import importlib.util
+import os
+import threading
+from typing import Dict, List, Tuple
+
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from ..metrics import record_google_usage
+from .glossary import protect_terms, restore_terms
+from .http_clients import get_http_session
+from .resilience import call_provider
 
-try:
-    from deep_translator import GoogleTranslator
-    GOOGLE_AVAILABLE = True
-    print("[OK] Google Translate 모듈 로드 성공 (deep-translator)")
-except ImportError:
-    GOOGLE_AVAILABLE = False
+# deep-translator 설치 여부 (import는 BeautifulSoup 등을 함께 불러오므로 첫 사용 시 수행)
+GOOGLE_AVAILABLE = importlib.util.find_spec("deep_translator") is not None
+if not GOOGLE_AVAILABLE:
     print("[WARNING] deep-translator가 설치되지 않았습니다.")
     print("[INFO] 설치: rye add deep-translator")
 
 
+# 스레드별 (원본 언어, 목표 언어) -> GoogleTranslator
+# (translate가 인스턴스의 요청 파라미터를 고쳐 쓰므로 스레드 간에는 공유하지 않음)
+_translators = threading.local()
+
+
+class _SessionRequests:
+    """deep-translator가 호출하는 requests.get을 공용 세션(keep-alive 연결 풀)으로 보냅니다."""
+
+    @staticmethod
+    def get(*args, **kwargs):
+        return get_http_session().get(*args, **kwargs)
+
+
+_session_patched = False
+
+
+def _use_shared_session() -> None:
+    """
+    deep-translator가 요청마다 호출하는 requests.get을 공용 세션으로 보냅니다 (최초 1회).
+
+    deep-translator에 세션을 넘기는 공개 인자가 없어 deep_translator.google 모듈의 requests 참조를
+    바꾸므로, pyproject에서 검증한 버전 범위(1.11.x)로 고정하고 구조가 다르면 그대로 둡니다.
+    """
+    global _session_patched
+    if _session_patched:
+        return
+    _session_patched = True
+
+    import deep_translator.google
+
+    module_requests = getattr(deep_translator.google, "requests", None)
+    if not callable(getattr(module_requests, "get", None)):
+        print("[WARNING] deep-translator 구조가 달라 공용 세션 대신 requests.get을 사용합니다 (연결 풀/DNS 캐시 미적용).")
+        return
+    deep_translator.google.requests = _SessionRequests
+
+
+def _get_translator(source_lang: str, target_lang: str):
+    """
+    언어 쌍의 GoogleTranslator를 반환합니다 (스레드풀 스레드별로 재사용).
+    
+    첫 호출 시 deep-translator를 import하고, 모듈이 요청마다 새 연결을 여는
+    requests.get 대신 공용 requests.Session을 사용하도록 합니다.
+    """
+    cache: Dict[Tuple[str, str], object] = getattr(_translators, "cache", None)
+    if cache is None:
+        cache = _translators.cache = {}
+    
+    translator = cache.get((source_lang, target_lang))
+    if translator is None:
+        from deep_translator import GoogleTranslator
+        
+        _use_shared_session()
+        translator = GoogleTranslator(source=source_lang, target=target_lang)
+        # GOOGLE_TRANSLATE_URL로 다른 서버(벤치마크용 스텁 등)를 지정할 수 있음
+        if os.getenv("GOOGLE_TRANSLATE_URL"):
+            translator._base_url = os.getenv("GOOGLE_TRANSLATE_URL")
+        cache[(source_lang, target_lang)] = translator
+    return translator
+
+
+def _translate_in_thread(text: str, source_lang: str, target_lang: str) -> str:
+    """스레드풀에서 실행: 현재 스레드의 GoogleTranslator로 번역합니다."""
+    return _get_translator(source_lang, target_lang).translate(text)
+
+
+def google_client_ready() -> bool:
+    """
+    Google Translate를 사용할 수 있는지 반환합니다.
+    
+    deep-translator는 API 키가 없으므로 모듈 로드 여부만 확인하며,
+    연결은 공용 requests.Session의 연결 풀에서 재사용합니다.
+    """
+    return GOOGLE_AVAILABLE
+
+
+def is_transient_google_error(e: Exception) -> bool:
+    """재시도할 Google 일시적 오류(연결 실패, 429, 요청 실패)인지 판단합니다."""
+    from deep_translator.exceptions import RequestError, TooManyRequests
+    from requests import RequestException
+    
+    return isinstance(e, (RequestException, TooManyRequests, RequestError))
+
+
 async def translate_with_google(
     text: str,
     source_lang: str,
@@ -22,6 +115,10 @@ async def translate_with_google(
     """
     Google Translate를 사용하여 텍스트를 번역합니다.
     
+    deep-translator는 동기 HTTP 호출을 사용하므로 스레드풀에서 실행하여
+    이벤트 루프를 블로킹하지 않습니다. 용어집 용어는 자리 표시자로 바꿔 보낸 뒤
+    지정 번역으로 되돌립니다.
+    
     Parameters
     ----------
     text : str
@@ -47,17 +144,76 @@ async def translate_with_google(
             detail="Google Translate가 설치되지 않았습니다. deep-translator 패키지를 설치하세요.",
         )
     
+    from deep_translator.exceptions import TooManyRequests
+    
     try:
-        # deep-translator의 GoogleTranslator 사용
-        translator = GoogleTranslator(
-            source=source_lang if source_lang != "auto" else "auto",
-            target=target_lang,
+        # deep-translator의 GoogleTranslator 사용 (스레드별로 재사용)
+        protected_text, replacements = protect_terms(text, source_lang, target_lang)
+        result = await call_provider(
+            "google",
+            lambda: run_in_threadpool(_translate_in_thread, protected_text, source_lang, target_lang),
+            is_transient_google_error,
+            units=len(protected_text),
         )
-        result = translator.translate(text)
-        return result
+        record_google_usage(len(protected_text))
+        return restore_terms(result, replacements)
     
+    except HTTPException:
+        raise
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail="Google 번역 응답 시간이 초과되었습니다.",
+        )
+    except TooManyRequests as e:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Google 요청 한도를 초과했습니다: {str(e)}",
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Google 번역 실패: {str(e)}",
         )
+
+
+async def translate_batch_with_google(
+    texts: List[str],
+    source_lang: str,
+    target_lang: str,
+    concurrency: int = 8,
+) -> List[str]:
+    """
+    Google Translate로 여러 텍스트를 번역합니다.
+    
+    deep-translator는 배치 API가 없으므로 동시 요청 수를 제한한 채
+    단건 번역을 병렬로 실행합니다.
+    
+    Parameters
+    ----------
+    texts : List[str]
+        번역할 텍스트 목록
+    source_lang : str
+        원본 언어 코드 (예: "en", "auto"면 자동 감지)
+    target_lang : str
+        목표 언어 코드 (예: "ko")
+    concurrency : int
+        동시에 보낼 최대 요청 수
+    
+    Returns
+    -------
+    List[str]
+        입력 순서와 동일한 번역 결과 목록
+    
+    Raises
+    ------
+    HTTPException
+        번역 실패 시
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def translate_one(text: str) -> str:
+        async with semaphore:
+            return await translate_with_google(text, source_lang, target_lang)
+    
+    return await asyncio.gather(*(translate_one(text) for text in texts))
@@ -0,0 +1,342 @@
+"""
+provider 공용 HTTP 클라이언트
+
+모든 provider가 연결 풀을 공유하는 HTTP 클라이언트 한 벌을 사용합니다.
+
+- OpenAI: httpx.AsyncClient (h2 패키지가 있으면 HTTP/2)
+- DeepL, Google: requests.Session (스레드풀에서 호출, 호스트별 keep-alive 연결 풀)
+
+연결 풀 크기와 keep-alive 유지 시간은 configs/config.yaml의 http 섹션에서 읽습니다.
+클라이언트는 첫 사용 시 만들고 서버 종료 시(lifespan) close_http_clients로 닫으며,
+닫을 때 등록된 콜백으로 클라이언트를 참조하던 SDK 객체도 다시 만들도록 합니다.
+provider 호스트의 DNS 조회 결과는 TTL 동안 메모리에 보관해 새 연결마다 조회하지 않습니다.
+DNS 캐시는 공용 클라이언트의 transport(httpx)와 어댑터(requests)에서만 사용하므로
+같은 프로세스의 다른 라이브러리의 이름 조회에는 영향을 주지 않습니다.
+"""
+
+import asyncio
+import importlib.util
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ..settings import get_section
+
+# HTTP/2 지원 여부 (httpx[http2]가 설치한 h2 패키지 필요)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_http_config = get_section("http")
+MAX_CONNECTIONS = int(_http_config.get("max_connections", 100))
+MAX_KEEPALIVE_CONNECTIONS = int(_http_config.get("max_keepalive_connections", 20))
+KEEPALIVE_EXPIRY = float(_http_config.get("keepalive_expiry", 30))
+CONNECT_TIMEOUT = float(_http_config.get("connect_timeout", 5))
+# requests 세션의 읽기 제한 시간 (호출별 제한 시간 api.timeout과 같음)
+READ_TIMEOUT = float(get_section("api").get("timeout", 60))
+HTTP2_ENABLED = bool(_http_config.get("http2", True)) and HTTP2_AVAILABLE
+DNS_CACHE_TTL = float(_http_config.get("dns_cache_ttl", 300))
+DNS_CACHE_HOSTS = list(
+    _http_config.get("dns_cache_hosts")
+    or ["api.openai.com", "api.deepl.com", "api-free.deepl.com", "translate.google.com"]
+)
+
+
+class DnsCache:
+    """
+    지정한 호스트의 이름 조회 결과(IP 주소)를 TTL 동안 보관합니다.
+
+    공용 클라이언트가 요청을 보내기 전에 resolve/aresolve로 주소를 얻어 그 주소로 연결하며,
+    TLS 인증서 확인과 SNI, Host 헤더에는 원래 호스트 이름을 그대로 사용합니다.
+    지정하지 않은 호스트는 None을 반환해 클라이언트가 평소대로 조회하게 하며, 실패한 조회는 보관하지 않습니다.
+
+    Parameters
+    ----------
+    ttl : float
+        조회 결과 보관 시간(초, 0이면 끔)
+    hosts : List[str]
+        캐시할 호스트 이름 목록
+    """
+
+    def __init__(self, ttl: float, hosts: List[str]):
+        self.ttl = ttl
+        self.hosts = set(hosts)
+        self._entries: Dict[Tuple[str, int], Tuple[float, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, host: Optional[str], port: int) -> Tuple[bool, Optional[str]]:
+        """(조회가 필요한지, 보관 중인 주소)를 반환합니다."""
+        if self.ttl <= 0 or host not in self.hosts:
+            return False, None
+        entry = self._entries.get((host, port))
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return False, entry[1]
+        return True, None
+
+    def _store(self, host: str, port: int, infos: list) -> str:
+        address = infos[0][4][0]
+        self._entries[(host, port)] = (time.monotonic() + self.ttl, address)
+        self.misses += 1
+        return address
+
+    def resolve(self, host: Optional[str], port: int) -> Optional[str]:
+        """캐시 대상 호스트의 IP 주소를 반환합니다 (대상이 아니면 None, 블로킹 조회)."""
+        needed, address = self._cached(host, port)
+        if not needed:
+            return address
+        return self._store(host, port, socket.getaddrinfo(host, port, type=socket.SOCK_STREAM))
+
+    async def aresolve(self, host: Optional[str], port: int) -> Optional[str]:
+        """resolve의 비동기 버전 (이벤트 루프의 getaddrinfo 사용)."""
+        needed, address = self._cached(host, port)
+        if not needed:
+            return address
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        return self._store(host, port, infos)
+
+    def clear(self) -> None:
+        """보관한 결과를 비웁니다."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.ttl > 0,
+            "ttl_seconds": self.ttl,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def _url_host(address: str) -> str:
+    """URL에 넣을 호스트 표기 (IPv6 주소는 대괄호로 감쌈)"""
+    return f"[{address}]" if ":" in address else address
+
+
+class HttpClients:
+    """
+    provider 공용 HTTP 클라이언트 묶음
+
+    Parameters
+    ----------
+    max_connections : int
+        httpx 클라이언트의 최대 동시 연결 수
+    max_keepalive_connections : int
+        유지할 유휴 연결 수 (requests는 호스트별 연결 풀 크기)
+    keepalive_expiry : float
+        유휴 연결 유지 시간(초, httpx)
+    connect_timeout : float
+        연결 제한 시간(초)
+    read_timeout : float
+        읽기 제한 시간(초, requests)
+    http2 : bool
+        httpx 클라이언트의 HTTP/2 사용 여부
+    dns_cache : DnsCache, optional
+        provider 호스트 이름 조회에 사용할 DNS 캐시 (None이면 매번 조회)
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30,
+        connect_timeout: float = 5,
+        read_timeout: float = 60,
+        http2: bool = False,
+        dns_cache: Optional[DnsCache] = None,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.http2 = http2
+        self.dns_cache = dns_cache
+
+        self._async_client = None
+        self._session = None
+        self._lock = threading.Lock()
+        self._close_callbacks: List[Callable[[], None]] = []
+
+    def async_client(self):
+        """
+        공용 httpx.AsyncClient를 반환합니다 (첫 호출 시 생성).
+
+        요청별 타임아웃은 SDK와 resilience 계층이 지정하므로 여기서는 연결 제한 시간만 정합니다.
+        DNS 캐시 대상 호스트는 transport에서 캐시한 주소로 연결하고 SNI(sni_hostname 확장)와
+        Host 헤더에는 원래 호스트 이름을 사용합니다.
+        """
+        if self._async_client is None:
+            with self._lock:
+                if self._async_client is None:
+                    import httpx
+
+                    dns_cache = self.dns_cache
+                    transport = httpx.AsyncHTTPTransport(
+                        http2=self.http2,
+                        limits=httpx.Limits(
+                            max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_keepalive_connections,
+                            keepalive_expiry=self.keepalive_expiry,
+                        ),
+                    )
+
+                    class DnsCachingTransport(httpx.AsyncBaseTransport):
+                        async def handle_async_request(self, request):
+                            url = request.url
+                            address = await dns_cache.aresolve(
+                                url.host, url.port or (443 if url.scheme == "https" else 80)
+                            )
+                            if address is None:
+                                return await transport.handle_async_request(request)
+                            resolved = httpx.Request(
+                                request.method,
+                                url.copy_with(host=address),
+                                headers=request.headers,
+                                stream=request.stream,
+                                extensions={**request.extensions, "sni_hostname": url.host},
+                            )
+                            response = await transport.handle_async_request(resolved)
+                            response.request = request
+                            return response
+
+                        async def aclose(self) -> None:
+                            await transport.aclose()
+
+                    self._async_client = httpx.AsyncClient(
+                        transport=DnsCachingTransport() if dns_cache else transport,
+                        timeout=httpx.Timeout(None, connect=self.connect_timeout),
+                        follow_redirects=True,
+                    )
+        return self._async_client
+
+    def session(self):
+        """
+        공용 requests.Session을 반환합니다 (첫 호출 시 생성).
+
+        재시도는 resilience 계층에서 처리하므로 어댑터 자체 재시도는 끕니다.
+        스레드풀에서 실행되는 요청은 취소해도 스레드가 계속 돌기 때문에, 제한 시간을 지정하지 않은
+        요청(deep-translator 등)에는 연결/읽기 제한 시간을 적용해 스레드가 반드시 끝나도록 합니다.
+        DNS 캐시 대상 호스트(프록시를 거치지 않는 요청)는 어댑터에서 캐시한 주소로 연결하고
+        Host 헤더, SNI, 인증서 확인에는 원래 호스트 이름을 사용합니다.
+        """
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    from requests.utils import select_proxy
+
+                    dns_cache = self.dns_cache
+                    default_timeout = (self.connect_timeout, self.read_timeout)
+
+                    class ProviderHTTPAdapter(HTTPAdapter):
+                        def send(self, request, timeout=None, proxies=None, **kwargs):
+                            timeout = timeout or default_timeout
+                            url = urlsplit(request.url)
+                            address = None
+                            if dns_cache and not select_proxy(request.url, proxies):
+                                address = dns_cache.resolve(
+                                    url.hostname, url.port or (443 if url.scheme == "https" else 80)
+                                )
+                            if address is None:
+                                return super().send(request, timeout=timeout, proxies=proxies, **kwargs)
+
+                            resolved = request.copy()
+                            netloc = _url_host(address) + (f":{url.port}" if url.port else "")
+                            resolved.url = url._replace(netloc=netloc).geturl()
+                            resolved.headers["Host"] = url.netloc.rpartition("@")[2]
+                            resolved.sni_hostname = url.hostname
+                            response = super().send(resolved, timeout=timeout, proxies=proxies, **kwargs)
+                            response.request = request
+                            response.url = request.url
+                            return response
+
+                        def build_connection_pool_key_attributes(self, request, verify, cert=None):
+                            host_params, pool_kwargs = super().build_connection_pool_key_attributes(
+                                request, verify, cert
+                            )
+                            hostname = getattr(request, "sni_hostname", None)
+                            if hostname and host_params["scheme"] == "https":
+                                # IP 주소로 연결해도 SNI와 인증서 확인은 원래 호스트 이름 기준
+                                pool_kwargs["server_hostname"] = hostname
+                                pool_kwargs["assert_hostname"] = hostname
+                            return host_params, pool_kwargs
+
+                    session = requests.Session()
+                    adapter = ProviderHTTPAdapter(
+                        pool_maxsize=self.max_keepalive_connections,
+                        max_retries=0,
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def on_close(self, callback: Callable[[], None]) -> None:
+        """클라이언트를 닫을 때 호출할 콜백을 등록합니다 (클라이언트를 참조하는 SDK 객체 초기화용)."""
+        self._close_callbacks.append(callback)
+
+    async def aclose(self) -> None:
+        """클라이언트를 닫습니다 (다음 사용 시 새로 생성)."""
+        with self._lock:
+            async_client, self._async_client = self._async_client, None
+            session, self._session = self._session, None
+        for callback in self._close_callbacks:
+            callback()
+        if async_client is not None:
+            await async_client.aclose()
+        if session is not None:
+            session.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "keepalive_expiry": self.keepalive_expiry,
+            "read_timeout": self.read_timeout,
+            "async_client_open": self._async_client is not None,
+            "session_open": self._session is not None,
+        }
+
+
+dns_cache = DnsCache(DNS_CACHE_TTL, DNS_CACHE_HOSTS)
+http_clients = HttpClients(
+    max_connections=MAX_CONNECTIONS,
+    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=KEEPALIVE_EXPIRY,
+    connect_timeout=CONNECT_TIMEOUT,
+    read_timeout=READ_TIMEOUT,
+    http2=HTTP2_ENABLED,
+    dns_cache=dns_cache if DNS_CACHE_TTL > 0 else None,
+)
+
+
+def get_async_http_client():
+    """provider 공용 httpx.AsyncClient를 반환합니다."""
+    return http_clients.async_client()
+
+
+def get_http_session():
+    """provider 공용 requests.Session을 반환합니다."""
+    return http_clients.session()
+
+
+def open_http_clients() -> None:
+    """공용 클라이언트 설정을 확인합니다 (lifespan 시작 시 호출, 클라이언트는 첫 사용 시 생성)."""
+    if _http_config.get("http2", True) and not HTTP2_AVAILABLE:
+        print("[INFO] h2 패키지가 없어 HTTP/1.1 keep-alive로 연결합니다 (HTTP/2: rye add 'httpx[http2]')")
+
+
+async def close_http_clients() -> None:
+    """공용 클라이언트를 닫고 DNS 캐시를 비웁니다 (lifespan 종료 시 호출)."""
+    await http_clients.aclose()
+    dns_cache.clear()
+
+
+def http_client_stats() -> Dict[str, Any]:
+    """공용 클라이언트 설정과 DNS 캐시 통계를 반환합니다."""
+    return {**http_clients.stats(), "dns_cache": dns_cache.stats()}
@@ -2,36 +2,140 @@
 OpenAI API를 사용한 번역 모듈
 """
 
+import asyncio
+import json
 import os
-from openai import OpenAI
+import threading
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
 from fastapi import HTTPException
-from dotenv import load_dotenv
+from fastapi.concurrency import run_in_threadpool
 
-load_dotenv()
+from ..metrics import record_openai_usage
+from ..markup import format_markup_instruction
+from ..tokens import count_tokens, max_source_tokens, plan_output_tokens
+from .glossary import format_glossary, glossary_terms
+from .http_clients import get_async_http_client, http_clients
+from .resilience import call_provider
+from .scheduler import get_scheduler
 
-# OpenAI 클라이언트 초기화
-openai_api_key = os.getenv("OPENAI_API_KEY")
+# OpenAI 비동기 클라이언트 (SDK import 비용이 커서 첫 사용 시 생성)
+_openai_client = None
+_openai_client_loaded = False
+_openai_client_lock = threading.Lock()
 
-if openai_api_key:
-    try:
-        openai_client = OpenAI(api_key=openai_api_key)
-        print("[OK] OpenAI 클라이언트 초기화 성공")
-        print(f"[INFO] API 키: {openai_api_key[:8]}...")
-    except Exception as e:
-        print(f"[ERROR] OpenAI 클라이언트 초기화 실패: {e}")
-        openai_client = None
-else:
-    print("[WARNING] OPENAI_API_KEY가 설정되지 않았습니다.")
-    openai_client = None
+
+def get_openai_client():
+    """
+    OpenAI 비동기 클라이언트를 반환합니다.
+    
+    첫 호출 시 openai SDK를 import하고 공용 httpx 클라이언트(연결 풀, keep-alive)로 클라이언트를 생성합니다.
+    
+    Returns
+    -------
+    Optional[AsyncOpenAI]
+        클라이언트 (OPENAI_API_KEY가 없거나 생성에 실패하면 None)
+    """
+    global _openai_client, _openai_client_loaded
+    
+    if _openai_client_loaded:
+        return _openai_client
+    
+    with _openai_client_lock:
+        if _openai_client_loaded:
+            return _openai_client
+        
+        openai_api_key = os.getenv("OPENAI_API_KEY")
+        if openai_api_key:
+            try:
+                from openai import AsyncOpenAI
+                
+                # 타임아웃/재시도는 resilience 계층에서 처리하므로 SDK 자체 재시도는 끔
+                _openai_client = AsyncOpenAI(
+                    api_key=openai_api_key, max_retries=0, http_client=get_async_http_client()
+                )
+                print("[OK] OpenAI 클라이언트 초기화 성공")
+                print(f"[INFO] API 키: {openai_api_key[:8]}...")
+            except Exception as e:
+                print(f"[ERROR] OpenAI 클라이언트 초기화 실패: {e}")
+        else:
+            print("[WARNING] OPENAI_API_KEY가 설정되지 않았습니다.")
+        
+        _openai_client_loaded = True
+    
+    return _openai_client
+
+
+def _reset_openai_client() -> None:
+    """공용 HTTP 클라이언트가 닫히면 다음 사용 시 클라이언트를 다시 생성하도록 합니다."""
+    global _openai_client, _openai_client_loaded
+    
+    with _openai_client_lock:
+        _openai_client = None
+        _openai_client_loaded = False
 
 
-def translate_with_openai(
+http_clients.on_close(_reset_openai_client)
+
+
+def require_openai_client():
+    """
+    OpenAI 클라이언트를 반환하고, 없으면 HTTPException을 발생시킵니다.
+    
+    Raises
+    ------
+    HTTPException
+        클라이언트가 초기화되지 않은 경우 (500)
+    """
+    openai_client = get_openai_client()
+    if not openai_client:
+        raise HTTPException(
+            status_code=500,
+            detail="OpenAI 클라이언트가 초기화되지 않았습니다. OPENAI_API_KEY를 확인하세요.",
+        )
+    return openai_client
+
+
+def format_reference(reference: Optional[Tuple[str, str]]) -> str:
+    """번역 메모리의 유사 문장 번역을 프롬프트에 덧붙일 참고 블록으로 만듭니다 (없으면 빈 문자열)."""
+    if not reference:
+        return ""
+    source_text, translated_text = reference
+    return f"""
+
+A very similar text was translated before (translation memory). Reuse its wording and terminology where it still applies, and change only what differs.
+Previous source: {source_text}
+Previous translation: {translated_text}"""
+
+
+def build_translation_messages(
+    text: str,
+    source_name: str,
+    target_name: str,
+    reference: Optional[Tuple[str, str]] = None,
+    terms: Optional[Dict[str, str]] = None,
+) -> List[Dict[str, str]]:
+    """단건 번역용 chat 메시지(시스템 + 사용자 프롬프트)를 생성합니다."""
+    # 번역 프롬프트 생성 (용어집 지정 번역, 번역 메모리 참고 번역이 있으면 시스템 프롬프트에 추가)
+    system_prompt = f"""You are a professional translator. Translate the given text from {source_name} to {target_name}.
+Provide ONLY the translated text without any explanations or additional comments.""" + format_glossary(terms) + format_reference(reference)
+    
+    user_message = f"Translate this text to {target_name}:\n\n{text}"
+    
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_message},
+    ]
+
+
+async def translate_with_openai(
     text: str,
     source_lang: str,
     target_lang: str,
     model: str,
     source_name: str,
     target_name: str,
+    reference: Optional[Tuple[str, str]] = None,
 ) -> str:
     """
     OpenAI API를 사용하여 텍스트를 번역합니다.
@@ -50,6 +154,8 @@ def translate_with_openai(
         원본 언어 이름 (예: "English")
     target_name : str
         목표 언어 이름 (예: "Korean")
+    reference : Optional[Tuple[str, str]]
+        번역 메모리에서 찾은 유사 문장의 (원문, 번역). 주어지면 프롬프트에 참고로 전달
     
     Returns
     -------
@@ -61,49 +167,415 @@ def translate_with_openai(
     HTTPException
         번역 실패 시
     """
+    openai_client = require_openai_client()
+    terms = glossary_terms([text], source_lang, target_lang)
+    messages = build_translation_messages(text, source_name, target_name, reference, terms)
+    # 출력 토큰 상한은 입력 길이와 목표 언어로 정함 (짧은 입력은 예산을 덜 예약)
+    max_tokens = plan_output_tokens(model, count_tokens(text, model), target_lang)
+    
+    try:
+        # 분당 토큰 예산은 OpenAI와 같이 입력 토큰 + max_tokens로 계산
+        response = await call_provider(
+            "openai",
+            lambda: openai_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=0.3,  # 번역은 창의성이 덜 필요
+                max_tokens=max_tokens,
+            ),
+            is_transient_openai_error,
+            units=count_tokens(messages[0]["content"] + messages[1]["content"], model) + max_tokens,
+        )
+        record_openai_usage(model, response.usage, len(text))
+        
+        if response.choices[0].finish_reason == "length":
+            print(f"[WARNING] OpenAI 출력이 max_tokens에서 잘렸습니다 (model={model})")
+        
+        translated_text = response.choices[0].message.content.strip()
+        return translated_text
+    
+    except Exception as e:
+        _raise_openai_error(e, model)
+
+
+async def stream_with_openai(
+    text: str,
+    model: str,
+    source_name: str,
+    target_name: str,
+    source_lang: Optional[str] = None,
+    target_lang: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """
+    OpenAI 스트리밍(stream=True)으로 번역 결과를 생성되는 대로 반환합니다.
+    
+    Parameters
+    ----------
+    text : str
+        번역할 텍스트
+    model : str
+        사용할 OpenAI 모델 ID (예: "gpt-4o-mini")
+    source_name : str
+        원본 언어 이름 (예: "English")
+    target_name : str
+        목표 언어 이름 (예: "Korean")
+    source_lang : Optional[str]
+        원본 언어 코드 (주어지면 언어 쌍의 용어집 적용)
+    target_lang : Optional[str]
+        목표 언어 코드
+    
+    Yields
+    ------
+    str
+        번역 결과 조각 (토큰 단위)
+    
+    Raises
+    ------
+    HTTPException
+        번역 실패 시
+    """
+    openai_client = require_openai_client()
+    terms = glossary_terms([text], source_lang, target_lang) if source_lang and target_lang else None
+    messages = build_translation_messages(text, source_name, target_name, terms=terms)
+    max_tokens = plan_output_tokens(model, count_tokens(text, model), target_lang)
+    
+    try:
+        # 스트림을 소비하는 동안 슬롯을 유지하고, 스트림 생성까지만 재시도
+        units = count_tokens(messages[0]["content"] + messages[1]["content"], model) + max_tokens
+        async with get_scheduler("openai").slot(units=units):
+            stream = await call_provider(
+                "openai",
+                lambda: openai_client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=0.3,
+                    max_tokens=max_tokens,
+                    stream=True,
+                    # 마지막 청크로 토큰 사용량을 받음 (choices는 비어 있음)
+                    stream_options={"include_usage": True},
+                ),
+                is_transient_openai_error,
+            )
+            
+            async for chunk in stream:
+                if chunk.usage:
+                    record_openai_usage(model, chunk.usage, len(text))
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+    
+    except Exception as e:
+        _raise_openai_error(e, model)
+
+
+def openai_client_ready() -> bool:
+    """OpenAI 클라이언트가 초기화되었는지 반환합니다 (필요하면 생성)."""
+    return get_openai_client() is not None
+
+
+async def warm_up_openai() -> bool:
+    """
+    OpenAI 연결 풀과 TLS 세션을 미리 연결합니다 (모델 목록 조회 1회).
+    
+    Returns
+    -------
+    bool
+        연결했으면 True, 클라이언트가 초기화되지 않았으면 False
+    """
+    # SDK import가 이벤트 루프를 막지 않도록 스레드풀에서 클라이언트 생성
+    openai_client = await run_in_threadpool(get_openai_client)
     if not openai_client:
+        return False
+    await openai_client.models.list()
+    return True
+
+
+def is_transient_openai_error(e: Exception) -> bool:
+    """재시도할 OpenAI 일시적 오류(연결 실패, 시간 초과, 429, 5xx)인지 판단합니다."""
+    import openai
+    
+    return isinstance(
+        e,
+        (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError),
+    )
+
+
+def _raise_openai_error(e: Exception, model: str):
+    """OpenAI 예외를 에러 타입별 HTTPException으로 변환합니다."""
+    if isinstance(e, HTTPException):
+        raise e
+    if isinstance(e, asyncio.TimeoutError):
+        raise HTTPException(
+            status_code=504,
+            detail=f"OpenAI 응답 시간이 초과되었습니다: {model}",
+        )
+    
+    error_msg = str(e)
+    
+    # 에러 타입별 처리
+    if getattr(e, "status_code", None) == 429 or "rate limit" in error_msg.lower():
+        raise HTTPException(
+            status_code=429,
+            detail=f"OpenAI 요청 한도를 초과했습니다: {error_msg}",
+        )
+    elif "NOT_FOUND" in error_msg or "not found" in error_msg.lower():
+        raise HTTPException(
+            status_code=404,
+            detail=f"모델을 찾을 수 없습니다: {model}",
+        )
+    elif "api_key" in error_msg.lower() or "authentication" in error_msg.lower():
+        raise HTTPException(
+            status_code=401,
+            detail="OpenAI API 키가 유효하지 않습니다.",
+        )
+    else:
         raise HTTPException(
             status_code=500,
-            detail="OpenAI 클라이언트가 초기화되지 않았습니다. OPENAI_API_KEY를 확인하세요.",
+            detail=f"OpenAI 번역 실패: {error_msg}",
         )
+
+
+# 배치 번역 시 한 번의 chat completion에 담을 세그먼트 상한
+BATCH_MAX_SEGMENTS = 40
+BATCH_MAX_CHARS = 3000
+
+# JSON Schema 구조화 출력을 지원하는 모델 (나머지는 JSON 모드 사용)
+STRUCTURED_OUTPUT_MODELS = {"gpt-4o", "gpt-4o-mini"}
+
+_BATCH_SCHEMA = {
+    "name": "translations",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "translations": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "integer"},
+                        "text": {"type": "string"},
+                    },
+                    "required": ["id", "text"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["translations"],
+        "additionalProperties": False,
+    },
+}
+
+
+def group_segments(
+    texts: List[str],
+    max_segments: int = BATCH_MAX_SEGMENTS,
+    max_chars: int = BATCH_MAX_CHARS,
+    max_tokens: Optional[int] = None,
+    model: Optional[str] = None,
+) -> List[List[int]]:
+    """
+    세그먼트 인덱스를 요청 단위 그룹으로 나눕니다.
     
-    # 번역 프롬프트 생성
-    system_prompt = f"""You are a professional translator. Translate the given text from {source_name} to {target_name}.
-Provide ONLY the translated text without any explanations or additional comments."""
+    Parameters
+    ----------
+    texts : List[str]
+        세그먼트 목록
+    max_segments : int
+        그룹당 최대 세그먼트 수
+    max_chars : int
+        그룹당 최대 문자 수 (단일 세그먼트가 더 길면 단독 그룹)
+    max_tokens : Optional[int]
+        그룹당 최대 입력 토큰 수 (출력이 모델의 최대 출력 토큰을 넘지 않도록)
+    model : Optional[str]
+        토큰 수를 셀 모델 ID
     
-    user_message = f"Translate this text to {target_name}:\n\n{text}"
+    Returns
+    -------
+    List[List[int]]
+        입력 순서를 유지한 인덱스 그룹 목록
+    """
+    groups: List[List[int]] = []
+    current: List[int] = []
+    current_chars = 0
+    current_tokens = 0
+    
+    for index, text in enumerate(texts):
+        tokens = count_tokens(text, model) if max_tokens else 0
+        if current and (
+            len(current) >= max_segments
+            or current_chars + len(text) > max_chars
+            or (max_tokens and current_tokens + tokens > max_tokens)
+        ):
+            groups.append(current)
+            current, current_chars, current_tokens = [], 0, 0
+        current.append(index)
+        current_chars += len(text)
+        current_tokens += tokens
+    
+    if current:
+        groups.append(current)
+    return groups
+
+
+def parse_numbered_translations(content: str, count: int) -> List[Optional[str]]:
+    """
+    {"translations": [{"id": n, "text": ...}]} 형식의 응답을 파싱합니다.
+    
+    Parameters
+    ----------
+    content : str
+        모델 응답 JSON 문자열
+    count : int
+        요청한 세그먼트 수 (id는 1부터 count까지)
     
+    Returns
+    -------
+    List[Optional[str]]
+        id 순서의 번역 결과 (누락된 id는 None)
+    """
+    results: List[Optional[str]] = [None] * count
     try:
-        response = openai_client.chat.completions.create(
+        items = json.loads(content).get("translations", [])
+    except (json.JSONDecodeError, AttributeError):
+        return results
+    
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        seg_id, text = item.get("id"), item.get("text")
+        if isinstance(seg_id, int) and 1 <= seg_id <= count and isinstance(text, str):
+            results[seg_id - 1] = text.strip()
+    return results
+
+
+def batch_response_format(model: str) -> Dict[str, Any]:
+    """모델에 맞는 구조화 출력 response_format을 반환합니다."""
+    if model in STRUCTURED_OUTPUT_MODELS:
+        return {"type": "json_schema", "json_schema": _BATCH_SCHEMA}
+    return {"type": "json_object"}
+
+
+async def _translate_segment_group(
+    segments: List[str],
+    model: str,
+    source_name: str,
+    target_name: str,
+    terms: Optional[Dict[str, str]] = None,
+    target_lang: Optional[str] = None,
+) -> List[Optional[str]]:
+    """번호를 붙인 세그먼트 묶음을 한 번의 chat completion으로 번역합니다 (묶음에 나온 용어만 프롬프트에 포함)."""
+    system_prompt = f"""You are a professional translator. Translate each numbered segment from {source_name} to {target_name}.
+Translate every segment independently and keep its id.
+Respond with JSON only, in the form {{"translations": [{{"id": 1, "text": "..."}}]}}.""" + format_glossary(terms) + format_markup_instruction(segments)
+    
+    numbered = [{"id": i + 1, "text": text} for i, text in enumerate(segments)]
+    user_message = json.dumps({"segments": numbered}, ensure_ascii=False)
+    
+    max_tokens = plan_output_tokens(
+        model,
+        sum(count_tokens(segment, model) for segment in segments),
+        target_lang,
+        segments=len(segments),
+    )
+    
+    openai_client = require_openai_client()
+    response = await call_provider(
+        "openai",
+        lambda: openai_client.chat.completions.create(
             model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_message},
             ],
-            temperature=0.3,  # 번역은 창의성이 덜 필요
-            max_tokens=512,
-        )
-        
-        translated_text = response.choices[0].message.content.strip()
-        return translated_text
+            temperature=0.3,
+            max_tokens=max_tokens,
+            response_format=batch_response_format(model),
+        ),
+        is_transient_openai_error,
+        units=count_tokens(system_prompt + user_message, model) + max_tokens,
+    )
+    record_openai_usage(model, response.usage, sum(len(segment) for segment in segments))
     
-    except Exception as e:
-        error_msg = str(e)
-        
-        # 에러 타입별 처리
-        if "NOT_FOUND" in error_msg or "not found" in error_msg.lower():
-            raise HTTPException(
-                status_code=404,
-                detail=f"모델을 찾을 수 없습니다: {model}",
-            )
-        elif "api_key" in error_msg.lower() or "authentication" in error_msg.lower():
-            raise HTTPException(
-                status_code=401,
-                detail="OpenAI API 키가 유효하지 않습니다.",
-            )
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail=f"OpenAI 번역 실패: {error_msg}",
-            )
+    return parse_numbered_translations(response.choices[0].message.content, len(segments))
+
 
+async def translate_batch_with_openai(
+    texts: List[str],
+    source_lang: str,
+    target_lang: str,
+    model: str,
+    source_name: str,
+    target_name: str,
+) -> List[str]:
+    """
+    여러 텍스트를 번호 붙은 세그먼트로 묶어 적은 수의 요청으로 번역합니다.
+    
+    세그먼트를 BATCH_MAX_SEGMENTS / BATCH_MAX_CHARS / 최대 출력 토큰에 맞는 입력 토큰 단위로 묶어 그룹마다
+    한 번의 구조화 출력(JSON) chat completion을 호출하고, 그룹들은 동시에 요청합니다.
+    응답에서 누락된 세그먼트는 단건 번역으로 보충합니다.
+    
+    Parameters
+    ----------
+    texts : List[str]
+        번역할 텍스트 목록
+    source_lang : str
+        원본 언어 코드 (예: "en")
+    target_lang : str
+        목표 언어 코드 (예: "ko")
+    model : str
+        사용할 OpenAI 모델 ID (예: "gpt-4o-mini")
+    source_name : str
+        원본 언어 이름 (예: "English")
+    target_name : str
+        목표 언어 이름 (예: "Korean")
+    
+    Returns
+    -------
+    List[str]
+        입력 순서와 동일한 번역 결과 목록
+    
+    Raises
+    ------
+    HTTPException
+        번역 실패 시
+    """
+    require_openai_client()
+    
+    groups = group_segments(
+        texts,
+        max_tokens=max_source_tokens(model, target_lang, BATCH_MAX_SEGMENTS),
+        model=model,
+    )
+    
+    try:
+        group_results = await asyncio.gather(*(
+            _translate_segment_group(
+                [texts[i] for i in group],
+                model,
+                source_name,
+                target_name,
+                glossary_terms([texts[i] for i in group], source_lang, target_lang),
+                target_lang,
+            )
+            for group in groups
+        ))
+    except Exception as e:
+        _raise_openai_error(e, model)
+    
+    results: List[Optional[str]] = [None] * len(texts)
+    for group, translated in zip(groups, group_results):
+        for index, text in zip(group, translated):
+            results[index] = text
+    
+    # 구조화 출력에서 누락된 세그먼트는 단건 번역으로 보충
+    missing = [i for i, text in enumerate(results) if text is None]
+    if missing:
+        print(f"[WARNING] OpenAI 배치 응답에서 {len(missing)}개 세그먼트 누락, 단건 번역으로 보충")
+        retried = await asyncio.gather(*(
+            translate_with_openai(texts[i], source_lang, target_lang, model, source_name, target_name)
+            for i in missing
+        ))
+        for index, text in zip(missing, retried):
+            results[index] = text
+    
+    return results
@@ -3,11 +3,199 @@ Post-Editor 번역기: DeepL NMT + GPT-4o 후수정
 
 DeepL NMT로 초기 번역을 수행한 후, GPT-4o로 번역을 세밀하게 후수정하여
 최고 품질의 번역을 제공합니다.
+
+후수정 정책(post_editor 설정)에 따라 짧고 초안이 믿을 만한 텍스트는 후수정을 생략하고,
+중간 길이 텍스트는 가벼운 모델(gpt-4o-mini)로, 길거나 복잡한 텍스트만 GPT-4o로 후수정합니다.
 """
 
+import asyncio
+import json
+import re
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
 from fastapi import HTTPException
-from .deepl_translator import translate_with_deepl
-from .openai_translator import openai_client
+from ..markup import format_markup_instruction
+from ..metrics import POST_EDIT_DECISIONS, record_openai_usage
+from ..segmentation import estimate_tokens
+from ..tokens import count_tokens, max_source_tokens, plan_output_tokens
+from ..settings import get_section
+from .deepl_translator import translate_with_deepl, translate_batch_with_deepl
+from .glossary import format_glossary, glossary_terms
+from .resilience import call_provider
+from .scheduler import get_scheduler
+from .openai_translator import (
+    BATCH_MAX_SEGMENTS,
+    require_openai_client,
+    batch_response_format,
+    format_reference,
+    is_transient_openai_error,
+    group_segments,
+    parse_numbered_translations,
+)
+
+# 후수정 모델 (긴/복잡한 텍스트, 정책을 끈 경우)
+POST_EDIT_MODEL = "gpt-4o"
+
+# 중간 길이 텍스트용 후수정 모델 기본값
+LIGHT_POST_EDIT_MODEL = "gpt-4o-mini"
+
+# 문단 구분, 마크업/코드처럼 가벼운 모델에 맡기기 어려운 텍스트
+_COMPLEX_TEXT_PATTERN = re.compile(r"\n\s*\n|<[a-zA-Z/][^>]*>|```|\{[^}]*\}")
+_NUMBER_PATTERN = re.compile(r"\d+")
+
+
+# 후수정 모델 호출 1회의 실패가 아니라 provider를 쓸 수 없는 상태(서킷 열림 503, 대기열 429/503)
+# -> 초안으로 대체하지 않고 그대로 전달
+_UNAVAILABLE_STATUS_CODES = (429, 503)
+
+
+def is_provider_unavailable(e: BaseException) -> bool:
+    """서킷 브레이커/스케줄러가 거절한 오류인지 판단합니다 (초안 대체 대상이 아님)."""
+    return isinstance(e, HTTPException) and e.status_code in _UNAVAILABLE_STATUS_CODES
+
+
+class DraftFallback(str):
+    """
+    후수정에 실패해 대신 반환한 DeepL 초안
+
+    일반 문자열처럼 응답으로 반환되지만, 호출 측은 이 형식인지 확인해
+    캐시/번역 메모리에 후수정 결과로 저장하지 않습니다.
+    """
+
+# Post-editing 시스템 프롬프트
+POST_EDIT_SYSTEM_PROMPT = """You are an expert post-editor specializing in refining machine translations.
+
+<Goals>
+1) Review and improve machine-translated text while preserving the original meaning
+2) Ensure natural flow, cultural appropriateness, and linguistic accuracy
+3) Maintain consistency with the source text
+4) Produce polished, publication-ready translations
+</Goals>
+
+<Output Format>
+Provide only the improved translation text without any explanations, notes, or additional commentary.
+- Output must be in the target language only
+- Do not include source text or comparison comments
+- Focus on delivering the final, polished version
+</Output Format>
+
+<Format Explanations>
+Natural Flow: Ensure the translation reads smoothly and naturally in the target language
+Cultural Appropriateness: Adapt expressions, idioms, and references to be culturally relevant
+Linguistic Accuracy: Maintain grammatical correctness and proper terminology usage
+Consistency: Preserve the tone and style of the original text
+</Format Explanations>"""
+
+
+def draft_looks_reliable(text: str, draft: str) -> bool:
+    """
+    DeepL 초안을 후수정 없이 사용해도 될 만한지 간단히 확인합니다.
+
+    DeepL은 신뢰도 점수를 제공하지 않으므로 비어 있거나 원문과 같지 않은지,
+    숫자가 모두 보존되었는지, 원문 대비 길이 비율이 정상 범위인지로 판단합니다.
+
+    Parameters
+    ----------
+    text : str
+        원문
+    draft : str
+        DeepL 초안
+
+    Returns
+    -------
+    bool
+        초안이 믿을 만하면 True
+    """
+    if not draft.strip() or draft.strip() == text.strip():
+        return False
+    if sorted(_NUMBER_PATTERN.findall(text)) != sorted(_NUMBER_PATTERN.findall(draft)):
+        return False
+    ratio = len(draft) / max(1, len(text))
+    return 0.2 <= ratio <= 5
+
+
+def choose_post_edit_model(text: str, draft: str) -> Tuple[Optional[str], str]:
+    """
+    후수정 정책에 따라 후수정 모델을 고릅니다.
+
+    - 초안이 의심스러우면 full_model
+    - skip_max_tokens 이하의 짧은 텍스트는 후수정 생략
+    - 문단 구분/마크업이 있는 복잡한 텍스트는 full_model
+    - light_max_tokens 이하는 light_model, 그보다 길면 full_model
+
+    결정은 post_edit_decisions_total 메트릭과 로그로 남깁니다.
+
+    Parameters
+    ----------
+    text : str
+        원문
+    draft : str
+        DeepL 초안
+
+    Returns
+    -------
+    Tuple[Optional[str], str]
+        (후수정 모델 ID, 생략이면 None / 결정 이유)
+    """
+    config = get_section("post_editor")
+    full_model = config.get("full_model", POST_EDIT_MODEL)
+
+    if not config.get("adaptive", True):
+        model, reason = full_model, "adaptive_off"
+    elif not draft_looks_reliable(text, draft):
+        model, reason = full_model, "unreliable_draft"
+    else:
+        tokens = estimate_tokens(text)
+        if tokens <= int(config.get("skip_max_tokens", 12)):
+            model, reason = None, "short"
+        elif _COMPLEX_TEXT_PATTERN.search(text):
+            model, reason = full_model, "complex"
+        elif tokens <= int(config.get("light_max_tokens", 150)):
+            model, reason = config.get("light_model", LIGHT_POST_EDIT_MODEL), "mid_size"
+        else:
+            model, reason = full_model, "long"
+
+    POST_EDIT_DECISIONS.inc(model=model or "skip", reason=reason)
+    return model, reason
+
+
+def build_post_edit_messages(
+    text: str,
+    draft: str,
+    source_name: str,
+    target_name: str,
+    reference: Optional[Tuple[str, str]] = None,
+    terms: Optional[Dict[str, str]] = None,
+) -> List[Dict[str, str]]:
+    """단건 후수정용 chat 메시지(시스템 + 사용자 프롬프트)를 생성합니다 (용어집 지정 번역, 번역 메모리 참고 번역 포함 가능)."""
+    user_prompt = f"""Review and improve this machine translation.
+
+Source Language: {source_name}
+Target Language: {target_name}
+
+Original Text:
+{text}
+
+Machine Translation (DeepL NMT):
+{draft}
+
+Task: Carefully review the machine translation and improve it to make it more natural, accurate, and culturally appropriate. Fix any awkward phrasing, grammatical errors, or unnatural expressions. Output only the improved translation in {target_name}."""
+
+    return [
+        {"role": "system", "content": POST_EDIT_SYSTEM_PROMPT + format_glossary(terms) + format_reference(reference)},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+async def _deepl_draft(text: str, source_lang: str, target_lang: str) -> str:
+    """DeepL NMT로 초기 번역(초안)을 생성합니다."""
+    try:
+        return await translate_with_deepl(text, source_lang, target_lang)
+    except HTTPException as e:
+        # translate_with_deepl 내부에서 이미 적절한 에러를 발생시킴
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"DeepL 초기 번역 실패: {str(e)}")
 
 
 async def translate_with_post_editor(
@@ -16,6 +204,8 @@ async def translate_with_post_editor(
     target_lang: str,
     source_name: str,
     target_name: str,
+    draft: Optional[str] = None,
+    reference: Optional[Tuple[str, str]] = None,
 ) -> str:
     """
     DeepL NMT로 초기 번역 후 GPT-4o로 후수정합니다.
@@ -32,99 +222,319 @@ async def translate_with_post_editor(
         원본 언어 이름 (예: "English")
     target_name : str
         목표 언어 이름 (예: "Korean")
+    draft : Optional[str]
+        이미 있는 DeepL 번역 (캐시/번역 메모리). 주어지면 DeepL 호출을 생략
+    reference : Optional[Tuple[str, str]]
+        번역 메모리에서 찾은 유사 문장의 (원문, 번역). 주어지면 후수정 프롬프트에 참고로 전달
 
     Returns
     -------
     str
-        후수정된 번역 텍스트
+        후수정된 번역 텍스트 (후수정을 생략하면 DeepL 초안, 후수정에 실패하면 DraftFallback으로 감싼 초안)
 
     Raises
     ------
     HTTPException
-        번역 또는 후수정 실패 시
+        DeepL 번역 실패 시, 또는 후수정 provider가 서킷 열림/대기열 초과로 거절한 경우 (429/503)
 
     Notes
     -----
     이 번역기는 2단계 프로세스를 사용합니다:
     1. DeepL NMT로 자연스러운 초기 번역 생성
-    2. GPT-4o로 번역을 검토하고 세밀하게 개선
+    2. 후수정 정책(choose_post_edit_model)이 고른 모델로 번역을 검토하고 세밀하게 개선
     """
-    # Step 1: DeepL NMT로 초기 번역
-    try:
-        initial_translation = translate_with_deepl(text, source_lang, target_lang)
+    # Step 1: DeepL NMT로 초기 번역 (이미 있으면 재사용)
+    if draft is None:
+        initial_translation = await _deepl_draft(text, source_lang, target_lang)
         print(f"[Post-Editor] Step 1/2: DeepL 초기 번역 완료")
-        print(f"[Post-Editor] DeepL 결과: {initial_translation[:80]}...")
-    except HTTPException as e:
-        # translate_with_deepl 내부에서 이미 적절한 에러를 발생시킴
-        raise e
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DeepL 초기 번역 실패: {str(e)}")
+    else:
+        initial_translation = draft
+        print(f"[Post-Editor] Step 1/2: 캐시된 DeepL 번역 사용")
+    print(f"[Post-Editor] DeepL 결과: {initial_translation[:80]}...")
 
-    # Step 2: GPT-4o로 후수정
-    if not openai_client:
-        raise HTTPException(
-            status_code=500,
-            detail="OpenAI 클라이언트가 초기화되지 않았습니다.",
-        )
+    model, reason = choose_post_edit_model(text, initial_translation)
+    if model is None:
+        print(f"[Post-Editor] Step 2/2: 후수정 생략 ({reason})")
+        return initial_translation
+
+    # Step 2: 선택한 모델로 후수정
+    openai_client = require_openai_client()
 
     try:
-        # Post-editing 프롬프트
-        system_prompt = """You are an expert post-editor specializing in refining machine translations.
+        print(f"[Post-Editor] Step 2/2: {model} 후수정 시작 ({reason})...")
 
-<Goals>
-1) Review and improve machine-translated text while preserving the original meaning
-2) Ensure natural flow, cultural appropriateness, and linguistic accuracy
-3) Maintain consistency with the source text
-4) Produce polished, publication-ready translations
-</Goals>
+        messages = build_post_edit_messages(
+            text,
+            initial_translation,
+            source_name,
+            target_name,
+            reference,
+            glossary_terms([text], source_lang, target_lang),
+        )
+        # 후수정 결과는 초안과 같은 언어이므로 초안 토큰 수에 기본 배율 적용
+        max_tokens = plan_output_tokens(model, count_tokens(initial_translation, model))
+        units = count_tokens(messages[0]["content"] + messages[1]["content"], model) + max_tokens
+        response = await call_provider(
+            "openai",
+            lambda: openai_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=0.3,
+                max_tokens=max_tokens,
+            ),
+            is_transient_openai_error,
+            units=units,
+        )
+        record_openai_usage(model, response.usage, len(text))
 
-<Output Format>
-Provide only the improved translation text without any explanations, notes, or additional commentary.
-- Output must be in the target language only
-- Do not include source text or comparison comments
-- Focus on delivering the final, polished version
-</Output Format>
+        post_edited_text = response.choices[0].message.content.strip()
+        print(f"[Post-Editor] {model} 후수정 완료!")
+        print(f"[Post-Editor] 최종 결과: {post_edited_text[:80]}...")
 
-<Format Explanations>
-Natural Flow: Ensure the translation reads smoothly and naturally in the target language
-Cultural Appropriateness: Adapt expressions, idioms, and references to be culturally relevant
-Linguistic Accuracy: Maintain grammatical correctness and proper terminology usage
-Consistency: Preserve the tone and style of the original text
-</Format Explanations>"""
+        return post_edited_text
 
-        user_prompt = f"""Review and improve this machine translation.
+    except Exception as e:
+        if is_provider_unavailable(e):
+            raise
+        # 후수정 실패 시 DeepL 번역이라도 반환
+        print(f"[Post-Editor] WARNING: {model} 후수정 실패, DeepL 번역 반환")
+        print(f"[Post-Editor] 에러: {str(e)}")
+        return DraftFallback(initial_translation)
 
-Source Language: {source_name}
-Target Language: {target_name}
 
-Original Text:
-{text}
+async def _post_edit_segment_group(
+    sources: List[str],
+    drafts: List[str],
+    source_name: str,
+    target_name: str,
+    model: str = POST_EDIT_MODEL,
+    terms: Optional[Dict[str, str]] = None,
+) -> List[str]:
+    """원문/초안 쌍 묶음을 한 번의 후수정 모델 호출로 후수정합니다 (누락 시 DraftFallback으로 감싼 초안)."""
+    system_prompt = POST_EDIT_SYSTEM_PROMPT + """
 
-Machine Translation (DeepL NMT):
-{initial_translation}
+<Batch Mode>
+You will receive numbered segments, each with the original text and its machine translation.
+Post-edit every segment independently and keep its id.
+Respond with JSON only, in the form {"translations": [{"id": 1, "text": "..."}]}.
+</Batch Mode>""" + format_glossary(terms) + format_markup_instruction(sources)
 
-Task: Carefully review the machine translation and improve it to make it more natural, accurate, and culturally appropriate. Fix any awkward phrasing, grammatical errors, or unnatural expressions. Output only the improved translation in {target_name}."""
+    segments = [
+        {"id": i + 1, "original": source, "machine_translation": draft}
+        for i, (source, draft) in enumerate(zip(sources, drafts))
+    ]
+    user_prompt = f"""Source Language: {source_name}
+Target Language: {target_name}
 
-        print(f"[Post-Editor] Step 2/2: GPT-4o 후수정 시작...")
+{json.dumps({"segments": segments}, ensure_ascii=False)}"""
 
-        response = openai_client.chat.completions.create(
-            model="gpt-4o",  # GPT-4o 사용
+    max_tokens = plan_output_tokens(
+        model, sum(count_tokens(draft, model) for draft in drafts), segments=len(drafts)
+    )
+    units = count_tokens(system_prompt + user_prompt, model) + max_tokens
+    openai_client = require_openai_client()
+    response = await call_provider(
+        "openai",
+        lambda: openai_client.chat.completions.create(
+            model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
             temperature=0.3,
-            max_tokens=1024,
+            max_tokens=max_tokens,
+            response_format=batch_response_format(model),
+        ),
+        is_transient_openai_error,
+        units=units,
+    )
+    record_openai_usage(model, response.usage, sum(len(source) for source in sources))
+
+    edited = parse_numbered_translations(response.choices[0].message.content, len(drafts))
+    return [text if text else DraftFallback(draft) for text, draft in zip(edited, drafts)]
+
+
+async def translate_batch_with_post_editor(
+    texts: List[str],
+    source_lang: str,
+    target_lang: str,
+    source_name: str,
+    target_name: str,
+) -> List[str]:
+    """
+    여러 텍스트를 DeepL 배치 번역 후 배치 후수정합니다.
+
+    Parameters
+    ----------
+    texts : List[str]
+        번역할 텍스트 목록
+    source_lang : str
+        원본 언어 코드 (예: "en")
+    target_lang : str
+        목표 언어 코드 (예: "ko")
+    source_name : str
+        원본 언어 이름 (예: "English")
+    target_name : str
+        목표 언어 이름 (예: "Korean")
+
+    Returns
+    -------
+    List[str]
+        입력 순서와 동일한 후수정 번역 결과 목록
+
+    Notes
+    -----
+    텍스트마다 후수정 정책으로 모델을 고른 뒤 모델별로 묶어 후수정하며,
+    후수정을 생략한 텍스트는 DeepL 초안을, 호출이 실패한 그룹은 DraftFallback으로 감싼 초안을 반환합니다.
+    """
+    # Step 1: DeepL 배치 번역
+    drafts = await translate_batch_with_deepl(texts, source_lang, target_lang)
+    print(f"[Post-Editor] Step 1/2: DeepL 배치 초기 번역 완료 ({len(drafts)}건)")
+
+    # 모델별로 후수정할 텍스트 인덱스 분류 (None: 후수정 생략)
+    by_model: Dict[str, List[int]] = {}
+    for index, (text, draft) in enumerate(zip(texts, drafts)):
+        model, _ = choose_post_edit_model(text, draft)
+        if model is not None:
+            by_model.setdefault(model, []).append(index)
+
+    results = list(drafts)
+    if not by_model:
+        print(f"[Post-Editor] Step 2/2: 후수정 생략 ({len(texts)}건)")
+        return results
+
+    require_openai_client()
+
+    # Step 2: 모델별 그룹 단위 후수정
+    jobs: List[Tuple[str, List[int]]] = []
+    for model, indices in by_model.items():
+        group_drafts = [drafts[i] for i in indices]
+        max_tokens = max_source_tokens(model, segments=BATCH_MAX_SEGMENTS)
+        for group in group_segments(group_drafts, max_tokens=max_tokens, model=model):
+            jobs.append((model, [indices[i] for i in group]))
+
+    group_results = await asyncio.gather(
+        *(
+            _post_edit_segment_group(
+                [texts[i] for i in group],
+                [drafts[i] for i in group],
+                source_name,
+                target_name,
+                model,
+                glossary_terms([texts[i] for i in group], source_lang, target_lang),
+            )
+            for model, group in jobs
+        ),
+        return_exceptions=True,
+    )
+
+    # 서킷 열림/대기열 초과는 초안으로 대체하지 않고 요청 전체를 실패 처리
+    for edited in group_results:
+        if is_provider_unavailable(edited):
+            raise edited
+
+    for (model, group), edited in zip(jobs, group_results):
+        if isinstance(edited, BaseException):
+            print(f"[Post-Editor] WARNING: {model} 배치 후수정 실패, DeepL 번역 반환")
+            print(f"[Post-Editor] 에러: {str(edited)}")
+            for index in group:
+                results[index] = DraftFallback(drafts[index])
+            continue
+        for index, text in zip(group, edited):
+            results[index] = text
+
+    summary = ", ".join(f"{model} {len(indices)}건" for model, indices in by_model.items())
+    print(f"[Post-Editor] Step 2/2: 배치 후수정 완료 ({summary}, {len(jobs)}회 호출)")
+    return results
+
+
+async def stream_with_post_editor(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    source_name: str,
+    target_name: str,
+    draft: Optional[str] = None,
+) -> AsyncIterator[Tuple[str, str]]:
+    """
+    DeepL 초안을 먼저 반환한 뒤 후수정 결과를 스트리밍합니다.
+
+    Parameters
+    ----------
+    text : str
+        번역할 텍스트
+    source_lang : str
+        원본 언어 코드 (예: "en")
+    target_lang : str
+        목표 언어 코드 (예: "ko")
+    source_name : str
+        원본 언어 이름 (예: "English")
+    target_name : str
+        목표 언어 이름 (예: "Korean")
+    draft : Optional[str]
+        이미 있는 DeepL 번역 (캐시/번역 메모리). 주어지면 DeepL 호출을 생략
+
+    Yields
+    ------
+    Tuple[str, str]
+        ("draft", DeepL 초안), ("delta", 후수정 조각) 또는
+        후수정 실패 시 ("fallback", DeepL 초안).
+        후수정을 생략하면 초안 전체를 ("delta", 초안)으로 한 번 보냅니다.
+    """
+    # Step 1: DeepL NMT로 초기 번역 (이미 있으면 재사용)
+    if draft is None:
+        initial_translation = await translate_with_deepl(text, source_lang, target_lang)
+        print(f"[Post-Editor] Step 1/2: DeepL 초기 번역 완료 (스트리밍)")
+    else:
+        initial_translation = draft
+        print(f"[Post-Editor] Step 1/2: 캐시된 DeepL 번역 사용 (스트리밍)")
+    yield "draft", initial_translation
+
+    model, reason = choose_post_edit_model(text, initial_translation)
+    if model is None:
+        print(f"[Post-Editor] Step 2/2: 후수정 생략 ({reason})")
+        yield "delta", initial_translation
+        return
+
+    openai_client = require_openai_client()
+
+    # Step 2: 선택한 모델로 후수정 스트리밍
+    try:
+        messages = build_post_edit_messages(
+            text,
+            initial_translation,
+            source_name,
+            target_name,
+            terms=glossary_terms([text], source_lang, target_lang),
         )
+        max_tokens = plan_output_tokens(model, count_tokens(initial_translation, model))
+        units = count_tokens(messages[0]["content"] + messages[1]["content"], model) + max_tokens
+        async with get_scheduler("openai").slot(units=units):
+            stream = await call_provider(
+                "openai",
+                lambda: openai_client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=0.3,
+                    max_tokens=max_tokens,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                ),
+                is_transient_openai_error,
+            )
 
-        post_edited_text = response.choices[0].message.content.strip()
-        print(f"[Post-Editor] GPT-4o 후수정 완료!")
-        print(f"[Post-Editor] 최종 결과: {post_edited_text[:80]}...")
+            async for chunk in stream:
+                if chunk.usage:
+                    record_openai_usage(model, chunk.usage, len(text))
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield "delta", chunk.choices[0].delta.content
 
-        return post_edited_text
+        print(f"[Post-Editor] Step 2/2: {model} 후수정 스트리밍 완료 ({reason})")
 
     except Exception as e:
+        if is_provider_unavailable(e):
+            raise
         # 후수정 실패 시 DeepL 번역이라도 반환
-        print(f"[Post-Editor] WARNING: GPT-4o 후수정 실패, DeepL 번역 반환")
+        print(f"[Post-Editor] WARNING: {model} 후수정 스트리밍 실패, DeepL 번역 반환")
         print(f"[Post-Editor] 에러: {str(e)}")
-        return initial_translation
+        yield "fallback", initial_translation
@@ -0,0 +1,248 @@
+"""
+Provider 호출 복원력 계층 (타임아웃, 재시도, 서킷 브레이커)
+
+모든 provider 호출에 다음을 적용합니다.
+- 호출별 제한 시간 (api.timeout)과 재시도를 포함한 전체 제한 시간 (api.total_timeout)
+- 일시적 오류(연결 실패, 시간 초과, 429, 5xx)에 한해 지수 백오프 + full jitter 재시도 (api.max_retries)
+- 연속 실패가 임계값을 넘으면 서킷을 열어 일정 시간 동안 즉시 실패(503) 처리
+
+설정은 configs/config.yaml의 api 섹션에서 읽습니다.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from fastapi import HTTPException
+
+from ..settings import get_section
+from .scheduler import get_scheduler
+
+T = TypeVar("T")
+
+
+class CircuitBreaker:
+    """
+    연속 실패 기반 서킷 브레이커
+
+    closed: 정상 호출 / open: 즉시 실패 / half_open: 복구 확인용 호출 1건만 허용
+
+    Parameters
+    ----------
+    name : str
+        provider 이름
+    failure_threshold : int
+        서킷을 여는 연속 실패 횟수
+    recovery_timeout : float
+        서킷을 연 뒤 복구를 시도하기까지의 시간(초)
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.opened_count = 0
+        self.last_success_at: Optional[float] = None
+        self.last_failure_at: Optional[float] = None
+        self._trial_in_progress = False
+
+    def before_call(self) -> None:
+        """
+        호출 가능 여부를 확인합니다.
+
+        Raises
+        ------
+        HTTPException
+            서킷이 열려 있는 경우 (503)
+        """
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"{self.name} provider가 일시적으로 차단되었습니다 (연속 실패). 잠시 후 다시 시도하세요.",
+                )
+            self.state = "half_open"
+
+        if self.state == "half_open":
+            if self._trial_in_progress:
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"{self.name} provider 복구 확인 중입니다. 잠시 후 다시 시도하세요.",
+                )
+            self._trial_in_progress = True
+
+    def record_success(self) -> None:
+        """성공을 기록하고 서킷을 닫습니다."""
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.last_success_at = time.time()
+        self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        """일시적 실패를 기록하고 임계값을 넘으면 서킷을 엽니다."""
+        self.consecutive_failures += 1
+        self.last_failure_at = time.time()
+        self._trial_in_progress = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                print(f"[WARNING] {self.name} 서킷 열림 (연속 실패 {self.consecutive_failures}회)")
+                self.opened_count += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """복구 확인 호출이 성공/실패 판정 없이 끝났을 때 다음 확인을 허용합니다."""
+        self._trial_in_progress = False
+
+    def stats(self) -> Dict[str, Any]:
+        """서킷 상태, 연속 실패 횟수, 마지막 성공/실패 시각(UNIX time)을 반환합니다."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened_count": self.opened_count,
+            "last_success_at": self.last_success_at,
+            "last_failure_at": self.last_failure_at,
+        }
+
+
+# provider 이름 -> 서킷 브레이커 (첫 사용 시 생성)
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """provider의 서킷 브레이커를 반환합니다 (api 설정으로 최초 1회 생성)."""
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        config = get_section("api")
+        breaker = CircuitBreaker(
+            provider,
+            failure_threshold=int(config.get("circuit_failure_threshold", 5)),
+            recovery_timeout=float(config.get("circuit_recovery_timeout", 30)),
+        )
+        _breakers[provider] = breaker
+    return breaker
+
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """생성된 모든 서킷 브레이커의 상태를 반환합니다."""
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    지수 백오프 + full jitter 대기 시간을 계산합니다.
+
+    Parameters
+    ----------
+    attempt : int
+        재시도 순번 (0부터)
+    base : float
+        기본 대기 시간(초)
+    cap : float
+        최대 대기 시간(초)
+
+    Returns
+    -------
+    float
+        0 이상 min(cap, base * 2^attempt) 이하의 무작위 대기 시간(초)
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+async def call_provider(
+    provider: str,
+    fn: Callable[[], Awaitable[T]],
+    is_transient: Callable[[Exception], bool],
+    units: Optional[float] = None,
+) -> T:
+    """
+    타임아웃, 재시도, 서킷 브레이커, 스케줄러를 적용하여 provider를 호출합니다.
+
+    모든 시도가 전체 제한 시간(api.total_timeout)을 나누어 쓰며, 각 시도의 제한 시간은
+    남은 시간을 넘지 않습니다. 남은 시간 안에 백오프 대기를 마칠 수 없으면 재시도하지 않습니다.
+
+    Parameters
+    ----------
+    provider : str
+        provider 이름 ("openai", "deepl", "google")
+    fn : Callable[[], Awaitable[T]]
+        vendor 호출 1회를 수행하는 코루틴 함수 (재시도마다 다시 호출됨)
+    is_transient : Callable[[Exception], bool]
+        재시도할 일시적 오류인지 판단하는 함수 (시간 초과는 항상 일시적 오류)
+    units : float, optional
+        스케줄러에 보고할 토큰/문자 수 (None이면 스케줄러를 거치지 않음)
+
+    Returns
+    -------
+    T
+        vendor 호출 결과
+
+    Raises
+    ------
+    HTTPException
+        서킷이 열려 있거나(503) 스케줄러 대기열이 가득 찬 경우(429/503),
+        스케줄러 대기 중 전체 제한 시간이 지난 경우(504)
+    Exception
+        재시도 후에도 실패하거나 일시적이지 않은 오류가 발생한 경우 마지막 예외
+    """
+    config = get_section("api")
+    timeout = float(config.get("timeout", 60))
+    total_timeout = float(config.get("total_timeout", 90))
+    max_retries = int(config.get("max_retries", 3))
+    base_delay = float(config.get("retry_base_delay", 0.5))
+    max_delay = float(config.get("retry_max_delay", 8))
+
+    breaker = get_breaker(provider)
+    deadline = time.monotonic() + total_timeout
+
+    for attempt in range(max_retries + 1):
+        breaker.before_call()
+        try:
+            if units is None:
+                result = await asyncio.wait_for(fn(), timeout=min(timeout, deadline - time.monotonic()))
+            else:
+                async with get_scheduler(provider).slot(units=units):
+                    # 스케줄러 대기 시간도 전체 제한 시간에 포함 (provider 실패로 집계하지 않음)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise HTTPException(
+                            status_code=504,
+                            detail=f"{provider} 요청 전체 제한 시간({total_timeout:.0f}초)을 초과했습니다.",
+                        )
+                    result = await asyncio.wait_for(fn(), timeout=min(timeout, remaining))
+        except HTTPException:
+            # 스케줄러 거절 등 로컬 오류는 재시도/실패 집계 대상이 아님
+            breaker.release_trial()
+            raise
+        except Exception as e:
+            transient = isinstance(e, asyncio.TimeoutError) or is_transient(e)
+            if not transient:
+                breaker.release_trial()
+                raise
+
+            breaker.record_failure()
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            if (
+                attempt == max_retries
+                or breaker.state == "open"
+                or time.monotonic() + delay >= deadline
+            ):
+                raise
+
+            print(
+                f"[WARNING] {provider} 일시적 오류, {delay:.2f}초 후 재시도 "
+                f"({attempt + 1}/{max_retries}): {type(e).__name__}"
+            )
+            await asyncio.sleep(delay)
+        except BaseException:
+            # 요청 취소 (클라이언트 연결 종료, 헤지 요청 취소 등)
+            breaker.release_trial()
+            raise
+        else:
+            breaker.record_success()
+            return result
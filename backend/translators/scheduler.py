@@ -0,0 +1,232 @@
+"""
+Provider별 요청 스케줄러
+
+provider마다 동시 요청 수, 초당 요청 수, 분당 토큰/문자 수 예산을 적용합니다.
+한도를 넘는 요청은 제한된 크기의 대기열에서 순서대로 기다리며,
+대기열이 가득 차거나 대기 시간이 초과되면 즉시 실패합니다.
+한도는 configs/config.yaml의 rate_limits 섹션에서 읽으며, 멀티 워커로 실행하면
+(TRANSLATION_WORKERS 환경 변수) 서버 전체 한도를 워커 수로 나누어 적용합니다.
+"""
+
+import asyncio
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import HTTPException
+
+from ..settings import get_section
+
+
+class TokenBucket:
+    """
+    토큰 버킷 속도 제한기
+
+    Parameters
+    ----------
+    rate : float
+        초당 충전량
+    capacity : float
+        최대 저장량 (순간 허용량)
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float) -> None:
+        """amount만큼 충전될 때까지 기다린 뒤 차감합니다 (용량보다 크면 용량만큼)."""
+        amount = min(amount, self.capacity)
+        while True:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return
+            await asyncio.sleep((amount - self._tokens) / self.rate)
+
+
+class ProviderScheduler:
+    """
+    단일 provider의 동시성/속도 제한 및 대기열
+
+    Parameters
+    ----------
+    name : str
+        provider 이름 (예: "openai")
+    max_in_flight : int
+        최대 동시 요청 수
+    requests_per_second : float, optional
+        초당 최대 요청 수 (None이면 제한 없음)
+    units_per_minute : float, optional
+        분당 최대 토큰/문자 수 (None이면 제한 없음)
+    max_queue : int
+        최대 대기 요청 수
+    queue_timeout : float
+        대기열에서 기다릴 최대 시간(초)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_in_flight: int = 16,
+        requests_per_second: Optional[float] = None,
+        units_per_minute: Optional[float] = None,
+        max_queue: int = 200,
+        queue_timeout: float = 30.0,
+    ):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        # 속도 제한 버킷은 lock으로 직렬화하여 대기 순서를 유지
+        self._bucket_lock = asyncio.Lock()
+        self._request_bucket = (
+            TokenBucket(requests_per_second, max(1.0, requests_per_second))
+            if requests_per_second
+            else None
+        )
+        self._unit_bucket = (
+            TokenBucket(units_per_minute / 60, units_per_minute) if units_per_minute else None
+        )
+
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def _acquire(self, units: float) -> None:
+        await self._semaphore.acquire()
+        try:
+            async with self._bucket_lock:
+                if self._request_bucket:
+                    await self._request_bucket.acquire(1)
+                if self._unit_bucket and units > 0:
+                    await self._unit_bucket.acquire(units)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    @asynccontextmanager
+    async def slot(self, units: float = 0) -> AsyncIterator[None]:
+        """
+        한도 내에서 요청 슬롯을 얻을 때까지 기다립니다.
+
+        Parameters
+        ----------
+        units : float
+            이번 요청이 사용할 토큰/문자 수
+
+        Raises
+        ------
+        HTTPException
+            대기열이 가득 찼거나(429) 대기 시간이 초과된 경우(503)
+        """
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=429,
+                detail=f"{self.name} 요청 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요.",
+            )
+
+        self.waiting += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._acquire(units), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise HTTPException(
+                status_code=503,
+                detail=f"{self.name} 요청 대기 시간({self.queue_timeout:.0f}초)을 초과했습니다.",
+            )
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - started
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        대기열/동시성 통계를 반환합니다.
+
+        Returns
+        -------
+        Dict[str, Any]
+            대기 중/진행 중 요청 수, 완료/거절/시간 초과 횟수, 평균/최대 대기 시간(ms)
+        """
+        started = self.completed + self.in_flight
+        return {
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_ms": self.total_wait / started * 1000 if started else 0.0,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+# provider 이름 -> 스케줄러 (첫 사용 시 생성)
+_schedulers: Dict[str, ProviderScheduler] = {}
+
+
+def get_scheduler(provider: str) -> ProviderScheduler:
+    """
+    provider의 스케줄러를 반환합니다 (rate_limits 설정으로 최초 1회 생성).
+
+    Parameters
+    ----------
+    provider : str
+        provider 이름 ("openai", "deepl", "google")
+
+    Returns
+    -------
+    ProviderScheduler
+        해당 provider의 스케줄러
+    """
+    scheduler = _schedulers.get(provider)
+    if scheduler is None:
+        config = get_section("rate_limits").get(provider) or {}
+        # 한도는 서버 전체 기준이므로 워커 프로세스마다 나누어 가짐
+        workers = max(1, int(os.getenv("TRANSLATION_WORKERS", "1")))
+        requests_per_second = config.get("requests_per_second")
+        units_per_minute = config.get("tokens_per_minute", config.get("characters_per_minute"))
+        scheduler = ProviderScheduler(
+            provider,
+            max_in_flight=math.ceil(int(config.get("max_in_flight", 16)) / workers),
+            requests_per_second=requests_per_second / workers if requests_per_second else None,
+            units_per_minute=units_per_minute / workers if units_per_minute else None,
+            max_queue=int(config.get("max_queue", 200)),
+            queue_timeout=float(config.get("queue_timeout", 30)),
+        )
+        _schedulers[provider] = scheduler
+    return scheduler
+
+
+def scheduler_stats() -> Dict[str, Dict[str, Any]]:
+    """생성된 모든 provider 스케줄러의 통계를 반환합니다."""
+    return {name: scheduler.stats() for name, scheduler in _schedulers.items()}
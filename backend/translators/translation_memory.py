@@ -0,0 +1,180 @@
+"""
+SQLite 기반 번역 메모리 (Translation Memory)
+
+provider 호출 결과를 디스크에 영구 저장하여 서버 재시작이나 배포 후에도
+유료 번역(GPT-4o, DeepL + GPT-4o 등)을 다시 수행하지 않도록 합니다.
+
+WAL 모드를 사용하므로 여러 uvicorn 워커 프로세스가 동시에 읽을 수 있고,
+쓰기는 짧은 트랜잭션으로 직렬화됩니다.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# (모델, 원본 언어, 목표 언어, 텍스트 해시) - backend.cache.CacheKey와 동일한 형식
+MemoryKey = Tuple[str, str, str, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    model TEXT NOT NULL,
+    source_lang TEXT NOT NULL,
+    target_lang TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    source_text TEXT NOT NULL,
+    translated_text TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (model, source_lang, target_lang, text_hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_translations_created_at ON translations (created_at);
+"""
+
+
+class TranslationMemory:
+    """
+    SQLite(WAL) 번역 메모리
+
+    sqlite3 연결은 스레드 간 공유할 수 없으므로 스레드마다 별도 연결을 사용합니다.
+
+    Parameters
+    ----------
+    path : str or Path
+        SQLite 파일 경로 (상위 디렉토리는 자동 생성)
+    models : Iterable[str], optional
+        저장 대상 모델 ID 목록 (None이면 모든 모델 저장)
+    """
+
+    def __init__(self, path, models: Optional[Iterable[str]] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.models = set(models) if models is not None else None
+
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def accepts(self, model: str) -> bool:
+        """해당 모델의 결과를 저장 대상으로 삼는지 여부를 반환합니다."""
+        return self.models is None or model in self.models
+
+    def lookup(self, key: MemoryKey) -> Optional[str]:
+        """
+        저장된 번역 결과를 조회합니다.
+
+        Parameters
+        ----------
+        key : MemoryKey
+            (모델, 원본 언어, 목표 언어, 텍스트 해시)
+
+        Returns
+        -------
+        Optional[str]
+            번역 결과 (없으면 None)
+        """
+        row = self._connect().execute(
+            "SELECT translated_text FROM translations "
+            "WHERE model = ? AND source_lang = ? AND target_lang = ? AND text_hash = ?",
+            key,
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return row[0]
+
+    def store(self, key: MemoryKey, source_text: str, translated_text: str) -> None:
+        """
+        번역 결과를 저장합니다 (동일 키가 있으면 덮어씀).
+
+        Parameters
+        ----------
+        key : MemoryKey
+            (모델, 원본 언어, 목표 언어, 텍스트 해시)
+        source_text : str
+            원본 텍스트
+        translated_text : str
+            번역 결과
+        """
+        self.store_many([(key, source_text, translated_text)])
+
+    def store_many(self, entries: List[Tuple[MemoryKey, str, str]]) -> None:
+        """
+        여러 번역 결과를 하나의 트랜잭션으로 저장합니다.
+
+        Parameters
+        ----------
+        entries : List[Tuple[MemoryKey, str, str]]
+            (키, 원본 텍스트, 번역 결과) 목록
+        """
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO translations "
+                "(model, source_lang, target_lang, text_hash, source_text, translated_text, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*key, source_text, translated_text, now) for key, source_text, translated_text in entries],
+            )
+        self.writes += len(entries)
+
+    def warm_load(self, limit: int) -> List[Tuple[MemoryKey, str]]:
+        """
+        최근 저장된 번역 결과를 일괄로 읽어옵니다 (시작 시 캐시 예열용).
+
+        Parameters
+        ----------
+        limit : int
+            최대 항목 수
+
+        Returns
+        -------
+        List[Tuple[MemoryKey, str]]
+            오래된 것부터 정렬된 (키, 번역 결과) 목록
+        """
+        rows = self._connect().execute(
+            "SELECT model, source_lang, target_lang, text_hash, translated_text "
+            "FROM translations ORDER BY created_at DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+        # 최근 항목이 LRU의 가장 뒤에 오도록 역순으로 반환
+        return [((m, s, t, h), text) for m, s, t, h, text in reversed(rows)]
+
+    def count(self) -> int:
+        """저장된 항목 수를 반환합니다."""
+        return self._connect().execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        번역 메모리 통계를 반환합니다.
+
+        Returns
+        -------
+        Dict[str, Any]
+            파일 경로, 저장 항목 수, 이 프로세스의 조회 적중/실패 및 쓰기 횟수
+        """
+        return {
+            "path": str(self.path),
+            "entries": self.count(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+        }
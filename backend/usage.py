@@ -0,0 +1,291 @@
+"""
+provider 사용량/예상 비용 장부
+
+provider 호출마다 토큰 수(OpenAI), 문자 수, 단가로 계산한 예상 비용을 기록합니다.
+기록은 (시간 버킷, 과금 모델, provider)별 합계로 메모리에 모았다가 주기적으로 SQLite에 합산하므로
+요청 경로에는 딕셔너리 갱신만 추가됩니다. 여러 워커 프로세스가 같은 파일에 합산하며,
+/api/usage에서 모델별/시간 구간별로 조회합니다.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .settings import get_section
+
+# 프로젝트 루트 (장부 경로 기준)
+_PROJECT_ROOT = Path(__file__).parent.parent
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    bucket_start INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    requests INTEGER NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    characters INTEGER NOT NULL,
+    cost_usd REAL NOT NULL,
+    PRIMARY KEY (bucket_start, model, provider)
+) WITHOUT ROWID;
+"""
+
+# 합계 컬럼 순서 (requests, prompt_tokens, completion_tokens, characters, cost_usd)
+_FIELDS = ("requests", "prompt_tokens", "completion_tokens", "characters", "cost_usd")
+
+# 모델별 단가 기본값 (USD, 100만 토큰/문자당)
+DEFAULT_PRICES: Dict[str, Dict[str, float]] = {
+    "gpt-3.5-turbo": {"input": 0.5, "output": 1.5},
+    "gpt-4o-mini": {"input": 0.15, "output": 0.6},
+    "gpt-4o": {"input": 2.5, "output": 10.0},
+    "deepl-nmt": {"characters": 25.0},
+    "google-translate": {"characters": 0.0},
+}
+
+
+class UsageLedger:
+    """
+    (시간 버킷, 과금 모델, provider)별 사용량 합계 장부
+
+    Parameters
+    ----------
+    path : str or Path
+        SQLite 파일 경로
+    prices : Dict[str, Dict[str, float]]
+        모델별 단가 (input/output: 100만 토큰당, characters: 100만 문자당 USD)
+    bucket_seconds : int
+        합계를 모을 시간 버킷 크기(초)
+    """
+
+    def __init__(
+        self,
+        path,
+        prices: Optional[Dict[str, Dict[str, float]]] = None,
+        bucket_seconds: int = 60,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.prices = prices if prices is not None else DEFAULT_PRICES
+        self.bucket_seconds = bucket_seconds
+
+        self._pending: Dict[Tuple[int, str, str], List[float]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.recorded = 0
+
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "UsageLedger":
+        """configs/config.yaml의 usage 섹션으로 장부를 생성합니다."""
+        prices = dict(DEFAULT_PRICES)
+        prices.update(config.get("prices") or {})
+        return cls(
+            _PROJECT_ROOT / config.get("path", "data/usage.sqlite3"),
+            prices=prices,
+            bucket_seconds=int(config.get("bucket_seconds", 60)),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def estimate_cost(
+        self,
+        model: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        characters: int = 0,
+    ) -> float:
+        """단가표로 예상 비용(USD)을 계산합니다 (단가가 없는 모델은 0)."""
+        price = self.prices.get(model) or {}
+        return (
+            prompt_tokens * float(price.get("input", 0))
+            + completion_tokens * float(price.get("output", 0))
+            + characters * float(price.get("characters", 0))
+        ) / 1_000_000
+
+    def record(
+        self,
+        model: str,
+        provider: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        characters: int = 0,
+    ) -> None:
+        """
+        provider 호출 1회의 사용량을 기록합니다.
+
+        Parameters
+        ----------
+        model : str
+            과금 기준 모델 ID (Post-Editor의 후수정은 실제 후수정 모델)
+        provider : str
+            provider 이름 ("openai", "deepl", "google")
+        prompt_tokens : int
+            입력 토큰 수 (OpenAI)
+        completion_tokens : int
+            출력 토큰 수 (OpenAI)
+        characters : int
+            원문 문자 수 (DeepL은 과금 문자 수)
+        """
+        bucket = int(time.time()) // self.bucket_seconds * self.bucket_seconds
+        cost = self.estimate_cost(model, prompt_tokens, completion_tokens, characters)
+        with self._lock:
+            totals = self._pending.setdefault((bucket, model, provider), [0, 0, 0, 0, 0.0])
+            totals[0] += 1
+            totals[1] += prompt_tokens
+            totals[2] += completion_tokens
+            totals[3] += characters
+            totals[4] += cost
+            self.recorded += 1
+
+    def flush(self) -> int:
+        """
+        메모리에 모은 합계를 SQLite에 합산합니다 (스레드풀에서 실행).
+
+        Returns
+        -------
+        int
+            합산한 (버킷, 모델, provider) 행 수
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO usage (bucket_start, model, provider, requests, prompt_tokens,
+                                   completion_tokens, characters, cost_usd)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (bucket_start, model, provider) DO UPDATE SET
+                    requests = requests + excluded.requests,
+                    prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+                    completion_tokens = completion_tokens + excluded.completion_tokens,
+                    characters = characters + excluded.characters,
+                    cost_usd = cost_usd + excluded.cost_usd
+                """,
+                [(*key, *totals) for key, totals in pending.items()],
+            )
+        return len(pending)
+
+    def query(
+        self,
+        since: float,
+        until: Optional[float] = None,
+        interval_seconds: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        기간의 모델별 사용량 합계를 조회합니다 (스레드풀에서 실행).
+
+        Parameters
+        ----------
+        since : float
+            시작 시각 (Unix time, 해당 시간 버킷부터 포함)
+        until : Optional[float]
+            끝 시각 (없으면 현재)
+        interval_seconds : Optional[int]
+            주어지면 이 간격의 시간 구간별 합계도 반환 (bucket_seconds 단위로 올림)
+
+        Returns
+        -------
+        Dict[str, Any]
+            기간, 모델별 합계(models), 전체 합계(total), 시간 구간별 합계(intervals)
+        """
+        until = time.time() if until is None else until
+        start = int(since) // self.bucket_seconds * self.bucket_seconds
+        conn = self._connect()
+        columns = ", ".join(f"SUM({field})" for field in _FIELDS)
+
+        models = [
+            {"model": model, "provider": provider, **dict(zip(_FIELDS, totals))}
+            for model, provider, *totals in conn.execute(
+                f"SELECT model, provider, {columns} FROM usage "
+                "WHERE bucket_start >= ? AND bucket_start <= ? "
+                "GROUP BY model, provider ORDER BY SUM(cost_usd) DESC, model",
+                (start, until),
+            )
+        ]
+        total = {
+            field: sum(row[field] for row in models) for field in _FIELDS
+        }
+        result: Dict[str, Any] = {
+            "since": start,
+            "until": int(until),
+            "models": models,
+            "total": total,
+        }
+
+        if interval_seconds:
+            interval = max(self.bucket_seconds, -(-int(interval_seconds) // self.bucket_seconds) * self.bucket_seconds)
+            result["interval_seconds"] = interval
+            result["intervals"] = [
+                {"start": interval_start, "model": model, **dict(zip(_FIELDS, totals))}
+                for interval_start, model, *totals in conn.execute(
+                    f"SELECT bucket_start / ? * ? AS interval_start, model, {columns} FROM usage "
+                    "WHERE bucket_start >= ? AND bucket_start <= ? "
+                    "GROUP BY interval_start, model ORDER BY interval_start, model",
+                    (interval, interval, start, until),
+                )
+            ]
+        return result
+
+    def purge(self, retention_seconds: float) -> int:
+        """보관 기간이 지난 시간 버킷을 삭제합니다 (스레드풀에서 실행)."""
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM usage WHERE bucket_start < ?", (time.time() - retention_seconds,)
+            )
+        return cursor.rowcount
+
+
+_ledger: Optional[UsageLedger] = None
+_ledger_loaded = False
+_ledger_lock = threading.Lock()
+
+
+def get_usage_ledger() -> Optional[UsageLedger]:
+    """
+    사용량 장부를 반환합니다 (usage 설정으로 최초 1회 생성).
+
+    Returns
+    -------
+    Optional[UsageLedger]
+        장부 (usage.enabled가 false면 None)
+    """
+    global _ledger, _ledger_loaded
+
+    if not _ledger_loaded:
+        with _ledger_lock:
+            if not _ledger_loaded:
+                config = get_section("usage")
+                if config.get("enabled", True):
+                    _ledger = UsageLedger.from_config(config)
+                _ledger_loaded = True
+    return _ledger
+
+
+def record_usage(
+    model: str,
+    provider: str,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    characters: int = 0,
+) -> None:
+    """사용량 장부가 켜져 있으면 provider 호출 1회의 사용량을 기록합니다."""
+    ledger = get_usage_ledger()
+    if ledger is not None:
+        ledger.record(model, provider, prompt_tokens, completion_tokens, characters)